@@ -0,0 +1,52 @@
+"""add dsa read path indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # get_stats "recent": ORDER BY last_updated_at DESC LIMIT 10
+    op.create_index(
+        'idx_dsa_problems_last_updated', 'dsa_problems', ['last_updated_at']
+    )
+    # get_stats weekly performance: WHERE first_seen_at >= :since
+    op.create_index(
+        'idx_dsa_problems_first_seen', 'dsa_problems', ['first_seen_at']
+    )
+    # get_stats difficulty breakdown: GROUP BY lower(difficulty)
+    op.create_index(
+        'idx_dsa_problems_difficulty_lower',
+        'dsa_problems',
+        [sa.text('lower(difficulty)')],
+    )
+    # _rebuild_topic_stats: per-folder "latest file" lookup is answered by an
+    # index-only scan. Supersedes the single-column folder index.
+    op.create_index(
+        'idx_dsa_problems_folder_last_updated',
+        'dsa_problems',
+        ['folder', 'last_updated_at'],
+        postgresql_include=['filename'],
+    )
+    op.drop_index('idx_dsa_problems_folder', table_name='dsa_problems')
+
+
+def downgrade() -> None:
+    op.create_index('idx_dsa_problems_folder', 'dsa_problems', ['folder'])
+    op.drop_index(
+        'idx_dsa_problems_folder_last_updated', table_name='dsa_problems'
+    )
+    op.drop_index(
+        'idx_dsa_problems_difficulty_lower', table_name='dsa_problems'
+    )
+    op.drop_index('idx_dsa_problems_first_seen', table_name='dsa_problems')
+    op.drop_index('idx_dsa_problems_last_updated', table_name='dsa_problems')
@@ -0,0 +1,24 @@
+"""add dsa_problems filename keyset index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_problems(sort="name") keyset walk over (filename, id)
+    op.create_index(
+        'idx_dsa_problems_filename', 'dsa_problems', ['filename', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_dsa_problems_filename', table_name='dsa_problems')
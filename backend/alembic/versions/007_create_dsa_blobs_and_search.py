@@ -0,0 +1,57 @@
+"""create dsa_blobs table and code search indexes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    op.create_table(
+        'dsa_blobs',
+        sa.Column('sha', sa.String(40), primary_key=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=True),
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', content)", persisted=True),
+        ),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index(
+        'idx_dsa_blobs_search', 'dsa_blobs', ['search_vector'],
+        postgresql_using='gin',
+    )
+
+    # Join dsa_problems → dsa_blobs and prune unreferenced blobs
+    op.create_index('idx_dsa_problems_sha', 'dsa_problems', ['sha'])
+
+    # Substring / fuzzy matching on file names and paths
+    op.create_index(
+        'idx_dsa_problems_path_trgm', 'dsa_problems', ['path'],
+        postgresql_using='gin', postgresql_ops={'path': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'idx_dsa_problems_filename_trgm', 'dsa_problems', ['filename'],
+        postgresql_using='gin', postgresql_ops={'filename': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_dsa_problems_filename_trgm', table_name='dsa_problems')
+    op.drop_index('idx_dsa_problems_path_trgm', table_name='dsa_problems')
+    op.drop_index('idx_dsa_problems_sha', table_name='dsa_problems')
+    op.drop_index('idx_dsa_blobs_search', table_name='dsa_blobs')
+    op.drop_table('dsa_blobs')
@@ -0,0 +1,35 @@
+"""compress dsa_blobs content with lz4
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # TOAST compresses large values transparently; lz4 decompresses several
+    # times faster than the default pglz, which matters on the file viewer
+    # read path. Servers built without lz4 keep pglz.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            ALTER TABLE dsa_blobs ALTER COLUMN content SET COMPRESSION lz4;
+        EXCEPTION WHEN feature_not_supported THEN
+            RAISE NOTICE 'lz4 not available, keeping default compression';
+        END $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE dsa_blobs ALTER COLUMN content SET COMPRESSION default"
+    )
@@ -0,0 +1,25 @@
+"""add dsa_problems.last_commit_message
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'dsa_problems',
+        sa.Column('last_commit_message', sa.Text(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('dsa_problems', 'last_commit_message')
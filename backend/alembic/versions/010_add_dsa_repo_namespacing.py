@@ -0,0 +1,93 @@
+"""namespace dsa problems and sync state by repository
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+# Existing rows were synced from the (single) configured repository. Its
+# name lives in the environment, not the schema: they get this
+# placeholder, which the app hands to its default repository on startup
+# (dsa_sync_service.claim_unnamespaced_rows).
+UNNAMESPACED = ''
+
+
+def upgrade() -> None:
+    op.add_column(
+        'dsa_problems',
+        sa.Column(
+            'repo',
+            sa.String(200),
+            nullable=False,
+            server_default=UNNAMESPACED,
+        ),
+    )
+    op.alter_column('dsa_problems', 'repo', server_default=None)
+    op.drop_constraint(
+        'dsa_problems_path_key', 'dsa_problems', type_='unique'
+    )
+    op.create_index(
+        'uq_dsa_problems_repo_path',
+        'dsa_problems',
+        ['repo', 'path'],
+        unique=True,
+    )
+
+    op.add_column(
+        'dsa_sync_state',
+        sa.Column(
+            'repo',
+            sa.String(200),
+            nullable=False,
+            server_default=UNNAMESPACED,
+        ),
+    )
+    op.alter_column('dsa_sync_state', 'repo', server_default=None)
+    op.create_unique_constraint(
+        'dsa_sync_state_repo_key', 'dsa_sync_state', ['repo']
+    )
+    # The singleton row was inserted with an explicit id=1
+    op.execute(
+        """
+        SELECT setval(
+            pg_get_serial_sequence('dsa_sync_state', 'id'),
+            COALESCE((SELECT MAX(id) FROM dsa_sync_state), 0) + 1,
+            false
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    # Keep only the rows of the oldest sync state: the original singleton
+    op.execute(
+        """
+        DELETE FROM dsa_problems
+        WHERE repo != (SELECT repo FROM dsa_sync_state ORDER BY id LIMIT 1)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM dsa_sync_state
+        WHERE id != (SELECT MIN(id) FROM dsa_sync_state)
+        """
+    )
+    op.execute("UPDATE dsa_sync_state SET id = 1")
+
+    op.drop_constraint(
+        'dsa_sync_state_repo_key', 'dsa_sync_state', type_='unique'
+    )
+    op.drop_column('dsa_sync_state', 'repo')
+    op.drop_index('uq_dsa_problems_repo_path', table_name='dsa_problems')
+    op.create_unique_constraint(
+        'dsa_problems_path_key', 'dsa_problems', ['path']
+    )
+    op.drop_column('dsa_problems', 'repo')
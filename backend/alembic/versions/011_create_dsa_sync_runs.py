@@ -0,0 +1,79 @@
+"""create dsa_sync_runs
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dsa_sync_runs',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('repo', sa.String(200), nullable=False),
+        sa.Column('sync_type', sa.String(20), nullable=False),
+        sa.Column('trigger', sa.String(20), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('duration_ms', sa.Integer(), nullable=False),
+        sa.Column(
+            'phases',
+            postgresql.JSONB(),
+            nullable=False,
+            server_default='{}',
+        ),
+        sa.Column(
+            'github_calls', sa.Integer(), nullable=False, server_default='0'
+        ),
+        sa.Column(
+            'bytes_downloaded',
+            sa.BigInteger(),
+            nullable=False,
+            server_default='0',
+        ),
+        sa.Column(
+            'rate_limit_used',
+            sa.Integer(),
+            nullable=False,
+            server_default='0',
+        ),
+        sa.Column('rate_limit_remaining', sa.Integer(), nullable=True),
+        sa.Column(
+            'commits_processed',
+            sa.Integer(),
+            nullable=False,
+            server_default='0',
+        ),
+        sa.Column(
+            'problems_changed',
+            sa.Integer(),
+            nullable=False,
+            server_default='0',
+        ),
+        sa.Column(
+            'error_count', sa.Integer(), nullable=False, server_default='0'
+        ),
+        sa.Column(
+            'errors',
+            postgresql.JSONB(),
+            nullable=False,
+            server_default='[]',
+        ),
+    )
+    op.create_index(
+        'idx_dsa_sync_runs_repo_id', 'dsa_sync_runs', ['repo', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_dsa_sync_runs_repo_id', table_name='dsa_sync_runs')
+    op.drop_table('dsa_sync_runs')
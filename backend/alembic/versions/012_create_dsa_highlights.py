@@ -0,0 +1,33 @@
+"""create dsa_highlights
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dsa_highlights',
+        sa.Column('sha', sa.String(40), primary_key=True),
+        sa.Column('language', sa.String(20), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('html', sa.Text(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dsa_highlights')
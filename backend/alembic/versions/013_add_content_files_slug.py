@@ -0,0 +1,63 @@
+"""add generated slug column to content_files
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # STORED generated column: adding it rewrites the table, which
+    # backfills every existing row from metajson
+    op.add_column(
+        'content_files',
+        sa.Column(
+            'slug',
+            sa.Text(),
+            sa.Computed("metajson->>'slug'", persisted=True),
+        ),
+    )
+
+    # Duplicates would block the unique index; report them rather than
+    # guessing which row should win
+    duplicates = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT section, slug, count(*)
+            FROM content_files
+            WHERE slug IS NOT NULL
+            GROUP BY section, slug
+            HAVING count(*) > 1
+            """
+        )
+    ).fetchall()
+    if duplicates:
+        listing = ", ".join(
+            f"{section}/{slug} ({count} rows)"
+            for section, slug, count in duplicates
+        )
+        raise RuntimeError(
+            f"Duplicate content slugs, fix before upgrading: {listing}"
+        )
+
+    op.create_index(
+        'uq_content_files_section_slug',
+        'content_files',
+        ['section', 'slug'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'uq_content_files_section_slug', table_name='content_files'
+    )
+    op.drop_column('content_files', 'slug')
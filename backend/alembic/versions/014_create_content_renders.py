@@ -0,0 +1,43 @@
+"""create content_renders and content_files.render_hash
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'content_renders',
+        sa.Column('hash', sa.String(64), primary_key=True),
+        sa.Column('html', sa.Text(), nullable=False),
+        sa.Column('toc', postgresql.JSONB(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    # Existing rows render on their first /html request
+    op.add_column(
+        'content_files',
+        sa.Column('render_hash', sa.String(64), nullable=True),
+    )
+    op.create_index(
+        'ix_content_files_render_hash', 'content_files', ['render_hash']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_content_files_render_hash', table_name='content_files')
+    op.drop_column('content_files', 'render_hash')
+    op.drop_table('content_renders')
@@ -0,0 +1,35 @@
+"""create content_versions
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    table = op.create_table(
+        'content_versions',
+        sa.Column('section', sa.String(50), primary_key=True),
+        sa.Column(
+            'version', sa.BigInteger(), nullable=False, server_default='0'
+        ),
+    )
+    op.bulk_insert(
+        table,
+        [
+            {'section': section, 'version': 0}
+            for section in ('blog', 'project', 'case-study')
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('content_versions')
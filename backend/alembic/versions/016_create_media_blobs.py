@@ -0,0 +1,87 @@
+"""create media_blobs and content_images, content_files.media_version
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'media_blobs',
+        sa.Column('sha256', sa.String(64), primary_key=True),
+        sa.Column('ext', sa.String(10), nullable=False),
+        sa.Column('content_type', sa.String(100), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column(
+            'refcount', sa.Integer(), nullable=False, server_default='0'
+        ),
+        sa.Column('released_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('variants', postgresql.JSONB(), nullable=True),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    # Garbage collection scans only released blobs
+    op.create_index(
+        'idx_media_blobs_released',
+        'media_blobs',
+        ['released_at'],
+        postgresql_where=sa.text('refcount = 0'),
+    )
+
+    op.create_table(
+        'content_images',
+        sa.Column(
+            'content_id',
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey('content_files.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('name', sa.String(255), primary_key=True),
+        sa.Column(
+            'sha256',
+            sa.String(64),
+            sa.ForeignKey('media_blobs.sha256'),
+            nullable=False,
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        'ix_content_images_sha256', 'content_images', ['sha256']
+    )
+
+    # Bumped when a post's images or their variants change; part of the
+    # rendered-HTML key
+    op.add_column(
+        'content_files',
+        sa.Column(
+            'media_version',
+            sa.Integer(),
+            nullable=False,
+            server_default='0',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('content_files', 'media_version')
+    op.drop_index('ix_content_images_sha256', table_name='content_images')
+    op.drop_table('content_images')
+    op.drop_index('idx_media_blobs_released', table_name='media_blobs')
+    op.drop_table('media_blobs')
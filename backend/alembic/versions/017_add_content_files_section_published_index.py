@@ -0,0 +1,31 @@
+"""add content_files (section, published_at, id) index
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_by_section keyset pages: WHERE section = :section
+    # AND (published_at, id) < (:published_at, :id)
+    # ORDER BY published_at DESC, id DESC
+    op.create_index(
+        'idx_content_files_section_published',
+        'content_files',
+        ['section', sa.text('published_at DESC'), sa.text('id DESC')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'idx_content_files_section_published', table_name='content_files'
+    )
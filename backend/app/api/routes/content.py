@@ -1,17 +1,33 @@
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    UploadFile,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
 
-from typing import Literal, List
+from typing import Literal, List, Optional
 from uuid import UUID
 
-from app.services.content_service import ContentService, get_content_service
+from app.services.content_service import (
+    ContentService,
+    get_content_service,
+    run_content_write,
+)
 from app.schemas.content_file import (
     ContentFileResponse,
-    ContentFileListItem,
+    ContentImportReport,
+    ContentFileListPage,
     ContentFileUpdate,
     MarkdownContentResponse,
+    RenderedContentResponse,
 )
 from app.core.dependencies import get_current_admin_user
 from app.models.user import User
+from app.utils.http_cache import cache_headers, not_modified
 
 router = APIRouter(prefix="/content", tags=["content"])
 
@@ -27,16 +43,51 @@ async def upload_content(
     return await service.create_from_upload(section, file)
 
 
-@router.get("/{section}", response_model=list[ContentFileListItem])
+@router.post("/import", response_model=ContentImportReport)
+async def import_content(
+    section: Literal["blog", "project", "case-study"] = Query(...),
+    archive: UploadFile = File(...),
+    dry_run: bool = Query(False),
+    service: ContentService = Depends(get_content_service),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Import a zip/tar of markdown files and their images (Admin only)"""
+    return await service.import_archive(section, archive, dry_run)
+
+
+@router.get("/{section}", response_model=ContentFileListPage)
 def list_content(
+    request: Request,
     section: Literal["blog", "project", "case-study"],
     published_only: bool = Query(True),
-    limit: int = Query(100, le=100),
-    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated metajson keys to return"
+    ),
     service: ContentService = Depends(get_content_service),
 ):
-    """List content files by section"""
-    return service.list_by_section(section, published_only, limit, offset)
+    """List content files by section, newest first (cursor-paginated)"""
+    # Version first: a page built after this read is at least this new
+    version = service.section_version(section)
+    headers = cache_headers(f'"{section}-{version}"', max_age=0)
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+
+    body = service.list_payload(
+        section,
+        version,
+        published_only,
+        limit,
+        cursor,
+        [f.strip() for f in fields.split(",") if f.strip()]
+        if fields
+        else None,
+    )
+    return Response(
+        content=body, media_type="application/json", headers=headers
+    )
 
 
 @router.get("/{section}/{slug}", response_model=ContentFileResponse)
@@ -56,6 +107,8 @@ def get_content(
     "/{section}/{slug}/markdown", response_model=MarkdownContentResponse
 )
 def get_markdown(
+    request: Request,
+    response: Response,
     section: Literal["blog", "project", "case-study"],
     slug: str,
     service: ContentService = Depends(get_content_service),
@@ -65,32 +118,65 @@ def get_markdown(
     if not content:
         raise HTTPException(404, f"Content not found: {section}/{slug}")
 
-    markdown = service.get_markdown_content(section, slug)
+    # Always revalidated: admin edits must show up on the next load
+    headers = cache_headers(service.markdown_etag(content), max_age=0)
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+
+    response.headers.update(headers)
+    markdown = service.get_markdown_content(content)
     return {"content": markdown, "metajson": content.metajson}
 
 
+@router.get("/{section}/{slug}/html", response_model=RenderedContentResponse)
+def get_html(
+    request: Request,
+    section: Literal["blog", "project", "case-study"],
+    slug: str,
+    service: ContentService = Depends(get_content_service),
+):
+    """Get rendered HTML and table of contents"""
+    content = service.get_by_slug(section, slug)
+    if not content:
+        raise HTTPException(404, f"Content not found: {section}/{slug}")
+
+    # The render key hashes the body, so it doubles as a strong ETag
+    key = service.render_key(content)
+    headers = cache_headers(f'"{key}"', max_age=0)
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+
+    return Response(
+        content=service.rendered_body(content, key),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
 @router.patch("/{content_id}", response_model=ContentFileResponse)
-def update_content(
+async def update_content(
     content_id: UUID,
     update_data: ContentFileUpdate,
     service: ContentService = Depends(get_content_service),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Update content file metadata (Admin only)"""
-    content = service.update(content_id, update_data)
+    content = await run_content_write(service.update, content_id, update_data)
     if not content:
         raise HTTPException(404, "Content not found")
     return content
 
 
 @router.delete("/{content_id}", status_code=204)
-def delete_content(
+async def delete_content(
     content_id: UUID,
     service: ContentService = Depends(get_content_service),
     current_user: User = Depends(get_current_admin_user),
 ):
     """Delete content file (Admin only)"""
-    success = service.delete(content_id)
+    success = await run_content_write(service.delete, content_id)
     if not success:
         raise HTTPException(404, "Content not found")
 
@@ -1,15 +1,39 @@
 import hashlib
 import hmac
 import logging
-
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
 from app.core.exceptions import GitHubAPIError, RateLimitError
-from app.database import SessionLocal, get_db
-from app.services.dsa_sync_service import DsaSyncService
-from app.services.github_service import github_service
+from app.database import get_db
+from app.services import dsa_events
+from app.services.dsa_sync_service import (
+    IST,
+    DsaSyncService,
+    data_version,
+    sync_repositories,
+)
+from app.services.github_service import (
+    get_github_service,
+    github_services,
+    stale_warning,
+)
+from app.services.highlight_service import HighlightService
+from app.utils.highlight import RENDER_VERSION, stylesheet
+from app.utils.http_cache import cache_headers, not_modified
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -17,21 +41,61 @@ settings = get_settings()
 router = APIRouter(prefix="/github", tags=["GitHub DSA"])
 
 
+def _warn_if_stale(response: Response) -> None:
+    """Flag responses built from expired GitHub cache entries."""
+    warning = stale_warning()
+    if warning:
+        response.headers["Warning"] = warning
+
+
+def _dsa_cache_headers(etag: str) -> dict:
+    return cache_headers(
+        etag,
+        settings.DSA_CACHE_MAX_AGE,
+        settings.DSA_CACHE_STALE_WHILE_REVALIDATE,
+    )
+
+
 @router.get("/health")
-async def check_github_connection():
+async def check_github_connection(repo: Optional[str] = None):
     """Check GitHub API connection status."""
     try:
-        return await github_service.check_connection()
+        return await get_github_service(repo).check_connection()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except GitHubAPIError as e:
         raise HTTPException(status_code=503, detail=str(e))
 
 
 @router.get("/dsa/tree")
-async def get_dsa_tree(prefix: str = "solutions/"):
-    """Return the repository tree filtered by prefix."""
+async def get_dsa_tree(
+    request: Request,
+    response: Response,
+    prefix: str = "solutions/",
+    repo: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Return a repository's tree filtered by prefix."""
     try:
-        tree = await github_service.get_tree(prefix=prefix)
+        service = DsaSyncService(db, repo)
+        headers = _dsa_cache_headers(f'"tree-{await data_version()}"')
+        cached = not_modified(request, headers)
+        if cached:
+            return cached
+
+        tree = await run_in_threadpool(service.get_tree, prefix=prefix)
+        if tree is None:
+            # Nothing synced under this prefix — ask GitHub (pre-serialized)
+            fallback = Response(
+                content=await service.github.get_tree_json(prefix=prefix),
+                media_type="application/json",
+            )
+            _warn_if_stale(fallback)
+            return fallback
+        response.headers.update(headers)
         return {"tree": tree}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except RateLimitError:
         raise HTTPException(
             status_code=429,
@@ -42,16 +106,37 @@ async def get_dsa_tree(prefix: str = "solutions/"):
 
 
 @router.get("/dsa/latest")
-async def get_latest_file():
+async def get_latest_file(
+    request: Request,
+    response: Response,
+    repo: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
     """Return the most recently committed file under solutions/."""
     try:
-        result = await github_service.get_latest_file()
+        service = DsaSyncService(db, repo)
+        headers = _dsa_cache_headers(f'"latest-{await data_version()}"')
+        cached = not_modified(request, headers)
+        if cached:
+            return cached
+
+        result = await service.get_latest_file(repo=repo)
+        if result is not None:
+            response.headers.update(headers)
+        else:
+            # Nothing synced yet — ask GitHub
+            result = await service.github.get_latest_file(
+                load_file=service.get_file_or_fetch
+            )
         if result is None:
             raise HTTPException(
                 status_code=404,
                 detail="No files found in solutions/",
             )
+        _warn_if_stale(response)
         return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except RateLimitError:
         raise HTTPException(
             status_code=429, detail="Rate limit exceeded"
@@ -61,31 +146,169 @@ async def get_latest_file():
 
 
 @router.get("/dsa/stats")
-def get_dsa_stats(db: Session = Depends(get_db)):
+async def get_dsa_stats(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """Return aggregated DSA dashboard statistics from DB."""
+    # Streaks and today/week counts also roll over at IST midnight
+    today = datetime.now(IST).date()
+    headers = _dsa_cache_headers(f'"stats-{await data_version()}-{today}"')
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+
+    response.headers.update(headers)
+    return await run_in_threadpool(DsaSyncService(db).get_stats)
+
+
+@router.get("/dsa/events")
+async def stream_dsa_events():
+    """
+    Server-Sent Events: `progress` while any worker syncs, then a `sync`
+    delta when the run commits. `hello` carries the current data version
+    so clients refetch only when a delta reports a newer one.
+    """
+    return StreamingResponse(
+        dsa_events.broker.stream({"version": await data_version()}),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/dsa/problems")
+def list_dsa_problems(
+    repo: Optional[str] = None,
+    folder: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    language: Optional[str] = None,
+    tag: Optional[str] = None,
+    sort: Literal["recent", "name"] = "recent",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated subset of problem fields"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Filtered, cursor-paginated problem listing from DB."""
     service = DsaSyncService(db)
-    return service.get_stats()
+    try:
+        return service.list_problems(
+            repo=repo,
+            folder=folder,
+            difficulty=difficulty,
+            language=language,
+            tag=tag,
+            sort=sort,
+            cursor=cursor,
+            limit=limit,
+            fields=[f.strip() for f in fields.split(",") if f.strip()]
+            if fields
+            else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/dsa/sync")
-async def trigger_sync(db: Session = Depends(get_db)):
-    """Trigger incremental sync (commits since last sync)."""
+@router.get("/dsa/search")
+def search_dsa_problems(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Ranked full-text + file name search over synced solutions."""
     service = DsaSyncService(db)
-    return await service.incremental_sync()
+    try:
+        return service.search_problems(q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _sync_targets(repo: Optional[str]) -> Optional[list]:
+    if repo and repo not in github_services:
+        raise HTTPException(
+            status_code=400, detail=f"Repository not configured: {repo}"
+        )
+    return [repo] if repo else None
+
+
+@router.post("/dsa/sync")
+async def trigger_sync(repo: Optional[str] = None):
+    """Incremental sync (commits since last sync), all repos in parallel."""
+    return await sync_repositories(repos=_sync_targets(repo))
 
 
 @router.post("/dsa/sync/full")
-async def trigger_full_sync(db: Session = Depends(get_db)):
-    """Trigger full re-sync of all files and commits."""
-    service = DsaSyncService(db)
-    return await service.full_sync()
+async def trigger_full_sync(repo: Optional[str] = None):
+    """Full re-sync of all files and commits, all repos in parallel."""
+    return await sync_repositories(full=True, repos=_sync_targets(repo))
+
+
+@router.get("/dsa/sync/runs")
+def list_sync_runs(
+    repo: Optional[str] = None,
+    before: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Sync run history (timings, GitHub usage, errors), newest first."""
+    return DsaSyncService(db).list_runs(repo=repo, before=before, limit=limit)
+
+
+@router.get("/dsa/highlight.css")
+def get_highlight_css(request: Request):
+    """Token styles for `format=html` files (light and `.dark` themes)."""
+    headers = cache_headers(f'"css-h{RENDER_VERSION}"', 24 * 60 * 60)
+    cached = not_modified(request, headers)
+    if cached:
+        return cached
+    return Response(
+        content=stylesheet(), media_type="text/css", headers=headers
+    )
 
 
 @router.get("/dsa/file/{file_path:path}")
-async def get_file_content(file_path: str):
-    """Fetch content of a single file by its repo-relative path."""
+async def get_file_content(
+    request: Request,
+    response: Response,
+    file_path: str,
+    repo: Optional[str] = None,
+    format: Literal["json", "html"] = "json",
+    db: Session = Depends(get_db),
+):
+    """
+    Serve a file from the local blob store, GitHub for unsynced paths.
+    `format=html` adds server-highlighted `html` (null if not rendered).
+    """
+    # Synced files are validated by blob SHA (and renderer version)
+    suffix = f".h{RENDER_VERSION}" if format == "html" else ""
     try:
-        return await github_service.get_file_content(file_path)
+        service = DsaSyncService(db, repo)
+        sha = await run_in_threadpool(
+            service.file_sha, file_path, await data_version()
+        )
+        if sha:
+            headers = _dsa_cache_headers(f'"{sha}{suffix}"')
+            cached = not_modified(request, headers)
+            if cached:
+                return cached
+
+        result = await service.get_file_or_fetch(file_path)
+        if format == "html":
+            result = dict(result)
+            result["html"] = await HighlightService(db).get_html(
+                result["sha"],
+                result["language"],
+                result["file_name"],
+                result["code"],
+            )
+        if sha:
+            etag = f'"{result["sha"]}{suffix}"'
+            response.headers.update(_dsa_cache_headers(etag))
+        _warn_if_stale(response)
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except RateLimitError:
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
     except GitHubAPIError as e:
@@ -96,8 +319,9 @@ async def get_file_content(file_path: str):
 
 @router.post("/dsa/cache/clear")
 async def clear_cache():
-    """Clear the GitHub API response cache."""
-    return github_service.clear_cache()
+    """Clear the GitHub API response cache of every repository."""
+    removed = [service.clear_cache() for service in github_services.values()]
+    return {"message": "; ".join(r["message"] for r in removed)}
 
 
 @router.post("/webhook")
@@ -128,6 +352,10 @@ async def github_webhook(request: Request):
 
     payload = await request.json()
 
+    repo = payload.get("repository", {}).get("full_name")
+    if repo not in github_services:
+        return {"status": "ignored", "reason": f"repo {repo} not synced"}
+
     # Check if any changed files are under solutions/
     commits = payload.get("commits", [])
     has_solutions = any(
@@ -145,15 +373,8 @@ async def github_webhook(request: Request):
     import asyncio
 
     async def _background_sync():
-        db = SessionLocal()
-        try:
-            service = DsaSyncService(db)
-            result = await service.incremental_sync()
-            logger.info("Webhook sync complete: %s", result)
-        except Exception as e:
-            logger.error("Webhook sync failed: %s", e)
-        finally:
-            db.close()
+        result = await sync_repositories(repos=[repo], trigger="webhook")
+        logger.info("Webhook sync complete: %s", result)
 
     asyncio.create_task(_background_sync())
 
@@ -22,6 +22,30 @@ class BaseConfig(BaseSettings):
     MEDIA_ROOT: str = "/app/media"
     MARKDOWN_DIR: str = "markdown"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    # Markdown bodies kept in memory per worker (validated by mtime + size)
+    MARKDOWN_CACHE_SIZE: int = 256
+    # Public URL MEDIA_ROOT is served from; rendered HTML links images here
+    MEDIA_URL: str = "/media"
+    # Rendered content responses (/html) kept in memory per worker
+    CONTENT_RENDER_CACHE_SIZE: int = 128
+    # Serialized /content/{section} list pages kept per worker; checked
+    # against the section's content_versions row on every request
+    CONTENT_LIST_CACHE_SIZE: int = 64
+    # Concurrent content writes (upload parsing, commits, disk) per worker
+    CONTENT_WRITE_THREADS: int = 2
+    # Responsive variants of uploaded content images: target widths,
+    # formats (best first) and encoder processes per worker
+    IMAGE_VARIANT_WIDTHS: list[int] = [320, 640, 960, 1280, 1920]
+    IMAGE_VARIANT_FORMATS: list[str] = ["avif", "webp"]
+    IMAGE_VARIANT_PROCESSES: int = 1
+    # Unreferenced media blobs are deleted once released this long ago
+    MEDIA_GC_GRACE_SECONDS: int = 60 * 60
+    # /content/import: archive size, its unpacked size and member count,
+    # and frontmatter parsing processes per worker
+    CONTENT_IMPORT_MAX_SIZE: int = 100 * 1024 * 1024  # 100MB
+    CONTENT_IMPORT_MAX_UNPACKED: int = 500 * 1024 * 1024  # 500MB
+    CONTENT_IMPORT_MAX_FILES: int = 5000
+    CONTENT_IMPORT_PROCESSES: int = 2
 
     # API
     API_V1_PREFIX: str = "/api/v1"
@@ -33,6 +57,28 @@ class BaseConfig(BaseSettings):
     GITHUB_REPO_NAME: str = ""
     GITHUB_API_BASE: str = "https://api.github.com"
     GITHUB_WEBHOOK_SECRET: str = ""
+    # Synced repositories as "owner/name"; the first is the default for
+    # repo-scoped endpoints. Falls back to GITHUB_REPO_OWNER/NAME.
+    GITHUB_REPOS: list[str] = []
+    # GitHub response cache (seconds). Expired entries are served while a
+    # background refresh runs, and through GitHub outages up to MAX_STALE.
+    GITHUB_CACHE_TTL: int = 60 * 60
+    GITHUB_CACHE_MAX_STALE: int = 24 * 60 * 60
+    # Concurrent GitHub requests, shared by every repository sync
+    GITHUB_MAX_CONCURRENCY: int = 8
+    # Requests fail fast once the shared rate budget drops to this
+    GITHUB_RATE_RESERVE: int = 100
+    # Parallel subtree fetches when a recursive tree is truncated
+    GITHUB_TREE_CONCURRENCY: int = 8
+    # Larger solution files are synced header-only (no blob stored)
+    DSA_BLOB_MAX_BYTES: int = 1024 * 1024  # 1MB
+    # Cache-Control for DSA read endpoints (seconds); ETags revalidate
+    DSA_CACHE_MAX_AGE: int = 10
+    DSA_CACHE_STALE_WHILE_REVALIDATE: int = 300
+    # Server-side highlighting (?format=html): render processes per worker
+    # and the largest file rendered (larger ones highlight client-side)
+    DSA_HIGHLIGHT_PROCESSES: int = 2
+    DSA_HIGHLIGHT_MAX_CHARS: int = 512 * 1024
 
     # Security
     SECRET_KEY: str = "dev-only-key-change-in-production"
@@ -49,6 +95,14 @@ class BaseConfig(BaseSettings):
                 f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
                 f"@db:5432/{self.POSTGRES_DB}"
             )
+        if (
+            not self.GITHUB_REPOS
+            and self.GITHUB_REPO_OWNER
+            and self.GITHUB_REPO_NAME
+        ):
+            self.GITHUB_REPOS = [
+                f"{self.GITHUB_REPO_OWNER}/{self.GITHUB_REPO_NAME}"
+            ]
 
 
 class DevelopmentConfig(BaseConfig):
@@ -8,11 +8,16 @@ from app.core.security import decode_access_token
 security = HTTPBearer()
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
-    """Get the current authenticated user"""
+    """
+    Get the current authenticated user
+
+    Plain def: FastAPI runs it in the threadpool, keeping the user query
+    off the event loop for async admin routes.
+    """
     token = credentials.credentials
 
     email = decode_access_token(token)
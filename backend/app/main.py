@@ -7,6 +7,8 @@ from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from app.config import get_settings
 from app.api.routes import content, auth, github
+from app.services.file_storage import BLOBS_DIR
+from app.utils.http_cache import ImmutableStaticFiles
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +32,14 @@ app.add_middleware(
 # Static files - serve media files in development (Nginx handles in production)
 media_path = Path(settings.MEDIA_ROOT)
 if media_path.exists():
+    # Content-addressed blobs never change: cache them for a year
+    blobs_path = media_path / BLOBS_DIR
+    blobs_path.mkdir(exist_ok=True)
+    app.mount(
+        f"/media/{BLOBS_DIR}",
+        ImmutableStaticFiles(directory=str(blobs_path)),
+        name="media_blobs",
+    )
     app.mount("/media", StaticFiles(directory=str(media_path)), name="media")
 
 # Routes
@@ -42,28 +52,57 @@ app.include_router(github.router, prefix=settings.API_V1_PREFIX)
 async def startup_dsa_sync():
     """Run DSA sync in background on startup."""
     async def _sync():
-        from app.database import SessionLocal
-        from app.services.dsa_sync_service import DsaSyncService
-
-        db = SessionLocal()
-        try:
-            service = DsaSyncService(db)
-            state = service._get_sync_state()
-            if state is None:
-                logger.info("DSA: no sync state found, running full sync...")
-                result = await service.full_sync()
-            else:
-                logger.info("DSA: running incremental sync...")
-                result = await service.incremental_sync()
-            logger.info("DSA sync complete: %s", result)
-        except Exception as e:
-            logger.error("DSA startup sync failed: %s", e)
-        finally:
-            db.close()
+        from app.services.dsa_sync_service import (
+            claim_unnamespaced_rows,
+            sync_repositories,
+        )
+
+        await asyncio.to_thread(claim_unnamespaced_rows)
+        # Incremental per repo; repos never synced get a full sync
+        logger.info("DSA: syncing %s...", ", ".join(settings.GITHUB_REPOS))
+        result = await sync_repositories(trigger="startup")
+        logger.info("DSA sync complete: %s", result)
 
     asyncio.create_task(_sync())
 
 
+@app.on_event("startup")
+async def startup_media_gc():
+    """Collect unreferenced media blobs periodically."""
+    async def _collect():
+        from app.services.media_store import collect_garbage
+
+        while True:
+            await asyncio.sleep(settings.MEDIA_GC_GRACE_SECONDS)
+            try:
+                await asyncio.to_thread(collect_garbage)
+            except Exception as e:
+                logger.warning("Media GC failed: %s", e)
+
+    asyncio.create_task(_collect())
+
+
+@app.on_event("shutdown")
+def shutdown_highlight_pool():
+    from app.services.highlight_service import shutdown_pool
+
+    shutdown_pool()
+
+
+@app.on_event("shutdown")
+def shutdown_image_pool():
+    from app.services.image_service import shutdown_pool
+
+    shutdown_pool()
+
+
+@app.on_event("shutdown")
+def shutdown_import_pool():
+    from app.services.import_service import shutdown_pool
+
+    shutdown_pool()
+
+
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
@@ -1,4 +1,14 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Index
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -20,6 +30,16 @@ class ContentFile(Base):
     # Metadata (JSONB for flexibility) - renamed to avoid built-in conflicts
     metajson = Column(JSONB, nullable=False)
 
+    # Generated from metajson so it can never drift; B-tree indexed with
+    # section for slug lookups (GIN on metajson cannot serve ->> equality)
+    slug = Column(Text, Computed("metajson->>'slug'", persisted=True))
+
+    # ContentRender of the current markdown (ContentService.rendered_body)
+    render_hash = Column(String(64), nullable=True, index=True)
+
+    # Bumped when this post's images or their variants change
+    media_version = Column(Integer, nullable=False, default=0)
+
     # Publishing
     is_published = Column(Boolean, default=False, index=True)
     published_at = Column(DateTime(timezone=True), nullable=True)
@@ -32,18 +52,48 @@ class ContentFile(Base):
     __table_args__ = (
         Index('idx_section_filename', 'section', 'filename', unique=True),
         Index('idx_published', 'is_published', 'published_at'),
+        # Keyset pages of a section (ContentService.list_by_section)
+        Index(
+            'idx_content_files_section_published',
+            section,
+            published_at.desc(),
+            id.desc(),
+        ),
         Index('idx_metajson_gin', 'metajson', postgresql_using='gin'),
+        Index(
+            'uq_content_files_section_slug', 'section', 'slug', unique=True
+        ),
     )
 
     def __repr__(self):
         return f"<ContentFile {self.section}/{self.filename}>"
 
-    @property
-    def slug(self) -> str:
-        """Extract slug from metajson"""
-        return self.metajson.get('slug', '')
-
     @property
     def title(self) -> str:
         """Extract title from metajson"""
         return self.metajson.get('title', self.filename)
+
+
+class ContentRender(Base):
+    """Rendered HTML + table of contents, keyed by a hash of its inputs."""
+
+    __tablename__ = "content_renders"
+
+    # sha256 of renderer version, image base URL and markdown body
+    hash = Column(String(64), primary_key=True)
+    html = Column(Text, nullable=False)
+    toc = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ContentVersion(Base):
+    """
+    Per-section change counter, bumped in the same transaction as every
+    content write. Workers compare it to decide whether their cached list
+    responses are still current.
+    """
+
+    __tablename__ = "content_versions"
+
+    section = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
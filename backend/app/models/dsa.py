@@ -1,5 +1,15 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Index
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Integer,
+    String,
+    Text,
+    Date,
+    DateTime,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -9,7 +19,9 @@ class DsaProblem(Base):
     __tablename__ = "dsa_problems"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    path = Column(String(500), unique=True, nullable=False)
+    # "owner/name" of the source repository; paths are unique per repo
+    repo = Column(String(200), nullable=False)
+    path = Column(String(500), nullable=False)
     filename = Column(String(255), nullable=False)
     folder = Column(String(255))
     language = Column(String(20))
@@ -21,15 +33,73 @@ class DsaProblem(Base):
     sha = Column(String(40), nullable=False)
     first_seen_at = Column(DateTime(timezone=True), nullable=False)
     last_updated_at = Column(DateTime(timezone=True), nullable=False)
+    last_commit_message = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     __table_args__ = (
+        Index("uq_dsa_problems_repo_path", "repo", "path", unique=True),
         Index("idx_dsa_problems_difficulty", "difficulty"),
-        Index("idx_dsa_problems_folder", "folder"),
+        Index("idx_dsa_problems_difficulty_lower", func.lower(difficulty)),
+        Index(
+            "idx_dsa_problems_folder_last_updated",
+            "folder",
+            "last_updated_at",
+            postgresql_include=["filename"],
+        ),
+        Index("idx_dsa_problems_last_updated", "last_updated_at"),
+        Index("idx_dsa_problems_first_seen", "first_seen_at"),
+        Index("idx_dsa_problems_filename", "filename", "id"),
+        Index("idx_dsa_problems_sha", "sha"),
         Index("idx_dsa_problems_tags", "tags", postgresql_using="gin"),
+        Index(
+            "idx_dsa_problems_path_trgm",
+            "path",
+            postgresql_using="gin",
+            postgresql_ops={"path": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_dsa_problems_filename_trgm",
+            "filename",
+            postgresql_using="gin",
+            postgresql_ops={"filename": "gin_trgm_ops"},
+        ),
     )
 
 
+class DsaBlob(Base):
+    """Decoded solution source, keyed by git blob SHA."""
+
+    __tablename__ = "dsa_blobs"
+
+    sha = Column(String(40), primary_key=True)
+    content = Column(Text, nullable=False)
+    size = Column(Integer)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', content)", persisted=True),
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "idx_dsa_blobs_search", "search_vector", postgresql_using="gin"
+        ),
+    )
+
+
+class DsaHighlight(Base):
+    """Server-rendered highlighted HTML per blob SHA and language."""
+
+    __tablename__ = "dsa_highlights"
+
+    sha = Column(String(40), primary_key=True)
+    language = Column(String(20), primary_key=True)
+    # Renderer version; rows from older renderers are re-rendered
+    version = Column(Integer, nullable=False)
+    html = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class DsaDailyActivity(Base):
     __tablename__ = "dsa_daily_activity"
 
@@ -49,9 +119,43 @@ class DsaTopicStats(Base):
 
 
 class DsaSyncState(Base):
+    """Sync progress, one row per repository."""
+
     __tablename__ = "dsa_sync_state"
 
-    id = Column(Integer, primary_key=True, default=1)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    repo = Column(String(200), unique=True, nullable=False)
     last_commit_sha = Column(String(40))
     last_synced_at = Column(DateTime(timezone=True))
     total_commits_processed = Column(Integer, default=0)
+
+
+class DsaSyncRun(Base):
+    """One sync run: trigger, per-phase timings, GitHub usage, errors."""
+
+    __tablename__ = "dsa_sync_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    repo = Column(String(200), nullable=False)
+    sync_type = Column(String(20), nullable=False)  # full | incremental
+    trigger = Column(String(20), nullable=False)  # startup | webhook | manual
+    status = Column(String(20), nullable=False)  # success | partial | failed
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    # Phase name → milliseconds (tree, files, commits, db_write, topic_stats)
+    phases = Column(JSONB, nullable=False, default=dict)
+    github_calls = Column(Integer, nullable=False, default=0)
+    bytes_downloaded = Column(BigInteger, nullable=False, default=0)
+    # Calls counted against the rate limit (304s are free)
+    rate_limit_used = Column(Integer, nullable=False, default=0)
+    rate_limit_remaining = Column(Integer)
+    commits_processed = Column(Integer, nullable=False, default=0)
+    problems_changed = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    # [{"path": ..., "error": ...}], capped
+    errors = Column(JSONB, nullable=False, default=list)
+
+    __table_args__ = (
+        # Newest-first history per repo, paged by id
+        Index("idx_dsa_sync_runs_repo_id", "repo", "id"),
+    )
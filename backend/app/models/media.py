@@ -0,0 +1,65 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class MediaBlob(Base):
+    """
+    One stored image, by content hash: MEDIA_ROOT/blobs/<sha[:2]>/<sha><ext>.
+
+    `refcount` counts content_images rows naming it. Blobs that drop to
+    zero are deleted by MediaStore.collect_garbage once `released_at` is
+    older than MEDIA_GC_GRACE_SECONDS.
+    """
+
+    __tablename__ = "media_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    ext = Column(String(10), nullable=False)
+    content_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    refcount = Column(Integer, nullable=False, default=0)
+    released_at = Column(DateTime(timezone=True), nullable=True)
+    # Responsive variants (see image_variants.make_variants); NULL until
+    # generated, or for images served as uploaded
+    variants = Column(JSONB, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            'idx_media_blobs_released',
+            'released_at',
+            postgresql_where=text('refcount = 0'),
+        ),
+    )
+
+
+class ContentImage(Base):
+    """A post's image name (as referenced in its markdown) → blob"""
+
+    __tablename__ = "content_images"
+
+    content_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("content_files.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    name = Column(String(255), primary_key=True)
+    sha256 = Column(
+        String(64),
+        ForeignKey("media_blobs.sha256"),
+        nullable=False,
+        index=True,
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
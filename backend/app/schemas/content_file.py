@@ -78,6 +78,41 @@ class ContentFileListItem(BaseModel):
         from_attributes = True
 
 
+class ContentFileListPage(BaseModel):
+    items: list[ContentFileListItem]
+    next_cursor: Optional[str] = None
+
+
 class MarkdownContentResponse(BaseModel):
     content: str
     metajson: dict[str, Any]
+
+
+class TocEntry(BaseModel):
+    id: str
+    text: str
+    level: int
+
+
+class RenderedContentResponse(BaseModel):
+    html: str
+    toc: list[TocEntry]
+
+
+class ContentImportFile(BaseModel):
+    path: str
+    # created (valid on a dry run), conflict or invalid
+    status: Literal["created", "valid", "conflict", "invalid"]
+    slug: Optional[str] = None
+    id: Optional[UUID] = None
+    images: int = 0
+    missing_images: list[str] = []
+    detail: Optional[str] = None
+
+
+class ContentImportReport(BaseModel):
+    section: str
+    dry_run: bool
+    created: int
+    failed: int
+    files: list[ContentImportFile]
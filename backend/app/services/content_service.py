@@ -1,16 +1,99 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import and_, desc, func, literal, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from fastapi import UploadFile, HTTPException, Depends
-from typing import Optional, List
+from collections import OrderedDict
+from pathlib import Path, PurePosixPath
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, List, Tuple, TypeVar
 from datetime import datetime
 from uuid import UUID
-
-from app.models.content_file import ContentFile
-from app.schemas.content_file import ContentFileUpdate
-from app.services.file_storage import file_storage
+import anyio
+import base64
+import functools
+import hashlib
+import json
+import logging
+import mimetypes
+import posixpath
+import re
+
+from app.config import get_settings
+from app.models.content_file import ContentFile, ContentRender, ContentVersion
+from app.schemas.content_file import ContentFileListPage, ContentFileUpdate
+from app.services.file_storage import (
+    BLOBS_DIR,
+    SpooledUpload,
+    file_storage,
+)
+from app.services.image_service import schedule_variants
+from app.services.import_service import parse_entries
+from app.services.media_store import (
+    IMAGE_EXTENSIONS,
+    AttachedImage,
+    MediaStore,
+    media_url,
+)
+from app.utils.content_archive import ContentArchive
 from app.utils.markdown_parser import MarkdownParser
+from app.utils.markdown_render import RENDER_VERSION, render_markdown
 from app.database import get_db
 
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Render hash → serialized /html response body, least recently used first
+_render_bodies: "OrderedDict[str, bytes]" = OrderedDict()
+_render_bodies_lock = Lock()
+
+
+# (section, published_only, limit, cursor, fields) → (version, JSON body)
+_list_bodies: "OrderedDict[tuple, Tuple[int, bytes]]" = OrderedDict()
+_list_bodies_lock = Lock()
+
+# metajson keys accepted in ?fields=, and how many (each is two
+# jsonb_build_object arguments; Postgres functions take at most 100)
+METAJSON_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]{0,63}$")
+MAX_FIELDS = 32
+
+# Unique per section: imported post key → how conflicts are reported
+IMPORT_KEYS = {"slug": "slug", "filename": "filename", "file_path": "folder"}
+
+
+T = TypeVar("T")
+
+# Threads available to content writes; created on first use (it must be
+# made inside the event loop)
+_write_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+async def run_content_write(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking content write (parsing, DB, disk) in a worker thread.
+
+    Writes draw on their own CONTENT_WRITE_THREADS tokens rather than the
+    threadpool's default limiter, so a burst of uploads cannot occupy the
+    threads that serve sync read routes.
+    """
+    global _write_limiter
+    if _write_limiter is None:
+        _write_limiter = anyio.CapacityLimiter(settings.CONTENT_WRITE_THREADS)
+    return await anyio.to_thread.run_sync(
+        functools.partial(func, *args, **kwargs), limiter=_write_limiter
+    )
+
+
+def _render_body(html: str, toc: list) -> bytes:
+    return json.dumps(
+        {"html": html, "toc": toc}, separators=(",", ":")
+    ).encode()
+
+
+def _evict_render_body(key: str) -> None:
+    with _render_bodies_lock:
+        _render_bodies.pop(key, None)
+
 
 class ContentService:
     """Business logic for content management"""
@@ -28,11 +111,19 @@ class ContentService:
         if not file.filename.endswith(".md"):
             raise HTTPException(400, "Only .md files allowed")
 
-        # Read and parse file
-        content = await file.read()
+        # Read (bounded by MAX_UPLOAD_SIZE), then parse, store and commit
+        # in a content-write thread
+        content = await file_storage.read_upload(file)
+        return await run_content_write(
+            self._create, section, file.filename, content
+        )
+
+    def _create(
+        self, section: str, filename: str, content: bytes
+    ) -> ContentFile:
+        """Blocking half of create_from_upload"""
         try:
             metajson, markdown_content = self.parser.parse(content)
-            print("metajson: ", metajson)
         except ValueError as e:
             # Parser raises ValueError with helpful messages for YAML errors
             raise HTTPException(400, str(e))
@@ -52,33 +143,315 @@ class ContentService:
             )
 
         # Get title for folder name
-        title = metajson.get("title", file.filename)
+        title = metajson.get("title", filename)
         folder_name = file_storage.get_blog_folder_name(title)
 
         # Save only the markdown content (without frontmatter) to disk
         # Uses new structure: markdown/section/Blog_Name/content.md
         file_path = file_storage.save_content(
             section,
-            file.filename,
+            file_storage.safe_filename(filename),
             markdown_content,
-            folder_name=folder_name
+            folder_name=folder_name,
         )
 
         # Create database record
         content_file = ContentFile(
             section=section,
-            filename=file.filename,
+            filename=filename,
             file_path=file_path,
             metajson=metajson,
             is_published=False,
         )
 
         self.db.add(content_file)
-        self.db.commit()
+        self._bump_version(section)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent upload (unique section+slug or
+            # section+filename). The folder is shared with the winner when
+            # titles match, so it is left in place.
+            self.db.rollback()
+            raise HTTPException(
+                400, "Content with this slug or filename already exists"
+            )
         self.db.refresh(content_file)
+        self.prerender(content_file)
 
         return content_file
 
+    async def import_archive(
+        self, section: str, archive: UploadFile, dry_run: bool = False
+    ) -> dict:
+        """
+        Import a zip/tar of markdown files and the images they use
+
+        Markdown files are parsed and validated in parallel, their slugs,
+        filenames and folders checked against the section in one query,
+        and every valid post is written in one transaction. A post's
+        images/<name> references are taken from the images/ folder beside
+        it. Invalid or conflicting files are reported and skipped; with
+        dry_run nothing is written.
+
+        Returns:
+            Per-file report (ContentImportReport)
+        """
+        incoming = Path(settings.MEDIA_ROOT) / BLOBS_DIR / ".incoming"
+        spooled = await file_storage.spool_upload(
+            archive, incoming, limit=settings.CONTENT_IMPORT_MAX_SIZE
+        )
+        try:
+            return await run_content_write(
+                self._import, section, str(spooled.tmp), dry_run
+            )
+        finally:
+            spooled.tmp.unlink(missing_ok=True)
+
+    def _import(self, section: str, archive_path: str, dry_run: bool) -> dict:
+        """Blocking half of import_archive"""
+        try:
+            archive = ContentArchive(archive_path)
+        except ValueError as e:
+            raise HTTPException(400, str(e))
+
+        with archive:
+            members = archive.members
+            if len(members) > settings.CONTENT_IMPORT_MAX_FILES:
+                raise HTTPException(
+                    413,
+                    f"Archive has more than "
+                    f"{settings.CONTENT_IMPORT_MAX_FILES} files",
+                )
+            unpacked = sum(size for size, _ in members.values())
+            if unpacked > settings.CONTENT_IMPORT_MAX_UNPACKED:
+                limit_mb = settings.CONTENT_IMPORT_MAX_UNPACKED / 1024**2
+                raise HTTPException(
+                    413, f"Archive unpacks to more than {limit_mb:g}MB"
+                )
+
+            report: Dict[str, Dict[str, Any]] = {}
+            sources = []
+            for path, (size, _) in members.items():
+                if not path.endswith(".md"):
+                    continue
+                report[path] = {"path": path}
+                if size > settings.MAX_UPLOAD_SIZE:
+                    report[path].update(
+                        status="invalid", detail="File exceeds upload limit"
+                    )
+                    continue
+                sources.append((path, archive.read(path)))
+            if not report:
+                raise HTTPException(400, "No markdown files in archive")
+
+            # Parse and validate, then settle names within the archive
+            posts = []
+            taken: Dict[str, Dict[str, str]] = {k: {} for k in IMPORT_KEYS}
+            for parsed in parse_entries(section, sources):
+                entry = report[parsed["path"]]
+                if "error" in parsed:
+                    entry.update(status="invalid", detail=parsed["error"])
+                    continue
+                post = self._import_post(section, archive, parsed)
+                entry.update(
+                    slug=post["slug"],
+                    images=len(post["images"]),
+                    missing_images=post["missing_images"],
+                )
+                clash = next(
+                    (k for k in IMPORT_KEYS if post[k] in taken[k]), None
+                )
+                if clash:
+                    entry.update(
+                        status="conflict",
+                        detail=f"Same {IMPORT_KEYS[clash]} as "
+                        f"{taken[clash][post[clash]]}",
+                    )
+                    continue
+                for key in IMPORT_KEYS:
+                    taken[key][post[key]] = post["path"]
+                posts.append(post)
+
+            # Then against the section, in one query
+            if posts:
+                existing = (
+                    self.db.query(
+                        ContentFile.slug,
+                        ContentFile.filename,
+                        ContentFile.file_path,
+                    )
+                    .filter(
+                        ContentFile.section == section,
+                        or_(
+                            ContentFile.slug.in_(list(taken["slug"])),
+                            ContentFile.filename.in_(list(taken["filename"])),
+                            ContentFile.file_path.in_(
+                                list(taken["file_path"])
+                            ),
+                        ),
+                    )
+                    .all()
+                )
+                used = {
+                    key: {getattr(row, key) for row in existing}
+                    for key in IMPORT_KEYS
+                }
+                fresh = []
+                for post in posts:
+                    clash = next(
+                        (k for k in IMPORT_KEYS if post[k] in used[k]), None
+                    )
+                    if clash:
+                        report[post["path"]].update(
+                            status="conflict",
+                            detail=f"Content with this {IMPORT_KEYS[clash]} "
+                            f"already exists",
+                        )
+                    else:
+                        fresh.append(post)
+                posts = fresh
+
+            if dry_run:
+                for post in posts:
+                    report[post["path"]]["status"] = "valid"
+            elif posts:
+                self._import_posts(section, archive, posts, report)
+
+        files = list(report.values())
+        imported = sum(f["status"] in ("created", "valid") for f in files)
+        return {
+            "section": section,
+            "dry_run": dry_run,
+            "created": imported,
+            "failed": len(files) - imported,
+            "files": files,
+        }
+
+    @staticmethod
+    def _import_post(
+        section: str, archive: ContentArchive, parsed: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Where a parsed archive entry will be stored, and its images"""
+        metajson = parsed["metajson"]
+        directory, filename = posixpath.split(parsed["path"])
+        # content.md is the site's own layout: name the post after its folder
+        if filename == "content.md" and directory:
+            filename = f"{posixpath.basename(directory)}.md"
+        folder_name = file_storage.get_blog_folder_name(
+            str(metajson.get("title", filename))
+        )
+
+        # images/<name> → archive member, if present and importable
+        images: Dict[str, str] = {}
+        missing = []
+        for name in parsed["images"]:
+            member = posixpath.join(directory, "images", name)
+            if (
+                member in archive.members
+                and archive.size(member) <= settings.MAX_UPLOAD_SIZE
+                and PurePosixPath(name).suffix.lower() in IMAGE_EXTENSIONS
+            ):
+                images[name] = member
+            else:
+                missing.append(name)
+
+        return {
+            "path": parsed["path"],
+            "metajson": metajson,
+            "markdown": parsed["markdown"],
+            "slug": str(metajson["slug"]),
+            "filename": filename,
+            "folder_name": folder_name,
+            "file_path": file_storage.content_path(
+                section, file_storage.safe_filename(filename), folder_name
+            ),
+            "images": images,
+            "missing_images": missing,
+        }
+
+    def _import_posts(
+        self,
+        section: str,
+        archive: ContentArchive,
+        posts: List[Dict[str, Any]],
+        report: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Write validated posts, their rows and images; one commit"""
+        incoming = Path(settings.MEDIA_ROOT) / BLOBS_DIR / ".incoming"
+        needed = {m for post in posts for m in post["images"].values()}
+        spooled: Dict[str, SpooledUpload] = {}
+        written: List[str] = []
+        links = []
+        try:
+            # In archive order, so compressed tars are never rewound
+            for member in archive.members:
+                if member in needed:
+                    with archive.open(member) as source:
+                        spooled[member] = file_storage.spool_file(
+                            source, incoming, member
+                        )
+
+            rows = []
+            for post in posts:
+                written.append(
+                    file_storage.save_content(
+                        section,
+                        file_storage.safe_filename(post["filename"]),
+                        post["markdown"],
+                        folder_name=post["folder_name"],
+                    )
+                )
+                rows.append(
+                    ContentFile(
+                        section=section,
+                        filename=post["filename"],
+                        file_path=post["file_path"],
+                        metajson=post["metajson"],
+                        is_published=False,
+                    )
+                )
+            self.db.add_all(rows)
+            self.db.flush()
+
+            media = MediaStore(self.db)
+            for post, row in zip(posts, rows):
+                report[post["path"]].update(status="created", id=row.id)
+                for name, member in post["images"].items():
+                    attached = media.attach(
+                        row.id,
+                        name,
+                        spooled[member],
+                        mimetypes.guess_type(name)[0] or "",
+                    )
+                    links.append(
+                        (row.file_path, name, attached, spooled[member])
+                    )
+
+            self._bump_version(section)
+            self.db.commit()
+        except BaseException as e:
+            self.db.rollback()
+            for file_path in written:
+                file_storage.delete_file(file_path)
+            if isinstance(e, IntegrityError):
+                # Lost a race with a concurrent upload or import
+                raise HTTPException(
+                    400, "Content with this slug or filename already exists"
+                ) from e
+            raise
+        finally:
+            for upload in spooled.values():
+                upload.tmp.unlink(missing_ok=True)
+
+        for file_path, name, attached, upload in links:
+            file_storage.link_image(file_path, name, attached.blob_path)
+            if attached.needs_variants:
+                # Variant results are collected on the event loop
+                anyio.from_thread.run_sync(
+                    schedule_variants, upload.sha256, attached.blob_path
+                )
+
     def get_by_id(self, content_id: UUID) -> Optional[ContentFile]:
         """Get content file by ID"""
         return (
@@ -93,32 +466,187 @@ class ContentService:
             self.db.query(ContentFile)
             .filter(
                 ContentFile.section == section,
-                ContentFile.metajson["slug"].astext == slug,
+                ContentFile.slug == slug,
             )
             .first()
         )
 
+    @staticmethod
+    def _check_fields(fields: Optional[List[str]]) -> Optional[List[str]]:
+        """?fields= keys, de-duplicated in order; 400 if invalid or too many"""
+        if not fields:
+            return None
+        fields = list(dict.fromkeys(fields))
+        invalid = [f for f in fields if not METAJSON_KEY.match(f)]
+        if invalid:
+            raise HTTPException(400, f"Invalid fields: {', '.join(invalid)}")
+        if len(fields) > MAX_FIELDS:
+            raise HTTPException(400, f"At most {MAX_FIELDS} fields allowed")
+        return fields
+
+    @staticmethod
+    def _encode_cursor(
+        published_at: Optional[datetime], content_id: UUID
+    ) -> str:
+        stamp = published_at.isoformat() if published_at else None
+        raw = json.dumps([stamp, str(content_id)]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[Optional[datetime], UUID]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            stamp, content_id = json.loads(base64.urlsafe_b64decode(padded))
+            published_at = datetime.fromisoformat(stamp) if stamp else None
+            return published_at, UUID(content_id)
+        except (ValueError, TypeError) as e:
+            raise HTTPException(400, f"Invalid cursor: {cursor}") from e
+
     def list_by_section(
         self,
         section: str,
         published_only: bool = True,
         limit: int = 100,
-        offset: int = 0,
-    ) -> list[ContentFile]:
-        """List content files by section"""
-        query = self.db.query(ContentFile).filter(
-            ContentFile.section == section
-        )
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> dict:
+        """
+        List content files by section, newest first, with keyset
+        pagination over (published_at, id).
+
+        The walk follows idx_content_files_section_published:
+        published_at DESC with NULLs (unpublished drafts) first, then
+        id DESC. `next_cursor` is
+        opaque and None on the last page. With `fields`, metajson is cut
+        down to those keys in SQL.
+        """
+        fields = self._check_fields(fields)
+        if fields:
+            metajson = func.jsonb_strip_nulls(
+                func.jsonb_build_object(
+                    *(
+                        arg
+                        for f in fields
+                        for arg in (literal(f), ContentFile.metajson[f])
+                    )
+                )
+            )
+        else:
+            metajson = ContentFile.metajson
+
+        query = self.db.query(
+            ContentFile.id,
+            ContentFile.section,
+            ContentFile.filename,
+            metajson.label("metajson"),
+            ContentFile.is_published,
+            ContentFile.published_at,
+            ContentFile.created_at,
+        ).filter(ContentFile.section == section)
 
         if published_only:
             query = query.filter(ContentFile.is_published == True)
 
-        return (
-            query.order_by(desc(ContentFile.published_at))
-            .limit(limit)
-            .offset(offset)
+        if cursor:
+            published_at, content_id = self._decode_cursor(cursor)
+            if published_at is None:
+                # Still inside the drafts: later drafts, then everything
+                query = query.filter(
+                    or_(
+                        and_(
+                            ContentFile.published_at.is_(None),
+                            ContentFile.id < content_id,
+                        ),
+                        ContentFile.published_at.isnot(None),
+                    )
+                )
+            else:
+                query = query.filter(
+                    tuple_(ContentFile.published_at, ContentFile.id)
+                    < tuple_(published_at, content_id)
+                )
+
+        rows = (
+            query.order_by(
+                desc(ContentFile.published_at), desc(ContentFile.id)
+            )
+            .limit(limit + 1)
             .all()
         )
+        page = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = self._encode_cursor(last.published_at, last.id)
+
+        return {"items": page, "next_cursor": next_cursor}
+
+    # ── Cached list responses ──
+
+    def _bump_version(self, section: str) -> None:
+        """Invalidate every worker's cached lists for section on commit"""
+        self.db.execute(
+            pg_insert(ContentVersion)
+            .values(section=section, version=1)
+            .on_conflict_do_update(
+                index_elements=["section"],
+                set_={"version": ContentVersion.version + 1},
+            )
+        )
+
+    def section_version(self, section: str) -> int:
+        version = (
+            self.db.query(ContentVersion.version)
+            .filter(ContentVersion.section == section)
+            .scalar()
+        )
+        return version or 0
+
+    def list_payload(
+        self,
+        section: str,
+        version: int,
+        published_only: bool = True,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+    ) -> bytes:
+        """
+        Serialized list_by_section page, cached per worker while the
+        section stays at `version`.
+
+        Callers read `version` (section_version) before calling, so a
+        page is never older than the version it is stored under.
+        """
+        fields = self._check_fields(fields)
+        key = (
+            section,
+            published_only,
+            limit,
+            cursor,
+            tuple(fields) if fields else None,
+        )
+        with _list_bodies_lock:
+            cached = _list_bodies.get(key)
+            if cached is not None and cached[0] == version:
+                _list_bodies.move_to_end(key)
+                return cached[1]
+
+        page = self.list_by_section(
+            section, published_only, limit, cursor, fields
+        )
+        body = (
+            ContentFileListPage.model_validate(page, from_attributes=True)
+            .model_dump_json()
+            .encode()
+        )
+        with _list_bodies_lock:
+            _list_bodies[key] = (version, body)
+            _list_bodies.move_to_end(key)
+            while len(_list_bodies) > settings.CONTENT_LIST_CACHE_SIZE:
+                _list_bodies.popitem(last=False)
+        return body
 
     def update(
         self, content_id: UUID, update_data: ContentFileUpdate
@@ -130,16 +658,34 @@ class ContentService:
 
         update_dict = update_data.model_dump(exclude_unset=True)
 
+        # Slug follows metajson; keep it unique within the section
+        if "metajson" in update_dict:
+            slug = (update_dict["metajson"] or {}).get("slug")
+            if slug != content.slug:
+                existing = self.get_by_slug(content.section, slug)
+                if existing:
+                    raise HTTPException(
+                        400, f"Content with slug '{slug}' already exists"
+                    )
+
         # Handle publish action
-        if "is_published" in update_dict and update_dict["is_published"]:
+        publishing = bool(update_dict.get("is_published"))
+        if publishing:
             if not content.published_at:
                 update_dict["published_at"] = datetime.now()
 
         for key, value in update_dict.items():
             setattr(content, key, value)
+        self._bump_version(content.section)
 
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise HTTPException(400, "Content with this slug already exists")
         self.db.refresh(content)
+        if publishing:
+            self.prerender(content)
 
         return content
 
@@ -149,29 +695,162 @@ class ContentService:
         if not content:
             return False
 
-        # Delete file from disk
-        file_storage.delete_file(content.file_path)
+        # Posts can share a folder and its images/ (same title, or legacy
+        # files side by side in the section), even a content.md: only
+        # what no other post there uses is removed
+        folder = PurePosixPath(content.file_path).parent
+        neighbours = [
+            (other_id, other_path)
+            for other_id, other_path in self.db.query(
+                ContentFile.id, ContentFile.file_path
+            ).filter(
+                ContentFile.file_path.startswith(
+                    f"{folder}/", autoescape=True
+                ),
+                ContentFile.id != content.id,
+            )
+            if PurePosixPath(other_path).parent == folder
+        ]
+        media = MediaStore(self.db)
+        own_images = media.image_names([content.id]) - media.image_names(
+            other_id for other_id, _ in neighbours
+        )
+        markdown_shared = any(
+            other_path == content.file_path for _, other_path in neighbours
+        )
 
-        # Delete database record
+        # Release its images (blobs are garbage collected by refcount) and
+        # delete the database record, with its render unless shared
+        media.release_content(content.id)
+        if content.render_hash:
+            self._drop_render(content.render_hash, content.id)
         self.db.delete(content)
+        self._bump_version(content.section)
         self.db.commit()
 
+        # Then its own files
+        file_storage.delete_file(
+            content.file_path, own_images, keep_markdown=markdown_shared
+        )
+
         return True
 
-    def get_markdown_content(self, section: str, slug: str) -> Optional[str]:
-        """Get raw markdown content"""
-        content = self.get_by_slug(section, slug)
-        if not content:
-            return None
+    def markdown_etag(self, content: ContentFile) -> str:
+        """Validator for the markdown body + metajson, from a stat only"""
+        mtime_ns, size = file_storage.file_version(content.file_path)
+        updated = int(content.updated_at.timestamp() * 1_000_000)
+        return f'"{mtime_ns:x}-{size:x}-{updated:x}"'
 
+    def get_markdown_content(self, content: ContentFile) -> str:
+        """Get raw markdown content (cached, see FileStorageService)"""
         return file_storage.read_file(content.file_path)
 
+    # ── Rendered HTML ──
+
+    def _image_base(self, content: ContentFile) -> str:
+        # file_path: "markdown/blog/Blog_Name/content.md"
+        folder = PurePosixPath(content.file_path).parent
+        return f"{settings.MEDIA_URL.rstrip('/')}/{folder}/"
+
+    def render_key(self, content: ContentFile) -> str:
+        """
+        Hash of everything the rendered HTML depends on, including the
+        post's media_version (its images and their variants, which fill
+        in after upload). Identical inputs share a ContentRender row; any
+        change yields a new key, so cached renders never need invalidating
+        in place.
+        """
+        digest = hashlib.sha256()
+        for part in (
+            str(RENDER_VERSION),
+            self._image_base(content),
+            self.get_markdown_content(content),
+            str(content.media_version),
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def rendered_body(self, content: ContentFile, key: str) -> bytes:
+        """
+        Serialized {"html", "toc"} for the render `key` of `content`.
+
+        Served from this worker's memory, then from content_renders; the
+        markdown is only rendered when neither has it.
+        """
+        with _render_bodies_lock:
+            body = _render_bodies.get(key)
+            if body is not None:
+                _render_bodies.move_to_end(key)
+                return body
+
+        row = self.db.get(ContentRender, key)
+        # Only a miss writes: a stored render with render_hash already
+        # at `key` leaves nothing to commit
+        changed = row is None
+        if row is not None:
+            body = _render_body(row.html, row.toc)
+        else:
+            rendered = render_markdown(
+                self.get_markdown_content(content),
+                self._image_base(content),
+                MediaStore(self.db).images_for(content.id),
+            )
+            self.db.execute(
+                pg_insert(ContentRender)
+                .values(hash=key, html=rendered.html, toc=rendered.toc)
+                .on_conflict_do_nothing(index_elements=["hash"])
+            )
+            body = _render_body(rendered.html, rendered.toc)
+
+        if content.render_hash != key:
+            changed = True
+            previous = content.render_hash
+            content.render_hash = key
+            if previous:
+                self._drop_render(previous, content.id)
+        if changed:
+            self.db.commit()
+
+        with _render_bodies_lock:
+            _render_bodies[key] = body
+            while len(_render_bodies) > settings.CONTENT_RENDER_CACHE_SIZE:
+                _render_bodies.popitem(last=False)
+        return body
+
+    def prerender(self, content: ContentFile) -> None:
+        """Render ahead of the first read. Failures are left to the read."""
+        try:
+            self.rendered_body(content, self.render_key(content))
+        except Exception as e:
+            self.db.rollback()
+            logger.warning("Failed to prerender %s: %s", content, e)
+
+    def _drop_render(self, key: str, content_id: UUID) -> None:
+        """Delete render `key` unless content other than content_id uses it"""
+        shared = (
+            self.db.query(ContentFile.id)
+            .filter(
+                ContentFile.render_hash == key, ContentFile.id != content_id
+            )
+            .first()
+        )
+        if shared is None:
+            self.db.query(ContentRender).filter(
+                ContentRender.hash == key
+            ).delete(synchronize_session=False)
+            _evict_render_body(key)
+
     async def upload_images(
         self, content_id: UUID, images: List[UploadFile]
     ) -> List[dict]:
         """
         Upload images for a content file
 
+        Images are stored by content hash (see MediaStore) and mapped to
+        their file name in this post, so markdown keeps referencing
+        images/<name>; uploading a name again replaces that mapping.
+
         Args:
             content_id: Content file ID
             images: List of image files to upload
@@ -179,21 +858,11 @@ class ContentService:
         Returns:
             List of uploaded image info with paths
         """
-        content = self.get_by_id(content_id)
+        content = await run_content_write(self.get_by_id, content_id)
         if not content:
             raise HTTPException(404, "Content not found")
 
-        # Get folder name from file path
-        # file_path format: "markdown/blog/Blog_Name/content.md"
-        from pathlib import Path
-        path_parts = Path(content.file_path).parts
-        if len(path_parts) >= 3:
-            folder_name = path_parts[-2]
-        else:
-            # Legacy format, use title to create folder
-            title = content.metajson.get("title", content.filename)
-            folder_name = file_storage.get_blog_folder_name(title)
-
+        incoming = Path(settings.MEDIA_ROOT) / BLOBS_DIR / ".incoming"
         uploaded_images = []
         for image in images:
             # Validate image file
@@ -201,20 +870,54 @@ class ContentService:
                 raise HTTPException(
                     400, f"File {image.filename} is not an image"
                 )
+            name = file_storage.safe_filename(image.filename)
+
+            # Stream to a temp file (hashed on the way), then store by hash
+            spooled = await file_storage.spool_upload(image, incoming)
+            try:
+                attached = await run_content_write(
+                    self._attach_image,
+                    content,
+                    name,
+                    spooled,
+                    image.content_type,
+                )
+            except BaseException:
+                spooled.tmp.unlink(missing_ok=True)
+                raise
 
-            # Save image
-            image_path = await file_storage.save_image(
-                content.section, folder_name, image
-            )
+            # Resized AVIF/WebP copies are made in the background
+            if attached.needs_variants:
+                schedule_variants(spooled.sha256, attached.blob_path)
 
             uploaded_images.append({
-                "filename": image.filename,
-                "path": image_path,
-                "relative_path": f"images/{image.filename}",
+                "filename": name,
+                "path": attached.blob_path,
+                "relative_path": f"images/{name}",
+                "url": media_url(attached.blob_path),
+                "size": spooled.size,
+                "sha256": spooled.sha256,
+                "replaced": attached.replaced,
             })
 
         return uploaded_images
 
+    def _attach_image(
+        self,
+        content: ContentFile,
+        name: str,
+        spooled: SpooledUpload,
+        content_type: str,
+    ) -> AttachedImage:
+        """Blocking half of upload_images, for one image"""
+        attached = MediaStore(self.db).attach(
+            content.id, name, spooled, content_type
+        )
+        content.media_version = ContentFile.media_version + 1
+        self.db.commit()
+        file_storage.link_image(content.file_path, name, attached.blob_path)
+        return attached
+
 
 def get_content_service(db: Session = Depends(get_db)) -> ContentService:
     """Dependency to get content service"""
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "dsa_events"
+
+# Seconds between SSE keepalive comments (proxies drop idle streams)
+HEARTBEAT_SECONDS = 15
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+# pg_notify rejects payloads of 8000 bytes or more
+PAYLOAD_MAX_BYTES = 7900
+
+# Sends publish_now events off the caller's thread (the event loop, for
+# sync progress); one thread keeps them in order
+_sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dsa-notify")
+
+
+def _payload(event: str, data: Dict[str, Any]) -> Dict[str, str]:
+    # NOTIFY payloads are capped (see PAYLOAD_MAX_BYTES); callers keep
+    # data compact, trimming open-ended lists with fit_payload
+    body = json.dumps({"event": event, "data": data}, separators=(",", ":"))
+    return {"channel": CHANNEL, "payload": body}
+
+
+def fit_payload(event: str, data: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """`data` with its list `data[key]` cut short to fit one NOTIFY."""
+    items = list(data[key])
+    while items:
+        body = _payload(event, {**data, key: items})["payload"]
+        if len(body.encode()) <= PAYLOAD_MAX_BYTES:
+            break
+        items.pop()
+    return {**data, key: items}
+
+
+def publish(db: Session, event: str, data: Dict[str, Any]) -> None:
+    """Queue an event on the session's transaction; delivered on commit."""
+    db.execute(_NOTIFY, _payload(event, data))
+
+
+def publish_now(event: str, data: Dict[str, Any]) -> None:
+    """
+    Send an event outside any transaction, without waiting for it.
+    Best effort.
+    """
+    _sender.submit(_send, event, _payload(event, data))
+
+
+def _send(event: str, params: Dict[str, str]) -> None:
+    try:
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+                _NOTIFY, params
+            )
+    except Exception as e:
+        logger.warning("Failed to publish %s event: %s", event, e)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventBroker:
+    """
+    Fans dsa_events notifications out to this worker's SSE clients and
+    tracks the current data version from `sync` events.
+
+    Each worker holds one LISTEN connection, opened on first use and read
+    from the event loop via add_reader. Every subscriber gets a bounded
+    queue; a slow client loses its oldest events rather than holding up
+    the others.
+    """
+
+    QUEUE_SIZE = 100
+
+    def __init__(self) -> None:
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = asyncio.Lock()
+        self._subscribers: Set[asyncio.Queue] = set()
+        # Latest data version; None until loaded on this connection
+        self._version: Optional[int] = None
+
+    @staticmethod
+    def _dsn() -> str:
+        url = engine.url.set(drivername="postgresql")
+        return url.render_as_string(hide_password=False)
+
+    def _listen(self):
+        conn = psycopg2.connect(self._dsn())
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    async def _ensure_listening(self) -> None:
+        async with self._lock:
+            if self._conn is not None and not self._conn.closed:
+                return
+            conn = await asyncio.to_thread(self._listen)
+            self._loop = asyncio.get_running_loop()
+            self._loop.add_reader(conn.fileno(), self._on_readable)
+            self._conn = conn
+            self._version = None
+            logger.info("Listening on %s", CHANNEL)
+
+    def _close(self) -> None:
+        if self._conn is None:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(self._conn.fileno())
+        self._conn.close()
+        self._conn = None
+        self._version = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except psycopg2.Error as e:
+            # Re-established on next use
+            logger.warning("%s listener lost: %s", CHANNEL, e)
+            self._close()
+            return
+
+        while self._conn.notifies:
+            message = json.loads(self._conn.notifies.pop(0).payload)
+            if message["event"] == "sync" and self._version is not None:
+                self._version = max(self._version, message["data"]["version"])
+            for queue in self._subscribers:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(message)
+
+    async def data_version(self, load: Callable[[], int]) -> int:
+        """
+        Current data version without touching the DB between syncs.
+
+        `load` reads it from the DB (in a thread) once LISTEN is up, so no
+        `sync` event can slip between the read and the subscription.
+        """
+        await self._ensure_listening()
+        if self._version is None:
+            async with self._lock:
+                if self._version is None:
+                    self._version = await asyncio.to_thread(load)
+        return self._version
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue]:
+        await self._ensure_listening()
+        queue: asyncio.Queue = asyncio.Queue(self.QUEUE_SIZE)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    async def stream(self, hello: Dict[str, Any]) -> AsyncIterator[str]:
+        """SSE body: a `hello` event, then every published event."""
+        yield "retry: 5000\n" + format_sse("hello", hello)
+        async with self.subscribe() as queue:
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    await self._ensure_listening()
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(message["event"], message["data"])
+
+
+# One broker per worker process
+broker = EventBroker()
@@ -1,20 +1,44 @@
+import asyncio
+import base64
+import html
+import json
 import logging
 import time
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from httpx import AsyncClient, HTTPStatusError
-from sqlalchemy import func, text
+from sqlalchemy import func, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.config import get_settings
+from app.core.exceptions import RateLimitError
+from app.database import SessionLocal
 from app.models.dsa import (
+    DsaBlob,
     DsaDailyActivity,
     DsaProblem,
+    DsaSyncRun,
     DsaSyncState,
     DsaTopicStats,
 )
-from app.services.github_service import github_service
+from app.services import dsa_events
+from app.services.github_service import (
+    RequestMeter,
+    get_github_service,
+    metered,
+    rate_budget,
+)
+from app.utils.source_header import (
+    EXT_MAP,
+    HEADER_MAX_BYTES,
+    default_metadata,
+    extract_metadata,
+    language_for,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -23,33 +47,194 @@ settings = get_settings()
 # Indian Standard Time (UTC+5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
 
-# Extension → language display name
-EXT_MAP = {
-    "py": "Python",
-    "js": "JavaScript",
-    "ts": "TypeScript",
-    "cpp": "C++",
-    "java": "Java",
-    "go": "Go",
-    "rs": "Rust",
-    "c": "C",
-    "rb": "Ruby",
-    "swift": "Swift",
-    "kt": "Kotlin",
-}
+# Commit history walked by a full sync
+HISTORY_DAYS = 180
+
+# Columns exposed by list_problems(); `fields` selects a subset of these.
+PROBLEM_FIELDS = (
+    "repo",
+    "path",
+    "filename",
+    "folder",
+    "language",
+    "difficulty",
+    "tags",
+    "time_complexity",
+    "space_complexity",
+    "leetcode_link",
+    "sha",
+    "first_seen_at",
+    "last_updated_at",
+    "last_commit_message",
+)
+
+# ts_headline markers; swapped for <mark> after HTML-escaping the snippet
+_HL_START = "{{{hl}}}"
+_HL_STOP = "{{{/hl}}}"
+
+SEARCH_SQL = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('simple', :q) AS tsq),
+    hits AS (
+        SELECT p.id
+        FROM dsa_problems p
+        JOIN dsa_blobs b ON b.sha = p.sha, q
+        WHERE b.search_vector @@ q.tsq
+        UNION
+        SELECT p.id
+        FROM dsa_problems p
+        WHERE p.path ILIKE :pattern OR p.filename % :q
+    ),
+    ranked AS (
+        SELECT
+            p.repo, p.path, p.filename, p.folder, p.language, p.difficulty,
+            p.last_updated_at, b.content,
+            COALESCE(ts_rank_cd(b.search_vector, q.tsq), 0)
+                + similarity(p.filename, :q) AS rank
+        FROM hits
+        JOIN dsa_problems p ON p.id = hits.id
+        LEFT JOIN dsa_blobs b ON b.sha = p.sha, q
+        ORDER BY rank DESC, p.last_updated_at DESC
+        LIMIT :limit
+    )
+    SELECT
+        r.repo, r.path, r.filename, r.folder, r.language, r.difficulty,
+        r.rank,
+        CASE WHEN r.content IS NULL THEN NULL ELSE ts_headline(
+            'simple', r.content, q.tsq,
+            'StartSel={_HL_START}, StopSel={_HL_STOP}, '
+            'MaxFragments=2, MaxWords=20, MinWords=5'
+        ) END AS snippet
+    FROM ranked r, q
+    ORDER BY r.rank DESC, r.last_updated_at DESC
+    """
+)
+
+
+class SyncRun:
+    """Timings, GitHub usage and errors collected during one sync."""
+
+    # Per-run cap on stored error details (error_count keeps the total)
+    MAX_ERRORS = 100
+    # Cap on new problem paths carried by the `sync` event
+    MAX_NEW_PATHS = 20
+
+    def __init__(self, repo: str, sync_type: str, trigger: str) -> None:
+        self.repo = repo
+        self.sync_type = sync_type
+        self.trigger = trigger
+        self.started_at = datetime.now(timezone.utc)
+        self.meter = RequestMeter()
+        self.phases: Dict[str, float] = {}
+        self.errors: List[Dict[str, Optional[str]]] = []
+        self.error_count = 0
+        self.added_count = 0
+        self.new_paths: List[str] = []
+        self.removed_count = 0
+        self._start = time.perf_counter()
+
+    @property
+    def duration_ms(self) -> int:
+        return int((time.perf_counter() - self._start) * 1000)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0) + elapsed
+
+    def error(self, path: Optional[str], exc: Exception) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({"path": path, "error": str(exc)[:500]})
+
+    def added(self, path: str) -> None:
+        self.added_count += 1
+        if len(self.new_paths) < self.MAX_NEW_PATHS:
+            self.new_paths.append(path)
+
+    def progress(self, stage: str, **counts: int) -> None:
+        """Publish a `progress` event to live dashboard clients."""
+        dsa_events.publish_now(
+            "progress",
+            {
+                "repo": self.repo,
+                "type": self.sync_type,
+                "stage": stage,
+                **counts,
+            },
+        )
+
+    def to_row(
+        self,
+        status: Optional[str] = None,
+        commits_processed: int = 0,
+        problems_changed: int = 0,
+    ) -> DsaSyncRun:
+        if status is None:
+            status = "partial" if self.error_count else "success"
+        return DsaSyncRun(
+            repo=self.repo,
+            sync_type=self.sync_type,
+            trigger=self.trigger,
+            status=status,
+            started_at=self.started_at,
+            duration_ms=self.duration_ms,
+            phases={k: int(v) for k, v in self.phases.items()},
+            github_calls=self.meter.calls,
+            bytes_downloaded=self.meter.bytes,
+            rate_limit_used=self.meter.rate_used,
+            rate_limit_remaining=rate_budget.remaining,
+            commits_processed=commits_processed,
+            problems_changed=problems_changed,
+            error_count=self.error_count,
+            errors=self.errors,
+        )
 
 
 class DsaSyncService:
-    """Bridges GitHub API (write source) → PostgreSQL (read source)."""
+    """
+    Bridges GitHub API (write source) → PostgreSQL (read source).
+
+    Syncs and path lookups are scoped to one repository (the default one
+    unless `repo` is given); stats, listings and search span all repos.
+    """
 
-    def __init__(self, db: Session):
+    # (repo, path) → blob sha, valid for one data version; per worker
+    _sha_memo: Dict[Tuple[str, str], Optional[str]] = {}
+    _sha_memo_version = -1
+    SHA_MEMO_SIZE = 10_000
+
+    # Shared rows are written in batches of this many
+    SHARED_WRITE_BATCH = 500
+
+    def __init__(self, db: Session, repo: Optional[str] = None):
         self.db = db
-        self.github = github_service
+        self.github = get_github_service(repo)
+        self.repo = self.github.repo
+        # Rows shared with other repos' syncs, held until the final commit
+        # (see _write_shared_rows): blob sha → source, and per-day
+        # activity date → [commits, added, modified]
+        self._pending_blobs: Dict[str, str] = {}
+        self._pending_activity: Dict[date, List[int]] = {}
 
     # ── Helpers ──
 
     def _get_sync_state(self) -> Optional[DsaSyncState]:
-        return self.db.query(DsaSyncState).filter(DsaSyncState.id == 1).first()
+        return (
+            self.db.query(DsaSyncState)
+            .filter(DsaSyncState.repo == self.repo)
+            .first()
+        )
+
+    def _problem_query(self, path: str):
+        return self.db.query(DsaProblem).filter(
+            DsaProblem.repo == self.repo, DsaProblem.path == path
+        )
 
     @staticmethod
     def _extract_folder(path: str) -> Optional[str]:
@@ -69,13 +254,18 @@ class DsaSyncService:
         path: str,
         sha: str,
         metadata: Dict[str, Any],
-        commit_date: datetime,
+        commit_date: Optional[datetime],
+        commit_message: Optional[str] = None,
     ) -> str:
-        """Insert or update a problem row. Returns 'added' or 'modified'."""
+        """
+        Insert or update a problem row. Returns 'added' or 'modified'.
+
+        Without a commit_date (the full sync's file pass) an existing
+        row keeps its timestamps, and a new one is stamped now until
+        commit history says otherwise.
+        """
         filename = path.split("/")[-1]
-        existing = (
-            self.db.query(DsaProblem).filter(DsaProblem.path == path).first()
-        )
+        existing = self._problem_query(path).first()
 
         if existing:
             existing.sha = sha
@@ -84,10 +274,20 @@ class DsaSyncService:
             existing.time_complexity = metadata.get("time_complexity")
             existing.space_complexity = metadata.get("space_complexity")
             existing.leetcode_link = metadata.get("leetcode_link")
-            existing.last_updated_at = commit_date
+            # Commits arrive newest first; never move the timestamp back
+            if (
+                commit_date is not None
+                and commit_date >= existing.last_updated_at
+            ):
+                existing.last_updated_at = commit_date
+                if commit_message is not None:
+                    existing.last_commit_message = commit_message
             return "modified"
 
+        if commit_date is None:
+            commit_date = datetime.now(timezone.utc)
         problem = DsaProblem(
+            repo=self.repo,
             path=path,
             filename=filename,
             folder=self._extract_folder(path),
@@ -100,36 +300,156 @@ class DsaSyncService:
             sha=sha,
             first_seen_at=commit_date,
             last_updated_at=commit_date,
+            last_commit_message=commit_message,
         )
         self.db.add(problem)
         return "added"
 
+    def _upsert_blob(self, sha: str, content: Optional[str]) -> None:
+        """Store decoded source once per blob SHA (for search)."""
+        if not sha or content is None:
+            return
+        # Postgres text cannot hold NUL bytes
+        self._pending_blobs[sha] = content.replace("\x00", "")
+
+    async def _sync_source(
+        self,
+        client: AsyncClient,
+        path: str,
+        sha: str,
+        ref: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Metadata for blob `sha` of `path`, storing the blob if it is new.
+
+        Stored blobs are parsed locally. Otherwise the raw file is
+        streamed; files over DSA_BLOB_MAX_BYTES are read header-only and
+        left to the GitHub fallback when served.
+        """
+        pending = self._pending_blobs.get(sha)
+        if pending is not None:
+            header = pending[:HEADER_MAX_BYTES]
+        else:
+            header = (
+                self.db.query(func.left(DsaBlob.content, HEADER_MAX_BYTES))
+                .filter(DsaBlob.sha == sha)
+                .scalar()
+            )
+        if header is not None:
+            return extract_metadata(header, language_for(path))
+
+        source = await self.github.fetch_source(
+            client, path, settings.DSA_BLOB_MAX_BYTES, ref=ref
+        )
+        self._upsert_blob(sha, source.content)
+        return source.metadata
+
+    def _prune_blobs(self) -> None:
+        """Drop blobs and renders no longer referenced by any problem."""
+        deleted = self.db.execute(
+            text(
+                """
+                DELETE FROM dsa_blobs b
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM dsa_problems p WHERE p.sha = b.sha
+                )
+                """
+            )
+        ).rowcount
+        if deleted:
+            logger.info("Pruned %d unreferenced blobs", deleted)
+
+        self.db.execute(
+            text(
+                """
+                DELETE FROM dsa_highlights h
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM dsa_problems p WHERE p.sha = h.sha
+                )
+                """
+            )
+        )
+
     def _upsert_activity(
         self, activity_date: date, added: int = 0, modified: int = 0
     ) -> None:
-        self.db.flush()
-        row = (
-            self.db.query(DsaDailyActivity)
-            .filter(DsaDailyActivity.date == activity_date)
-            .first()
-        )
-        if row:
-            row.commit_count += 1
-            row.problems_added += added
-            row.problems_modified += modified
-        else:
-            self.db.add(
-                DsaDailyActivity(
-                    date=activity_date,
-                    commit_count=1,
-                    problems_added=added,
-                    problems_modified=modified,
+        counts = self._pending_activity.setdefault(activity_date, [0, 0, 0])
+        counts[0] += 1
+        counts[1] += added
+        counts[2] += modified
+
+    def _write_shared_rows(self) -> None:
+        """
+        Write the rows other repos' syncs also touch: blobs (by SHA) and
+        daily activity (by date), gathered in memory during the run.
+
+        Repos sync concurrently on one event loop, each with its own
+        blocking session. Writing these rows mid-run would hold their
+        locks across GitHub awaits, and a second repo upserting the same
+        row would then block the loop inside the driver, so the first
+        could never commit. Call this right before the final commit, with
+        no await in between. Keys are sorted so concurrent workers take
+        the locks in the same order.
+        """
+        blobs = sorted(self._pending_blobs.items())
+        for i in range(0, len(blobs), self.SHARED_WRITE_BATCH):
+            self.db.execute(
+                pg_insert(DsaBlob)
+                .values(
+                    [
+                        {
+                            "sha": sha,
+                            "content": content,
+                            "size": len(content.encode()),
+                        }
+                        for sha, content in blobs[
+                            i:i + self.SHARED_WRITE_BATCH
+                        ]
+                    ]
                 )
+                .on_conflict_do_nothing(index_elements=["sha"])
             )
-            self.db.flush()
+
+        activity = sorted(self._pending_activity.items())
+        for i in range(0, len(activity), self.SHARED_WRITE_BATCH):
+            stmt = pg_insert(DsaDailyActivity).values(
+                [
+                    {
+                        "date": day,
+                        "commit_count": commits,
+                        "problems_added": added,
+                        "problems_modified": modified,
+                    }
+                    for day, (commits, added, modified) in activity[
+                        i:i + self.SHARED_WRITE_BATCH
+                    ]
+                ]
+            )
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["date"],
+                    set_={
+                        "commit_count": DsaDailyActivity.commit_count
+                        + stmt.excluded.commit_count,
+                        "problems_added": DsaDailyActivity.problems_added
+                        + stmt.excluded.problems_added,
+                        "problems_modified": (
+                            DsaDailyActivity.problems_modified
+                            + stmt.excluded.problems_modified
+                        ),
+                    },
+                )
+            )
+
+        self._pending_blobs.clear()
+        self._pending_activity.clear()
 
     def _rebuild_topic_stats(self) -> None:
         """Recompute folder-level aggregations from dsa_problems."""
+        # Serialize rebuilds from parallel repo syncs until commit
+        self.db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext('dsa_topic_stats'))")
+        )
         self.db.query(DsaTopicStats).delete()
         self.db.flush()
 
@@ -163,78 +483,314 @@ class DsaSyncService:
             )
         self.db.flush()
 
-    # ── Full Sync ──
+    # ── Sync runs ──
 
-    async def full_sync(self, prefix: str = "solutions/") -> Dict[str, Any]:
+    async def full_sync(
+        self, prefix: str = "solutions/", trigger: str = "manual"
+    ) -> Dict[str, Any]:
         """Full sync: all files + last 6 months of commits."""
-        start = time.time()
+        return await self._run_sync("full", trigger, prefix)
+
+    async def incremental_sync(
+        self, prefix: str = "solutions/", trigger: str = "manual"
+    ) -> Dict[str, Any]:
+        """Fetch only commits since last sync (full sync if never synced)."""
+        return await self._run_sync("incremental", trigger, prefix)
+
+    async def _run_sync(
+        self, sync_type: str, trigger: str, prefix: str
+    ) -> Dict[str, Any]:
+        """Run a sync and record it in dsa_sync_runs, even if it fails."""
+        state = self._get_sync_state()
+        if state is None:
+            sync_type = "full"
+
+        run = SyncRun(self.repo, sync_type, trigger)
+        run.progress("started")
+        with metered(run.meter):
+            try:
+                if sync_type == "full":
+                    result = await self._full_sync(prefix, run)
+                else:
+                    result = await self._incremental_sync(prefix, state, run)
+            except Exception as e:
+                self.db.rollback()
+                self._pending_blobs.clear()
+                self._pending_activity.clear()
+                run.error(None, e)
+                self.db.add(run.to_row("failed"))
+                self.db.commit()
+                run.progress("failed")
+                raise
+
+        counts = dict(
+            commits_processed=result["commits_processed"],
+            problems_changed=result.get(
+                "problems_synced",
+                result.get("problems_added", 0)
+                + result.get("problems_modified", 0),
+            ),
+        )
+        try:
+            row = run.to_row(**counts)
+            self.db.add(row)
+            self.db.flush()
+
+            # Delivered to every worker's SSE clients when the row commits
+            version = self.data_version()
+            total = self.db.query(func.count(DsaProblem.id)).scalar()
+            dsa_events.publish(
+                self.db,
+                "sync",
+                dsa_events.fit_payload(
+                    "sync",
+                    {
+                        "repo": self.repo,
+                        "type": sync_type,
+                        "run_id": row.id,
+                        "status": row.status,
+                        "version": version,
+                        "changed": version == row.id,
+                        "problems_added": run.added_count,
+                        "problems_removed": run.removed_count,
+                        "problems_changed": row.problems_changed,
+                        "commits_processed": row.commits_processed,
+                        "total_problems": total,
+                        "new_problems": run.new_paths,
+                    },
+                    "new_problems",
+                ),
+            )
+            self.db.commit()
+        except Exception as e:
+            # The synced data is already committed: record the run anyway
+            self.db.rollback()
+            logger.warning("Failed to publish sync of %s: %s", self.repo, e)
+            run.error(None, e)
+            row = run.to_row(**counts)
+            self.db.add(row)
+            self.db.commit()
+
+        result.update(
+            run_id=row.id,
+            status=row.status,
+            errors=row.error_count,
+            duration_ms=row.duration_ms,
+        )
+        return result
+
+    def data_version(self) -> int:
+        """Id of the newest sync run that changed data (0 before any)."""
+        version = (
+            self.db.query(func.max(DsaSyncRun.id))
+            .filter(
+                DsaSyncRun.status != "failed",
+                or_(
+                    DsaSyncRun.problems_changed > 0,
+                    DsaSyncRun.commits_processed > 0,
+                ),
+            )
+            .scalar()
+        )
+        return version or 0
+
+    def list_runs(
+        self,
+        repo: Optional[str] = None,
+        before: Optional[int] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Sync run history, newest first; page with `before=next_before`."""
+        query = self.db.query(DsaSyncRun)
+        if repo:
+            query = query.filter(DsaSyncRun.repo == repo)
+        if before:
+            query = query.filter(DsaSyncRun.id < before)
+        rows = query.order_by(DsaSyncRun.id.desc()).limit(limit + 1).all()
+        page = rows[:limit]
+
+        runs = []
+        for r in page:
+            runs.append(
+                {
+                    "id": r.id,
+                    "repo": r.repo,
+                    "type": r.sync_type,
+                    "trigger": r.trigger,
+                    "status": r.status,
+                    "started_at": r.started_at.isoformat(),
+                    "duration_ms": r.duration_ms,
+                    "phases": r.phases,
+                    "github_calls": r.github_calls,
+                    "bytes_downloaded": r.bytes_downloaded,
+                    "rate_limit_used": r.rate_limit_used,
+                    "rate_limit_remaining": r.rate_limit_remaining,
+                    "commits_processed": r.commits_processed,
+                    "problems_changed": r.problems_changed,
+                    "error_count": r.error_count,
+                    "errors": r.errors,
+                }
+            )
+
+        next_before = page[-1].id if len(rows) > limit else None
+        return {"runs": runs, "next_before": next_before}
+
+    # ── Full Sync ──
+
+    async def _full_sync(self, prefix: str, run: SyncRun) -> Dict[str, Any]:
         problems_synced = 0
-        commits_processed = 0
 
         # 1. Fetch tree and sync all files
-        tree = await self.github.get_tree(prefix=prefix)
+        with run.phase("tree"):
+            tree = await self.github.get_tree(
+                prefix=prefix, allow_stale=False
+            )
         files = [item for item in tree if item["type"] == "blob"]
 
         current_paths = set()
-        for f in files:
-            current_paths.add(f["path"])
-            try:
-                file_data = await self.github.get_file_content(f["path"])
-                metadata = file_data.get("metadata", {})
-                now = datetime.now(timezone.utc)
-                self._upsert_problem(f["path"], f["sha"], metadata, now)
-                problems_synced += 1
-            except Exception as e:
-                logger.warning("Failed to sync file %s: %s", f["path"], e)
+        inserted = set()
+        with run.phase("files"):
+            async with self.github.client() as client:
+                for f in files:
+                    current_paths.add(f["path"])
+                    try:
+                        metadata = await self._sync_source(
+                            client, f["path"], f["sha"]
+                        )
+                        # Timestamps come from commit history below
+                        result = self._upsert_problem(
+                            f["path"], f["sha"], metadata, None
+                        )
+                        if result == "added":
+                            run.added(f["path"])
+                            inserted.add(f["path"])
+                        problems_synced += 1
+                    except Exception as e:
+                        logger.warning(
+                            "Failed to sync file %s: %s", f["path"], e
+                        )
+                        run.error(f["path"], e)
 
         # Prune problems that no longer exist in the repo
-        deleted = (
-            self.db.query(DsaProblem)
-            .filter(
-                DsaProblem.path.notin_(current_paths)
-                if current_paths
-                else True
+        with run.phase("db_write"):
+            deleted = (
+                self.db.query(DsaProblem)
+                .filter(
+                    DsaProblem.repo == self.repo,
+                    DsaProblem.path.notin_(current_paths)
+                    if current_paths
+                    else True,
+                )
+                .delete(synchronize_session="fetch")
             )
-            .delete(synchronize_session="fetch")
-        )
-        if deleted:
-            logger.info("Pruned %d deleted problems from DB", deleted)
+            if deleted:
+                logger.info("Pruned %d deleted problems from DB", deleted)
+            run.removed_count += deleted
 
-        self.db.flush()
+            self.db.flush()
+        run.progress("files", problems=problems_synced)
 
         # 2. Fetch commits (last 6 months) and build daily activity
-        six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
+        since = datetime.now(timezone.utc) - timedelta(days=HISTORY_DAYS)
+        with run.phase("commits"):
+            (
+                last_sha,
+                commits_processed,
+                stamped,
+            ) = await self._apply_commit_history(prefix, since, run)
+
+            # New files untouched within the window last changed before
+            # it: date them at its start, behind every real recent commit
+            unstamped = list(inserted - stamped)
+            if unstamped:
+                self.db.query(DsaProblem).filter(
+                    DsaProblem.repo == self.repo,
+                    DsaProblem.path.in_(unstamped),
+                ).update(
+                    {
+                        DsaProblem.first_seen_at: since,
+                        DsaProblem.last_updated_at: since,
+                    },
+                    synchronize_session=False,
+                )
+        run.progress("commits", commits=commits_processed)
+
+        # 3. Rebuild topic stats
+        with run.phase("topic_stats"):
+            self._rebuild_topic_stats()
+
+        # 4. Update sync state
+        with run.phase("db_write"):
+            self._write_shared_rows()
+            self._prune_blobs()
+            state = self._get_sync_state()
+            now = datetime.now(timezone.utc)
+            if state:
+                state.last_commit_sha = last_sha
+                state.last_synced_at = now
+                state.total_commits_processed += commits_processed
+            else:
+                self.db.add(
+                    DsaSyncState(
+                        repo=self.repo,
+                        last_commit_sha=last_sha,
+                        last_synced_at=now,
+                        total_commits_processed=commits_processed,
+                    )
+                )
+
+            self.db.commit()
+
+        logger.info(
+            "Full sync of %s complete: %d problems, %d commits in %dms",
+            self.repo,
+            problems_synced,
+            commits_processed,
+            run.duration_ms,
+        )
+
+        return {
+            "type": "full",
+            "repo": self.repo,
+            "problems_synced": problems_synced,
+            "commits_processed": commits_processed,
+        }
+
+    async def _apply_commit_history(
+        self, prefix: str, since: datetime, run: SyncRun
+    ) -> Tuple[Optional[str], int, Set[str]]:
+        """
+        Walk the commits since `since`: daily activity and per-file first
+        seen / last updated timestamps. Returns (newest sha, count, paths
+        stamped from a commit).
+        """
         last_sha = None
+        commits_processed = 0
+        # Paths whose newest commit has been applied in this run
+        stamped = set()
 
         try:
-            async with AsyncClient() as client:
+            async with self.github.client() as client:
                 page = 1
                 while True:
-                    resp = await client.get(
-                        f"{self.github.base_url}"
-                        f"/repos/{self.github.repo_owner}"
-                        f"/{self.github.repo_name}/commits",
-                        params={
+                    commits = await self.github.list_commits(
+                        client,
+                        {
                             "path": prefix,
-                            "since": six_months_ago.isoformat(),
+                            "since": since.isoformat(),
                             "per_page": 100,
                             "page": page,
                         },
-                        headers=self.github.headers,
-                        timeout=15.0,
                     )
-                    resp.raise_for_status()
-                    commits = resp.json()
                     if not commits:
                         break
 
                     if page == 1 and commits:
-                        last_sha = commits[0]["sha"]
+                        last_sha = commits[0].sha
 
                     for commit in commits:
-                        commit_date_str = commit["commit"]["committer"]["date"]
                         commit_dt = datetime.fromisoformat(
-                            commit_date_str.replace("Z", "+00:00")
+                            commit.date.replace("Z", "+00:00")
                         )
                         activity_date = commit_dt.astimezone(IST).date()
 
@@ -242,46 +798,43 @@ class DsaSyncService:
                         added = 0
                         modified = 0
                         try:
-                            detail_resp = await client.get(
-                                f"{self.github.base_url}"
-                                f"/repos/{self.github.repo_owner}"
-                                f"/{self.github.repo_name}"
-                                f"/commits/{commit['sha']}",
-                                headers=self.github.headers,
-                                timeout=10.0,
+                            files = await self.github.get_commit_files(
+                                client, commit.sha
                             )
-                            detail_resp.raise_for_status()
-                            detail = detail_resp.json()
 
-                            for cf in detail.get("files", []):
-                                if cf["filename"].startswith(prefix):
-                                    if cf["status"] == "added":
+                            for cf in files:
+                                if cf.filename.startswith(prefix):
+                                    if cf.status == "added":
                                         added += 1
-                                    elif cf["status"] in (
+                                    elif cf.status in (
                                         "modified",
                                         "renamed",
                                     ):
                                         modified += 1
 
                                     # Update problem timestamps from commit
-                                    problem = (
-                                        self.db.query(DsaProblem)
-                                        .filter(
-                                            DsaProblem.path == cf["filename"]
-                                        )
-                                        .first()
-                                    )
+                                    problem = self._problem_query(
+                                        cf.filename
+                                    ).first()
                                     if problem:
                                         if problem.first_seen_at > commit_dt:
                                             problem.first_seen_at = commit_dt
-                                        if problem.last_updated_at < commit_dt:
+                                        # Commits are newest first: the
+                                        # first one seen is the latest
+                                        # change to this file
+                                        if problem.path not in stamped:
+                                            stamped.add(problem.path)
                                             problem.last_updated_at = commit_dt
+                                            problem.last_commit_message = (
+                                                commit.message
+                                            )
                         except Exception as e:
                             logger.warning(
                                 "Failed to get commit detail %s: %s",
-                                commit["sha"][:7],
+                                commit.sha[:7],
                                 e,
                             )
+                            run.error(f"commit {commit.sha[:7]}", e)
 
                         self._upsert_activity(activity_date, added, modified)
                         commits_processed += 1
@@ -292,213 +845,172 @@ class DsaSyncService:
 
         except Exception as e:
             logger.warning("Failed to fetch commits: %s", e)
+            run.error(None, e)
 
-        # 3. Rebuild topic stats
-        self._rebuild_topic_stats()
-
-        # 4. Update sync state
-        state = self._get_sync_state()
-        now = datetime.now(timezone.utc)
-        if state:
-            state.last_commit_sha = last_sha
-            state.last_synced_at = now
-            state.total_commits_processed += commits_processed
-        else:
-            self.db.add(
-                DsaSyncState(
-                    id=1,
-                    last_commit_sha=last_sha,
-                    last_synced_at=now,
-                    total_commits_processed=commits_processed,
-                )
-            )
-
-        self.db.commit()
-
-        duration_ms = int((time.time() - start) * 1000)
-        logger.info(
-            "Full sync complete: %d problems, %d commits in %dms",
-            problems_synced,
-            commits_processed,
-            duration_ms,
-        )
-
-        return {
-            "type": "full",
-            "problems_synced": problems_synced,
-            "commits_processed": commits_processed,
-            "duration_ms": duration_ms,
-        }
+        return last_sha, commits_processed, stamped
 
     # ── Incremental Sync ──
 
-    async def incremental_sync(
-        self, prefix: str = "solutions/"
+    async def _incremental_sync(
+        self, prefix: str, state: DsaSyncState, run: SyncRun
     ) -> Dict[str, Any]:
-        """Fetch only commits since last sync."""
-        start = time.time()
-        state = self._get_sync_state()
-
-        if state is None:
-            return await self.full_sync(prefix)
-
         commits_processed = 0
         problems_added = 0
         problems_modified = 0
+        new_last_sha = state.last_commit_sha
+
+        # Any error escaping this block aborts the run: _run_sync rolls
+        # it back, so the cursor stays put and the next run retries
+        # every commit this one did not finish
+        async with self.github.client() as client:
+            page = 1
+            synced_paths = set()
+
+            while True:
+                params: Dict[str, Any] = {
+                    "path": prefix,
+                    "per_page": 100,
+                    "page": page,
+                }
+                if state.last_synced_at:
+                    params["since"] = state.last_synced_at.isoformat()
 
-        try:
-            async with AsyncClient() as client:
-                page = 1
-                new_last_sha = state.last_commit_sha
-
-                while True:
-                    params: Dict[str, Any] = {
-                        "path": prefix,
-                        "per_page": 100,
-                        "page": page,
-                    }
-                    if state.last_synced_at:
-                        params["since"] = state.last_synced_at.isoformat()
-
-                    resp = await client.get(
-                        f"{self.github.base_url}"
-                        f"/repos/{self.github.repo_owner}"
-                        f"/{self.github.repo_name}/commits",
-                        params=params,
-                        headers=self.github.headers,
-                        timeout=15.0,
+                with run.phase("commits"):
+                    commits = await self.github.list_commits(
+                        client, params
                     )
-                    resp.raise_for_status()
-                    commits = resp.json()
-                    if not commits:
-                        break
+                if not commits:
+                    break
 
-                    if page == 1:
-                        new_last_sha = commits[0]["sha"]
+                if page == 1:
+                    new_last_sha = commits[0].sha
 
-                    for commit in commits:
-                        # Skip already-processed commit
-                        if commit["sha"] == state.last_commit_sha:
-                            break
+                for commit in commits:
+                    # Skip already-processed commit
+                    if commit.sha == state.last_commit_sha:
+                        break
 
-                        commit_date_str = commit["commit"]["committer"]["date"]
-                        commit_dt = datetime.fromisoformat(
-                            commit_date_str.replace("Z", "+00:00")
-                        ).astimezone(IST)
+                    commit_dt = datetime.fromisoformat(
+                        commit.date.replace("Z", "+00:00")
+                    ).astimezone(IST)
 
-                        added = 0
-                        modified = 0
+                    added = 0
+                    modified = 0
 
-                        try:
-                            detail_resp = await client.get(
-                                f"{self.github.base_url}"
-                                f"/repos/{self.github.repo_owner}"
-                                f"/{self.github.repo_name}"
-                                f"/commits/{commit['sha']}",
-                                headers=self.github.headers,
-                                timeout=10.0,
+                    try:
+                        with run.phase("commits"):
+                            files = await self.github.get_commit_files(
+                                client, commit.sha
                             )
-                            detail_resp.raise_for_status()
-                            detail = detail_resp.json()
-
-                            for cf in detail.get("files", []):
-                                if not cf["filename"].startswith(prefix):
-                                    continue
-
-                                if cf["status"] == "removed":
-                                    # Remove deleted files
-                                    self.db.query(DsaProblem).filter(
-                                        DsaProblem.path == cf["filename"]
-                                    ).delete()
-                                    continue
-
-                                # Check if SHA changed
-                                existing = (
-                                    self.db.query(DsaProblem)
-                                    .filter(DsaProblem.path == cf["filename"])
-                                    .first()
-                                )
-                                current_sha = cf.get("sha", "")
-
-                                if existing and existing.sha == current_sha:
-                                    continue
-
-                                # Fetch file content for metadata
-                                try:
-                                    file_data = (
-                                        await self.github.get_file_content(
-                                            cf["filename"]
-                                        )
-                                    )
-                                    metadata = file_data.get("metadata", {})
-                                    file_sha = file_data.get(
-                                        "sha", current_sha
-                                    )
-                                except Exception:
-                                    metadata = {
-                                        "difficulty": "Medium",
-                                        "tags": [],
-                                    }
-                                    file_sha = current_sha
-
-                                result = self._upsert_problem(
-                                    cf["filename"],
-                                    file_sha,
-                                    metadata,
-                                    commit_dt,
-                                )
-                                if result == "added":
-                                    added += 1
-                                    problems_added += 1
-                                else:
+
+                        for cf in files:
+                            if not cf.filename.startswith(prefix):
+                                continue
+
+                            # A newer commit already settled this
+                            # path in this run; only count activity
+                            if cf.filename in synced_paths:
+                                if cf.status != "removed":
                                     modified += 1
                                     problems_modified += 1
-
-                        except HTTPStatusError as e:
-                            logger.warning(
-                                "Commit detail fetch failed %s: %s",
-                                commit["sha"][:7],
-                                e,
+                                continue
+                            synced_paths.add(cf.filename)
+
+                            if cf.status == "removed":
+                                # Remove deleted files
+                                run.removed_count += self._problem_query(
+                                    cf.filename
+                                ).delete()
+                                continue
+
+                            # Check if SHA changed
+                            existing = self._problem_query(
+                                cf.filename
+                            ).first()
+                            current_sha = cf.sha or ""
+
+                            if existing and existing.sha == current_sha:
+                                continue
+
+                            # Read metadata at this commit
+                            try:
+                                with run.phase("files"):
+                                    metadata = await self._sync_source(
+                                        client,
+                                        cf.filename,
+                                        current_sha,
+                                        ref=commit.sha,
+                                    )
+                            except RateLimitError:
+                                raise
+                            except Exception as e:
+                                run.error(cf.filename, e)
+                                metadata = default_metadata()
+
+                            result = self._upsert_problem(
+                                cf.filename,
+                                current_sha,
+                                metadata,
+                                commit_dt,
+                                commit.message,
                             )
-
-                        self._upsert_activity(
-                            commit_dt.date(), added, modified
+                            if result == "added":
+                                run.added(cf.filename)
+                                added += 1
+                                problems_added += 1
+                            else:
+                                modified += 1
+                                problems_modified += 1
+
+                    except HTTPStatusError as e:
+                        logger.warning(
+                            "Commit detail fetch failed %s: %s",
+                            commit.sha[:7],
+                            e,
                         )
-                        commits_processed += 1
-                    else:
-                        if len(commits) < 100:
-                            break
-                        page += 1
-                        continue
-                    break
+                        run.error(f"commit {commit.sha[:7]}", e)
 
-        except Exception as e:
-            logger.warning("Incremental sync error: %s", e)
+                    self._upsert_activity(
+                        commit_dt.date(), added, modified
+                    )
+                    commits_processed += 1
+                else:
+                    run.progress("commits", commits=commits_processed)
+                    if len(commits) < 100:
+                        break
+                    page += 1
+                    continue
+                break
 
         # Rebuild topic stats
-        self._rebuild_topic_stats()
+        with run.phase("topic_stats"):
+            self._rebuild_topic_stats()
 
         # Update sync state
-        state.last_commit_sha = new_last_sha
-        state.last_synced_at = datetime.now(timezone.utc)
-        state.total_commits_processed += commits_processed
-        self.db.commit()
+        with run.phase("db_write"):
+            self._write_shared_rows()
+            self._prune_blobs()
+            state.last_commit_sha = new_last_sha
+            state.last_synced_at = datetime.now(timezone.utc)
+            state.total_commits_processed += commits_processed
+            self.db.commit()
 
-        duration_ms = int((time.time() - start) * 1000)
         logger.info(
-            "Incremental sync: +%d added, %d modified, %d commits in %dms",
+            "Incremental sync of %s: +%d added, %d modified, "
+            "%d commits in %dms",
+            self.repo,
             problems_added,
             problems_modified,
             commits_processed,
-            duration_ms,
+            run.duration_ms,
         )
 
         return {
             "type": "incremental",
+            "repo": self.repo,
             "problems_added": problems_added,
             "problems_modified": problems_modified,
             "commits_processed": commits_processed,
-            "duration_ms": duration_ms,
         }
 
     # ── Stats (pure SQL) ──
@@ -589,14 +1101,16 @@ class DsaSyncService:
             twelve_weeks_ago.day,
             tzinfo=IST,
         )
+        # Only the timestamp is needed, so idx_dsa_problems_first_seen
+        # can answer this with an index-only scan.
         new_problems = (
-            self.db.query(DsaProblem)
+            self.db.query(DsaProblem.first_seen_at)
             .filter(DsaProblem.first_seen_at >= since_dt)
             .all()
         )
         weekly_totals: Dict[date, int] = {}
-        for p in new_problems:
-            ist_date = p.first_seen_at.astimezone(IST).date()
+        for (first_seen_at,) in new_problems:
+            ist_date = first_seen_at.astimezone(IST).date()
             mon = ist_date - timedelta(days=ist_date.weekday())
             weekly_totals[mon] = weekly_totals.get(mon, 0) + 1
 
@@ -615,6 +1129,7 @@ class DsaSyncService:
         # Recent files — single query
         recent = [
             {
+                "repo": p.repo,
                 "filename": p.filename,
                 "path": p.path,
                 "difficulty": p.difficulty or "Medium",
@@ -622,7 +1137,7 @@ class DsaSyncService:
                 "committed_at": (
                     p.last_updated_at.isoformat() if p.last_updated_at else ""
                 ),
-                "message": "",
+                "message": p.last_commit_message or "",
                 "folder": p.folder or "",
             }
             for p in self.db.query(DsaProblem)
@@ -646,3 +1161,371 @@ class DsaSyncService:
             "weekly_performance": weekly_performance,
             "recent": recent,
         }
+
+    # ── Local file store (dsa_blobs) ──
+
+    def get_file(
+        self, path: str, repo: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Serve a synced file from Postgres in the same shape as
+        GitHubService.get_file_content. Returns None for unsynced paths.
+        """
+        github = get_github_service(repo) if repo else self.github
+        row = (
+            self.db.query(DsaProblem, DsaBlob.content, DsaBlob.size)
+            .join(DsaBlob, DsaBlob.sha == DsaProblem.sha)
+            .filter(DsaProblem.repo == github.repo, DsaProblem.path == path)
+            .first()
+        )
+        if row is None:
+            return None
+
+        problem, content, size = row
+        return github.format_file(
+            problem.path,
+            content,
+            size,
+            problem.sha,
+            github.html_url(problem.path),
+            {
+                "difficulty": problem.difficulty or "Medium",
+                "tags": problem.tags or [],
+                "time_complexity": problem.time_complexity,
+                "space_complexity": problem.space_complexity,
+                "leetcode_link": problem.leetcode_link,
+            },
+        )
+
+    def file_sha(
+        self, path: str, version: int, repo: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Blob SHA of a synced file (None if unsynced). Memoised per worker
+        until the data version moves, so revalidations skip the DB.
+        """
+        cls = DsaSyncService
+        if (
+            cls._sha_memo_version != version
+            or len(cls._sha_memo) >= self.SHA_MEMO_SIZE
+        ):
+            cls._sha_memo = {}
+            cls._sha_memo_version = version
+
+        github = get_github_service(repo) if repo else self.github
+        key = (github.repo, path)
+        if key not in cls._sha_memo:
+            cls._sha_memo[key] = (
+                self.db.query(DsaProblem.sha)
+                .filter(
+                    DsaProblem.repo == github.repo, DsaProblem.path == path
+                )
+                .scalar()
+            )
+        return cls._sha_memo[key]
+
+    async def get_file_or_fetch(
+        self, path: str, repo: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Local blob store first, GitHub contents API as fallback."""
+        local = await run_in_threadpool(self.get_file, path, repo)
+        if local is not None:
+            return local
+        github = get_github_service(repo) if repo else self.github
+        return await github.get_file_content(path)
+
+    async def get_latest_file(
+        self, prefix: str = "solutions/", repo: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Most recently updated problem under `prefix` across all repos (or
+        only `repo`), resolved from DB. The body comes from the blob store
+        (GitHub cache for unsynced blobs). Returns None if nothing is
+        synced under `prefix`.
+        """
+        problem = await run_in_threadpool(
+            self._latest_problem, prefix, repo
+        )
+        if problem is None:
+            return None
+
+        result = dict(
+            await self.get_file_or_fetch(problem.path, problem.repo)
+        )
+        result["repo"] = problem.repo
+        result["commit_date"] = problem.last_updated_at.isoformat()
+        result["commit_message"] = problem.last_commit_message or ""
+        return result
+
+    def _latest_problem(
+        self, prefix: str, repo: Optional[str]
+    ) -> Optional[DsaProblem]:
+        query = self.db.query(DsaProblem).filter(
+            DsaProblem.path.startswith(prefix, autoescape=True)
+        )
+        if repo:
+            query = query.filter(DsaProblem.repo == repo)
+        return query.order_by(
+            DsaProblem.last_updated_at.desc(), DsaProblem.id.desc()
+        ).first()
+
+    def get_tree(self, prefix: str = "solutions/") -> Optional[List[Dict]]:
+        """
+        Rebuild this repository's flat tree under `prefix` from synced
+        problems. Directory entries are derived from file paths (their
+        SHAs are not tracked). Returns None if nothing is synced there.
+        """
+        rows = (
+            self.db.query(DsaProblem.path, DsaProblem.sha, DsaBlob.size)
+            .outerjoin(DsaBlob, DsaBlob.sha == DsaProblem.sha)
+            .filter(
+                DsaProblem.repo == self.repo,
+                DsaProblem.path.startswith(prefix, autoescape=True),
+            )
+            .order_by(DsaProblem.path)
+            .all()
+        )
+        if not rows:
+            return None
+
+        root = prefix.rstrip("/")
+        dirs = set()
+        tree = []
+        for path, sha, size in rows:
+            parts = path.split("/")
+            for i in range(1, len(parts)):
+                parent = "/".join(parts[:i])
+                if parent in dirs:
+                    continue
+                if parent.startswith(prefix) or parent == root:
+                    dirs.add(parent)
+                    tree.append(
+                        {
+                            "path": parent,
+                            "type": "tree",
+                            "sha": "",
+                            "size": None,
+                        }
+                    )
+            tree.append(
+                {"path": path, "type": "blob", "sha": sha, "size": size}
+            )
+
+        tree.sort(key=lambda item: item["path"])
+        return tree
+
+    # ── Problem listing (keyset pagination) ──
+
+    @staticmethod
+    def _encode_cursor(sort_value: Any, problem_id: int) -> str:
+        if isinstance(sort_value, datetime):
+            sort_value = sort_value.isoformat()
+        raw = json.dumps([sort_value, problem_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, sort: str) -> tuple:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_value, problem_id = json.loads(
+                base64.urlsafe_b64decode(padded)
+            )
+            if sort == "recent":
+                sort_value = datetime.fromisoformat(sort_value)
+            return sort_value, int(problem_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def list_problems(
+        self,
+        repo: Optional[str] = None,
+        folder: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        language: Optional[str] = None,
+        tag: Optional[str] = None,
+        sort: str = "recent",
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        fields: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Filtered problem listing from DB with keyset pagination.
+
+        sort="recent" walks (last_updated_at, id) newest first, sort="name"
+        walks (filename, id) alphabetically. `next_cursor` is opaque and is
+        None on the last page. Only the requested `fields` are selected.
+        """
+        if fields:
+            unknown = sorted(set(fields) - set(PROBLEM_FIELDS))
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        selected = list(fields) if fields else list(PROBLEM_FIELDS)
+
+        if sort == "recent":
+            sort_col = DsaProblem.last_updated_at
+        elif sort == "name":
+            sort_col = DsaProblem.filename
+        else:
+            raise ValueError(f"Unknown sort: {sort}")
+
+        query = self.db.query(
+            DsaProblem.id.label("_id"),
+            sort_col.label("_sort"),
+            *(getattr(DsaProblem, f) for f in selected),
+        )
+
+        if repo:
+            query = query.filter(DsaProblem.repo == repo)
+        if folder:
+            query = query.filter(DsaProblem.folder == folder)
+        if difficulty:
+            # Served by idx_dsa_problems_difficulty_lower
+            query = query.filter(
+                func.lower(DsaProblem.difficulty) == difficulty.lower()
+            )
+        if language:
+            query = query.filter(DsaProblem.language == language)
+        if tag:
+            # tags @> '["tag"]' — served by the GIN index on tags
+            query = query.filter(DsaProblem.tags.contains([tag]))
+
+        keyset = tuple_(sort_col, DsaProblem.id)
+        if cursor:
+            after = tuple_(*self._decode_cursor(cursor, sort))
+            query = query.filter(
+                keyset < after if sort == "recent" else keyset > after
+            )
+
+        if sort == "recent":
+            query = query.order_by(sort_col.desc(), DsaProblem.id.desc())
+        else:
+            query = query.order_by(sort_col.asc(), DsaProblem.id.asc())
+
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+
+        items = []
+        for row in page:
+            item = {}
+            for f in selected:
+                value = getattr(row, f)
+                item[f] = (
+                    value.isoformat() if isinstance(value, datetime) else value
+                )
+            items.append(item)
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = self._encode_cursor(last._sort, last._id)
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    # ── Code search ──
+
+    def search_problems(self, q: str, limit: int = 20) -> Dict[str, Any]:
+        """
+        Ranked search over synced solution source and file paths.
+
+        Full-text matches come from dsa_blobs.search_vector, substring and
+        fuzzy file name matches from the pg_trgm indexes on dsa_problems.
+        Snippets are HTML-escaped with matches wrapped in <mark>.
+        """
+        q = q.strip()
+        if len(q) < 2:
+            raise ValueError("Search query must be at least 2 characters")
+
+        # Escape LIKE wildcards so the query is matched literally
+        escaped = (
+            q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        pattern = f"%{escaped}%"
+        rows = self.db.execute(
+            SEARCH_SQL, {"q": q, "pattern": pattern, "limit": limit}
+        ).fetchall()
+
+        results = []
+        for row in rows:
+            snippet = row.snippet
+            if snippet is not None:
+                snippet = (
+                    html.escape(snippet)
+                    .replace(_HL_START, "<mark>")
+                    .replace(_HL_STOP, "</mark>")
+                )
+            results.append(
+                {
+                    "repo": row.repo,
+                    "path": row.path,
+                    "filename": row.filename,
+                    "folder": row.folder or "",
+                    "language": row.language,
+                    "difficulty": row.difficulty or "Medium",
+                    "rank": round(float(row.rank), 4),
+                    "snippet": snippet,
+                }
+            )
+
+        return {"query": q, "results": results}
+
+
+# ── Multi-repository scheduling ──
+
+
+def _load_data_version() -> int:
+    with SessionLocal() as db:
+        return DsaSyncService(db).data_version()
+
+
+async def data_version() -> int:
+    """This worker's view of the data version, kept current by NOTIFY."""
+    return await dsa_events.broker.data_version(_load_data_version)
+
+
+def claim_unnamespaced_rows() -> None:
+    """
+    Give rows synced before repositories were namespaced (repo = '',
+    see migration 010) to the default repository. Run before the first
+    sync; a no-op once they are claimed.
+    """
+    if not settings.GITHUB_REPOS:
+        return
+    with SessionLocal() as db:
+        for model in (DsaProblem, DsaSyncState):
+            db.query(model).filter(model.repo == "").update(
+                {model.repo: settings.GITHUB_REPOS[0]},
+                synchronize_session=False,
+            )
+        db.commit()
+
+
+async def sync_repositories(
+    full: bool = False,
+    repos: Optional[List[str]] = None,
+    trigger: str = "manual",
+) -> Dict[str, Any]:
+    """
+    Sync every configured repository (or `repos`) concurrently.
+
+    Each repo gets its own session and sync state, so a slow or failing
+    repo never holds back the others; GitHub calls from all of them draw
+    on the shared rate budget in GitHubService.
+    """
+
+    async def _sync(repo: str) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            service = DsaSyncService(db, repo)
+            if full:
+                return await service.full_sync(trigger=trigger)
+            return await service.incremental_sync(trigger=trigger)
+        except Exception as e:
+            db.rollback()
+            logger.error("Sync of %s failed: %s", repo, e)
+            return {"repo": repo, "error": str(e)}
+        finally:
+            db.close()
+
+    targets = repos or settings.GITHUB_REPOS
+    results = await asyncio.gather(*(_sync(repo) for repo in targets))
+    return {"repos": list(results)}
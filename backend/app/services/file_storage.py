@@ -1,19 +1,78 @@
+from collections import OrderedDict
 from pathlib import Path
-from fastapi import UploadFile
+from threading import Lock
+from typing import IO, Iterable, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 from app.config import get_settings
+import hashlib
 import logging
+import os
 import re
+import tempfile
 
 logger = logging.getLogger()
 settings = get_settings()
 
 
+class CachedText(NamedTuple):
+    text: str
+    mtime_ns: int
+    size: int
+
+
+# Upload chunk size; bounds per-upload memory regardless of file size
+CHUNK_SIZE = 1024 * 1024
+
+# Stored files are served by nginx, so not mkstemp's private 0600
+FILE_MODE = 0o644
+
+
+# Content-addressed image store under MEDIA_ROOT, see MediaStore
+BLOBS_DIR = "blobs"
+
+
+class StoredUpload(NamedTuple):
+    path: str  # relative to MEDIA_ROOT
+    size: int
+    sha256: str
+
+
+class SpooledUpload(NamedTuple):
+    tmp: Path  # complete upload, not yet in place
+    size: int
+    sha256: str
+
+
+def _too_large(filename: str, limit: Optional[int] = None) -> HTTPException:
+    limit_mb = (limit or settings.MAX_UPLOAD_SIZE) / (1024 * 1024)
+    return HTTPException(
+        413, f"{filename} exceeds the {limit_mb:g}MB upload limit"
+    )
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory, then rename over"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
 class FileStorageService:
     """Handle file storage operations"""
 
     def __init__(self):
         self.base_dir = Path(settings.MEDIA_ROOT) / settings.MARKDOWN_DIR
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # file_path → CachedText, least recently used first
+        self._text_cache: "OrderedDict[str, CachedText]" = OrderedDict()
+        self._text_cache_lock = Lock()
 
     def get_section_dir(self, section: str) -> Path:
         """Get directory for section"""
@@ -68,15 +127,20 @@ class FileStorageService:
             Relative file path (e.g., "markdown/blog/file.md")
         """
         section_dir = self.get_section_dir(section)
-        file_path = section_dir / file.filename
+        file_path = section_dir / self.safe_filename(file.filename)
 
-        # Read and save content
-        content = await file.read()
-        file_path.write_bytes(content)
+        stored = await self.save_upload(file, file_path)
+        return stored.path
 
-        # Return relative path from MEDIA_ROOT
-        relative_path = file_path.relative_to(settings.MEDIA_ROOT)
-        return str(relative_path)
+    def content_path(
+        self, section: str, filename: str, folder_name: str = None
+    ) -> str:
+        """Path save_content stores a post at, relative to MEDIA_ROOT"""
+        if folder_name:
+            file_path = self.base_dir / section / folder_name / "content.md"
+        else:
+            file_path = self.base_dir / section / filename
+        return str(file_path.relative_to(settings.MEDIA_ROOT))
 
     def save_content(
         self,
@@ -106,68 +170,238 @@ class FileStorageService:
             section_dir = self.get_section_dir(section)
             file_path = section_dir / filename
 
-        # Write content (already without frontmatter)
-        file_path.write_text(content, encoding='utf-8')
+        # Write content (already without frontmatter); readers never see
+        # a half-written file
+        write_atomic(file_path, content.encode("utf-8"))
 
         # Return relative path from MEDIA_ROOT
         relative_path = file_path.relative_to(settings.MEDIA_ROOT)
         return str(relative_path)
 
-    async def save_image(
-        self,
-        section: str,
-        folder_name: str,
-        image: UploadFile
-    ) -> str:
-        """
-        Save image to blog-specific images folder
-
-        Args:
-            section: Content section (blog, project, case-study)
-            folder_name: Blog folder name
-            image: Uploaded image file
+    def blob_path(self, sha256: str, ext: str) -> str:
+        """Path of a stored image, relative to MEDIA_ROOT"""
+        return f"{BLOBS_DIR}/{sha256[:2]}/{sha256}{ext}"
 
-        Returns:
-            Relative path to image
-            (e.g., "markdown/blog/My_Blog/images/header.png")
+    def commit_blob(self, spooled: SpooledUpload, blob_path: str) -> None:
         """
-        content_dir = self.get_content_dir(section, folder_name)
-        images_dir = content_dir / "images"
+        Move a spooled upload to its blob path, or drop it when identical
+        bytes are already stored there.
+        """
+        destination = Path(settings.MEDIA_ROOT) / blob_path
+        if destination.exists():
+            spooled.tmp.unlink(missing_ok=True)
+            return
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(spooled.tmp, destination)
+
+    def link_image(
+        self, content_file_path: str, name: str, blob_path: str
+    ) -> None:
+        """
+        Point <post>/images/<name> at a blob (relative symlink, swapped
+        atomically), so markdown's images/<name> keeps resolving.
+        """
+        media_root = Path(settings.MEDIA_ROOT)
+        images_dir = (media_root / content_file_path).parent / "images"
+        images_dir.mkdir(parents=True, exist_ok=True)
+        target = os.path.relpath(media_root / blob_path, images_dir)
+        tmp = images_dir / f".link-{os.getpid()}-{name}"
+        tmp.unlink(missing_ok=True)
+        os.symlink(target, tmp)
+        os.replace(tmp, images_dir / name)
+
+    def delete_blob_files(self, paths: Iterable[str]) -> None:
+        """Unlink stored blobs/variants (paths relative to MEDIA_ROOT)"""
+        media_root = Path(settings.MEDIA_ROOT)
+        for path in paths:
+            (media_root / path).unlink(missing_ok=True)
+
+    @staticmethod
+    def safe_filename(filename: str) -> str:
+        """Client filename without any directory part"""
+        name = Path((filename or "").replace("\\", "/")).name
+        if name in ("", ".", ".."):
+            raise HTTPException(400, f"Invalid filename: {filename}")
+        return name
+
+    async def read_upload(self, upload: UploadFile) -> bytes:
+        """
+        Read a whole upload into memory, in chunks, rejecting it with 413
+        as soon as it passes MAX_UPLOAD_SIZE.
+        """
+        limit = settings.MAX_UPLOAD_SIZE
+        if upload.size is not None and upload.size > limit:
+            raise _too_large(upload.filename)
+
+        chunks = []
+        size = 0
+        while chunk := await upload.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise _too_large(upload.filename)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def spool_upload(
+        self, upload: UploadFile, directory: Path, limit: Optional[int] = None
+    ) -> SpooledUpload:
+        """
+        Stream an upload to a temp file in `directory` without holding it
+        in memory, hashing it on the way.
 
-        # Save image with original filename
-        image_path = images_dir / image.filename
+        Rejects it (413) as soon as it passes `limit` (MAX_UPLOAD_SIZE by
+        default). The caller moves the temp file into place (same
+        filesystem, so atomically) or unlinks it. Disk writes run in the
+        threadpool.
+        """
+        limit = limit or settings.MAX_UPLOAD_SIZE
+        if upload.size is not None and upload.size > limit:
+            raise _too_large(upload.filename, limit)
+
+        await run_in_threadpool(directory.mkdir, parents=True, exist_ok=True)
+        fd, tmp = await run_in_threadpool(
+            tempfile.mkstemp, dir=directory, prefix=".upload-"
+        )
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := await upload.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > limit:
+                        raise _too_large(upload.filename, limit)
+                    digest.update(chunk)
+                    await run_in_threadpool(out.write, chunk)
+            await run_in_threadpool(os.chmod, tmp, FILE_MODE)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return SpooledUpload(Path(tmp), size, digest.hexdigest())
+
+    def spool_file(
+        self, source: IO[bytes], directory: Path, name: str
+    ) -> SpooledUpload:
+        """
+        spool_upload for a local stream, such as an archive member;
+        blocking. Rejects it (413) past MAX_UPLOAD_SIZE.
+        """
+        limit = settings.MAX_UPLOAD_SIZE
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".upload-")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := source.read(CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > limit:
+                        raise _too_large(name)
+                    digest.update(chunk)
+                    out.write(chunk)
+            os.chmod(tmp, FILE_MODE)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return SpooledUpload(Path(tmp), size, digest.hexdigest())
+
+    async def save_upload(
+        self, upload: UploadFile, destination: Path
+    ) -> StoredUpload:
+        """
+        Stream an upload to `destination`; it is renamed into place once
+        complete, so a rejected or failed upload never replaces the file.
+        """
+        spooled = await self.spool_upload(upload, destination.parent)
+        try:
+            await run_in_threadpool(os.replace, spooled.tmp, destination)
+        except BaseException:
+            spooled.tmp.unlink(missing_ok=True)
+            raise
 
-        # Read and save content
-        content = await image.read()
-        image_path.write_bytes(content)
+        relative_path = destination.relative_to(settings.MEDIA_ROOT)
+        return StoredUpload(str(relative_path), spooled.size, spooled.sha256)
 
-        # Return relative path from MEDIA_ROOT
-        relative_path = image_path.relative_to(settings.MEDIA_ROOT)
-        return str(relative_path)
+    def file_version(self, file_path: str) -> Tuple[int, int]:
+        """(mtime_ns, size) of a stored file; one stat, no read"""
+        stat = (Path(settings.MEDIA_ROOT) / file_path).stat()
+        return stat.st_mtime_ns, stat.st_size
 
     def read_file(self, file_path: str) -> str:
-        """Read markdown content from disk"""
+        """
+        Read markdown content from disk, through an in-process LRU.
+
+        Entries are keyed by the relative file_path and revalidated with
+        a stat on every call, so edits on disk are picked up immediately;
+        only an unchanged file (same mtime and size) is served from memory.
+        """
         # file_path is relative (e.g., "markdown/blog/file.md")
         # Need to prepend MEDIA_ROOT to get absolute path
-        absolute_path = Path(settings.MEDIA_ROOT) / file_path
-        logger.info(f"Reading file from: {absolute_path}")
-        return absolute_path.read_text(encoding="utf-8")
+        mtime_ns, size = self.file_version(file_path)
+        with self._text_cache_lock:
+            cached = self._text_cache.get(file_path)
+            if (
+                cached is not None
+                and cached.mtime_ns == mtime_ns
+                and cached.size == size
+            ):
+                self._text_cache.move_to_end(file_path)
+                return cached.text
 
-    def delete_file(self, file_path: str) -> None:
-        """Delete markdown file or entire blog folder from disk"""
         absolute_path = Path(settings.MEDIA_ROOT) / file_path
+        logger.debug(f"Reading file from: {absolute_path}")
+        text = absolute_path.read_text(encoding="utf-8")
 
-        # If it's a content.md file in a blog folder, delete the whole folder
-        if absolute_path.name == "content.md" and absolute_path.parent.name:
-            blog_folder = absolute_path.parent
-            if blog_folder.exists():
-                import shutil
-                shutil.rmtree(blog_folder)
-                logger.info(f"Deleted blog folder: {blog_folder}")
-        else:
-            # Legacy: just delete the file
+        with self._text_cache_lock:
+            self._text_cache[file_path] = CachedText(text, mtime_ns, size)
+            self._text_cache.move_to_end(file_path)
+            while len(self._text_cache) > settings.MARKDOWN_CACHE_SIZE:
+                self._text_cache.popitem(last=False)
+        return text
+
+    def delete_file(
+        self,
+        file_path: str,
+        image_names: Iterable[str] = (),
+        keep_markdown: bool = False,
+    ) -> None:
+        """
+        Delete a post's markdown file and the named image links from disk.
+
+        Images themselves live in the shared blob store and are released
+        through MediaStore. The folder, its images/ and even content.md
+        can be shared with other posts (same title), so the caller names
+        the links only this post used and keeps markdown another post
+        points at; the folders go once empty.
+        """
+        absolute_path = Path(settings.MEDIA_ROOT) / file_path
+        with self._text_cache_lock:
+            self._text_cache.pop(file_path, None)
+        if not keep_markdown:
             absolute_path.unlink(missing_ok=True)
 
+        folder = absolute_path.parent
+        images_dir = folder / "images"
+        for name in image_names:
+            link = images_dir / name
+            if link.is_symlink():
+                link.unlink()
+
+        # Legacy structure: markdown/section/filename.md; the section
+        # folder stays
+        if absolute_path.name != "content.md":
+            return
+
+        for directory in (images_dir, folder):
+            try:
+                directory.rmdir()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Not empty: pre-blob images or another post's files
+                logger.info(f"Kept non-empty folder: {directory}")
+                return
+        logger.info(f"Deleted content folder: {folder}")
+
     def file_exists(self, file_path: str) -> bool:
         """Check if file exists"""
         absolute_path = Path(settings.MEDIA_ROOT) / file_path
@@ -1,18 +1,194 @@
+import asyncio
 import base64
 import logging
-import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-
-from httpx import AsyncClient, HTTPStatusError
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from httpx import (
+    AsyncBaseTransport,
+    AsyncByteStream,
+    AsyncClient,
+    AsyncHTTPTransport,
+    HTTPStatusError,
+    Request,
+    Response,
+)
 
 from app.config import get_settings
 from app.core.exceptions import GitHubAPIError, RateLimitError
+from app.utils.json_stream import stream_records
+from app.utils.source_header import (
+    extract_metadata,
+    header_complete,
+    language_for,
+)
+from app.utils.tree_index import TreeIndex, TreeRecord
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+# HTTP Warning for the current request when it was answered from an
+# expired cache entry (set by GitHubService, read by the routes)
+_stale_warning: ContextVar[Optional[str]] = ContextVar(
+    "github_stale_warning", default=None
+)
+STALE_WARNING = '110 - "Response is Stale"'
+# Background refreshes of a stale entry are retried at most this often
+REFRESH_RETRY = timedelta(seconds=30)
+REVALIDATION_FAILED_WARNING = '111 - "Revalidation Failed"'
+
+
+def stale_warning() -> Optional[str]:
+    """Warning header value if this request was served stale data."""
+    return _stale_warning.get()
+
+
+class RateBudget:
+    """
+    GitHub request budget shared by every repository.
+
+    All repos use one token, so they draw on one rate limit. Remaining
+    calls are tracked from response headers; requests fail fast with
+    RateLimitError once the reserve is reached, until the window resets.
+    A semaphore bounds concurrent requests across all syncs.
+    """
+
+    def __init__(self, concurrency: int, reserve: int) -> None:
+        self.reserve = reserve
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.requests = 0
+        self.slots = asyncio.Semaphore(concurrency)
+
+    def check(self) -> None:
+        if (
+            self.remaining is not None
+            and self.remaining <= self.reserve
+            and time.time() < self.reset_at
+        ):
+            raise RateLimitError(
+                f"GitHub rate budget exhausted ({self.remaining} left)"
+            )
+
+    def update(self, response: Response) -> None:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        reset = response.headers.get("x-ratelimit-reset")
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+
+class RequestMeter:
+    """GitHub usage attributed to one unit of work (e.g. a sync run)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+        # Calls GitHub counts against the rate limit (304s are free)
+        self.rate_used = 0
+
+
+_current_meter: ContextVar[Optional[RequestMeter]] = ContextVar(
+    "github_request_meter", default=None
+)
+
+
+@contextmanager
+def metered(meter: RequestMeter) -> Iterator[RequestMeter]:
+    """
+    Attribute GitHub requests made in this context to `meter`.
+
+    Context-local, so concurrent tasks (one per repo sync) each keep
+    their own counts.
+    """
+    token = _current_meter.set(meter)
+    try:
+        yield meter
+    finally:
+        _current_meter.reset(token)
+
+
+class _MeteredStream(AsyncByteStream):
+    def __init__(self, stream: AsyncByteStream, meter: RequestMeter):
+        self._stream = stream
+        self._meter = meter
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._meter.bytes += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+
+
+class _BudgetTransport(AsyncBaseTransport):
+    """Transport that draws every request from a shared RateBudget."""
+
+    def __init__(self, budget: RateBudget) -> None:
+        self._budget = budget
+        self._inner = AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        async with self._budget.slots:
+            self._budget.check()
+            self._budget.requests += 1
+            response = await self._inner.handle_async_request(request)
+        self._budget.update(response)
+
+        meter = _current_meter.get()
+        if meter is not None:
+            meter.calls += 1
+            if response.status_code != 304:
+                meter.rate_used += 1
+            response.stream = _MeteredStream(response.stream, meter)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+rate_budget = RateBudget(
+    settings.GITHUB_MAX_CONCURRENCY, settings.GITHUB_RATE_RESERVE
+)
+
+
+class CommitRecord(NamedTuple):
+    sha: str
+    date: str
+    message: str
+
+
+class CommitFile(NamedTuple):
+    filename: str
+    status: str
+    sha: Optional[str]
+
+
+class SourceFile(NamedTuple):
+    metadata: Dict[str, Any]
+    # None when the body was not read in full (over the byte budget)
+    content: Optional[str]
+
 
 class GitHubService:
     """
@@ -21,44 +197,128 @@ class GitHubService:
     Caching: Self-contained in-memory dict with TTL. This cache is isolated
     to this service — it does not interact with the existing content system,
     database, or any other part of the application.
+
+    Expired entries are served stale-while-revalidate: the caller gets the
+    old data at once while a single background task refreshes it. If
+    GitHub is down or rate limited, stale data keeps being served for up
+    to GITHUB_CACHE_MAX_STALE seconds past expiry.
     """
 
-    def __init__(self):
+    def __init__(self, repo: Optional[str] = None):
         self.base_url = settings.GITHUB_API_BASE
-        self.repo_owner = settings.GITHUB_REPO_OWNER
-        self.repo_name = settings.GITHUB_REPO_NAME
+        if repo:
+            self.repo_owner, self.repo_name = repo.split("/", 1)
+        else:
+            self.repo_owner = settings.GITHUB_REPO_OWNER
+            self.repo_name = settings.GITHUB_REPO_NAME
+        self.repo = f"{self.repo_owner}/{self.repo_name}"
         self.headers = {
             "Authorization": f"Bearer {settings.GITHUB_TOKEN}",
             "Accept": "application/vnd.github.v3+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self._cache_ttl = timedelta(hours=1)
+        self._cache_ttl = timedelta(seconds=settings.GITHUB_CACHE_TTL)
+        self._max_stale = timedelta(seconds=settings.GITHUB_CACHE_MAX_STALE)
+        # cache key → in-flight fetch; one per key, shared by all callers
+        self._refreshing: Dict[str, "asyncio.Task[Any]"] = {}
+        # Outlives the TTL cache: reused as long as the tree SHA is unchanged
+        self._tree_index: Optional[TreeIndex] = None
+        # tree SHA → direct children (paths relative to that tree). Git
+        # trees are content-addressed, so entries never go stale;
+        # unreachable SHAs are pruned after a walk.
+        self._subtree_cache: Dict[str, List[TreeRecord]] = {}
 
     # ── Cache helpers (private, isolated to this service) ──
 
-    def _is_cache_valid(self, key: str) -> bool:
-        if key not in self._cache:
-            return False
-        return datetime.now() < self._cache[key]["expires"]
-
     def _set_cache(self, key: str, data: Any) -> None:
         self._cache[key] = {
             "data": data,
             "expires": datetime.now() + self._cache_ttl,
+            "failed_at": None,
         }
 
-    def _get_cache(self, key: str) -> Optional[Any]:
-        if self._is_cache_valid(key):
-            return self._cache[key]["data"]
-        return None
+    def _refresh(
+        self, key: str, load: Callable[[], Awaitable[T]]
+    ) -> "asyncio.Task[T]":
+        """Start (or join) the single fetch for `key`."""
+        task = self._refreshing.get(key)
+        if task is not None:
+            return task
+
+        async def run() -> T:
+            try:
+                data = await load()
+            except GitHubAPIError as e:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    if "not found" in str(e).lower():
+                        del self._cache[key]
+                    else:
+                        entry["failed_at"] = datetime.now()
+                raise
+            except RateLimitError:
+                if key in self._cache:
+                    self._cache[key]["failed_at"] = datetime.now()
+                raise
+            if data is not None:
+                self._set_cache(key, data)
+            return data
+
+        def done(task: "asyncio.Task[T]") -> None:
+            self._refreshing.pop(key, None)
+            if task.cancelled():
+                return
+            # Always retrieved; only background refreshes (stale entry
+            # still cached) have no caller to report to
+            error = task.exception()
+            if error is not None and key in self._cache:
+                logger.warning("GitHub refresh of %s failed: %s", key, error)
+
+        task = asyncio.create_task(run())
+        task.add_done_callback(done)
+        self._refreshing[key] = task
+        return task
+
+    async def _cached(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[T]],
+        allow_stale: bool = True,
+    ) -> T:
+        """
+        `load()` through the cache. Fresh entries are returned as is;
+        expired ones (within max staleness) are returned at once while a
+        background refresh runs, and flag the request with a Warning.
+        """
+        entry = self._cache.get(key)
+        if entry is not None:
+            now = datetime.now()
+            if now < entry["expires"]:
+                return entry["data"]
+            if allow_stale and now < entry["expires"] + self._max_stale:
+                failed_at = entry["failed_at"]
+                if failed_at is None or now >= failed_at + REFRESH_RETRY:
+                    self._refresh(key, load)
+                _stale_warning.set(
+                    STALE_WARNING
+                    if failed_at is None
+                    else REVALIDATION_FAILED_WARNING
+                )
+                return entry["data"]
+        # Shielded: a cancelled request must not abort the shared fetch
+        return await asyncio.shield(self._refresh(key, load))
+
+    def client(self) -> AsyncClient:
+        """HTTP client drawing on the shared rate budget."""
+        return AsyncClient(transport=_BudgetTransport(rate_budget))
 
     # ── Public API ──
 
     async def check_connection(self) -> Dict[str, Any]:
         """Verify GitHub API connection and token validity."""
         try:
-            async with AsyncClient() as client:
+            async with self.client() as client:
                 response = await client.get(
                     f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}",
                     headers=self.headers,
@@ -78,18 +338,54 @@ class GitHubService:
             elif e.response.status_code == 404:
                 raise GitHubAPIError("Repository not found")
             raise GitHubAPIError(f"GitHub API error: {e.response.status_code}")
+        except RateLimitError:
+            raise
         except Exception as e:
             raise GitHubAPIError(f"Connection failed: {str(e)}")
 
-    async def _fetch_repository_tree(self) -> List[Dict[str, Any]]:
-        """Fetch the full repository tree in a single API call."""
-        cache_key = "repo_tree"
-        cached = self._get_cache(cache_key)
-        if cached is not None:
-            return cached
+    async def _stream_tree(
+        self,
+        client: AsyncClient,
+        tree_ish: str,
+        recursive: bool,
+        timeout: float = 10.0,
+    ) -> Tuple[str, bool, List[TreeRecord]]:
+        """
+        Stream a git tree response into compact records.
+
+        Returns (tree sha, truncated flag, records). Only path/type/sha/size
+        are kept; URLs and modes are never materialized.
+        """
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
+            f"/git/trees/{tree_ish}",
+            params={"recursive": 1} if recursive else None,
+            headers=self.headers,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            records, top = await stream_records(
+                response,
+                "tree",
+                TreeRecord._fields,
+                record=TreeRecord,
+                intern=(1,),
+            )
+        return top.get("sha", tree_ish), bool(top.get("truncated")), records
+
+    async def _fetch_repository_tree(
+        self, allow_stale: bool = True
+    ) -> TreeIndex:
+        """The full repository tree, cached (see `_cached`)."""
+        return await self._cached(
+            "repo_tree", self._load_repository_tree, allow_stale
+        )
 
+    async def _load_repository_tree(self) -> TreeIndex:
+        """Fetch the full repository tree in a single API call."""
         try:
-            async with AsyncClient() as client:
+            async with self.client() as client:
                 repo_response = await client.get(
                     f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}",
                     headers=self.headers,
@@ -98,92 +394,285 @@ class GitHubService:
                 repo_response.raise_for_status()
                 default_branch = repo_response.json()["default_branch"]
 
-                tree_response = await client.get(
-                    f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
-                    f"/git/trees/{default_branch}?recursive=1",
-                    headers=self.headers,
-                    timeout=10.0,
+                sha, truncated, records = await self._stream_tree(
+                    client, default_branch, recursive=True
                 )
-                tree_response.raise_for_status()
-                tree_data = tree_response.json()["tree"]
 
-                self._set_cache(cache_key, tree_data)
-                return tree_data
+                index = self._tree_index
+                if index is None or index.sha != sha:
+                    if truncated:
+                        logger.warning(
+                            "Recursive tree truncated at %d entries, "
+                            "walking subtrees",
+                            len(records),
+                        )
+                        records = await self._walk_tree(client, sha)
+                    index = TreeIndex(sha, records)
+                    self._tree_index = index
+
+                return index
 
         except HTTPStatusError as e:
             if e.response.status_code == 403:
                 raise RateLimitError("GitHub API rate limit exceeded")
             raise GitHubAPIError(f"Failed to fetch repository tree: {e}")
+        except RateLimitError:
+            raise
         except Exception as e:
             raise GitHubAPIError(f"Unexpected error: {str(e)}")
 
-    async def get_tree(
-        self, prefix: str = "solutions/"
-    ) -> List[Dict[str, Any]]:
-        """Return the repository tree filtered to a directory prefix."""
-        tree = await self._fetch_repository_tree()
-        return [
-            {
-                "path": item["path"],
-                "type": item["type"],
-                "sha": item["sha"],
-                "size": item.get("size"),
-            }
-            for item in tree
-            if not prefix
-            or item["path"].startswith(prefix)
-            or item["path"] == prefix.rstrip("/")
+    # ── Truncated-tree fallback: walk subtrees by SHA ──
+
+    async def _fetch_subtree(
+        self,
+        client: AsyncClient,
+        sha: str,
+        recursive: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[bool, List[TreeRecord]]:
+        async with semaphore:
+            _, truncated, records = await self._stream_tree(
+                client, sha, recursive, timeout=30.0
+            )
+        return truncated, records
+
+    def _cache_recursive_listing(
+        self, sha: str, records: List[TreeRecord]
+    ) -> None:
+        """Split a complete recursive listing into per-tree child lists."""
+        dir_shas = {"": sha}
+        for r in records:
+            if r.type == "tree":
+                dir_shas[r.path] = r.sha
+
+        # Identical directories share a tree SHA: take each SHA's children
+        # from the first path listing it, or they would repeat
+        listed_at: Dict[str, str] = {}
+        for path, tree_sha in dir_shas.items():
+            listed_at.setdefault(tree_sha, path)
+
+        children: Dict[str, List[TreeRecord]] = {
+            tree_sha: [] for tree_sha in listed_at
+        }
+        for r in records:
+            parent, _, name = r.path.rpartition("/")
+            tree_sha = dir_shas[parent]
+            if listed_at[tree_sha] == parent:
+                children[tree_sha].append(r._replace(path=name))
+        self._subtree_cache.update(children)
+
+    async def _ensure_subtree(
+        self,
+        client: AsyncClient,
+        sha: str,
+        semaphore: asyncio.Semaphore,
+        recursive: bool = True,
+    ) -> None:
+        """Make sure `sha` and everything below it is in the subtree cache."""
+        if sha not in self._subtree_cache:
+            if recursive:
+                truncated, records = await self._fetch_subtree(
+                    client, sha, True, semaphore
+                )
+                if not truncated:
+                    self._cache_recursive_listing(sha, records)
+                    return
+            # Too big for one recursive call: list children, then recurse
+            truncated, records = await self._fetch_subtree(
+                client, sha, False, semaphore
+            )
+            if truncated:
+                logger.warning("Tree %s has too many direct entries", sha[:7])
+            self._subtree_cache[sha] = records
+
+        missing = [
+            child.sha
+            for child in self._subtree_cache[sha]
+            if child.type == "tree" and child.sha not in self._subtree_cache
         ]
+        if missing:
+            await asyncio.gather(
+                *(
+                    self._ensure_subtree(client, child, semaphore)
+                    for child in missing
+                )
+            )
 
-    def _extract_metadata(self, code_content: str) -> Dict[str, Any]:
+    async def _walk_tree(
+        self, client: AsyncClient, root_sha: str
+    ) -> List[TreeRecord]:
         """
-        Extract metadata from code comments in the first 20 lines.
-        Returns defaults for any missing fields.
+        Build the full flat tree for `root_sha` from per-subtree listings.
+
+        Subtrees are fetched concurrently (bounded by
+        GITHUB_TREE_CONCURRENCY) and cached by SHA, so only subtrees that
+        changed since the last walk cost API calls.
         """
-        metadata: Dict[str, Any] = {
-            "difficulty": "Medium",
-            "tags": [],
-            "time_complexity": None,
-            "space_complexity": None,
-            "leetcode_link": None,
-        }
+        semaphore = asyncio.Semaphore(settings.GITHUB_TREE_CONCURRENCY)
+        # The root is already known to be truncated: list it directly
+        await self._ensure_subtree(client, root_sha, semaphore, False)
+
+        records: List[TreeRecord] = []
+        reachable = set()
+        stack = [(root_sha, "")]
+        while stack:
+            sha, base = stack.pop()
+            reachable.add(sha)
+            for child in self._subtree_cache[sha]:
+                path = base + child.path
+                records.append(child._replace(path=path))
+                if child.type == "tree":
+                    stack.append((child.sha, path + "/"))
+
+        # Drop subtrees that are no longer part of the repository
+        for sha in set(self._subtree_cache) - reachable:
+            del self._subtree_cache[sha]
+
+        logger.info(
+            "Walked %d tree entries across %d subtrees",
+            len(records),
+            len(reachable),
+        )
+        return records
+
+    # ── Commits (streamed into compact records) ──
+
+    async def list_commits(
+        self, client: AsyncClient, params: Dict[str, Any]
+    ) -> List[CommitRecord]:
+        """One page of GET /commits as (sha, date, message) records."""
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
+            f"/commits",
+            params=params,
+            headers=self.headers,
+            timeout=15.0,
+        ) as response:
+            response.raise_for_status()
+            commits, _ = await stream_records(
+                response,
+                None,
+                ("sha", "commit.committer.date", "commit.message"),
+                record=CommitRecord,
+            )
+        return commits
+
+    async def get_commit_files(
+        self, client: AsyncClient, sha: str
+    ) -> List[CommitFile]:
+        """Files touched by a commit; patches are skipped while parsing."""
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
+            f"/commits/{sha}",
+            headers=self.headers,
+            timeout=10.0,
+        ) as response:
+            response.raise_for_status()
+            files, _ = await stream_records(
+                response,
+                "files",
+                CommitFile._fields,
+                record=CommitFile,
+                intern=(1,),
+            )
+        return files
 
-        header = "\n".join(code_content.split("\n")[:20])
+    async def get_tree(
+        self, prefix: str = "solutions/", allow_stale: bool = True
+    ) -> List[Dict[str, Any]]:
+        """Return the repository tree filtered to a directory prefix."""
+        index = await self._fetch_repository_tree(allow_stale)
+        return [entry._asdict() for entry in index.query(prefix)]
+
+    async def get_tree_json(self, prefix: str = "solutions/") -> bytes:
+        """Serialized `{"tree": [...]}` body, cached per prefix."""
+        index = await self._fetch_repository_tree()
+        return index.query_json(prefix)
+
+    async def fetch_source(
+        self,
+        client: AsyncClient,
+        file_path: str,
+        max_bytes: int = 0,
+        ref: Optional[str] = None,
+    ) -> SourceFile:
+        """
+        Stream a file as raw bytes and parse its metadata header.
 
-        patterns = {
-            "difficulty": r"@difficulty:\s*(\w+)",
-            "tags": r"@tags:\s*(.+)",
-            "time": r"@time:\s*(.+)",
-            "space": r"@space:\s*(.+)",
-            "leetcode": r"@leetcode:\s*(https?://\S+)",
+        The body is kept only while it fits in `max_bytes`; past that the
+        response is closed as soon as the header region has arrived, so
+        `max_bytes=0` is a header-only fetch.
+        """
+        async with client.stream(
+            "GET",
+            f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
+            f"/contents/{file_path}",
+            params={"ref": ref} if ref else None,
+            headers={**self.headers, "Accept": "application/vnd.github.raw"},
+            timeout=10.0,
+        ) as response:
+            response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > max_bytes and header_complete(body):
+                    header = body.decode("utf-8", errors="ignore")
+                    return SourceFile(
+                        extract_metadata(header, language_for(file_path)),
+                        None,
+                    )
+
+        content = body.decode("utf-8")
+        return SourceFile(
+            extract_metadata(content, language_for(file_path)), content
+        )
+
+    def html_url(self, file_path: str) -> str:
+        """Browser URL for a file on the default branch."""
+        return (
+            f"https://github.com/{self.repo_owner}/{self.repo_name}"
+            f"/blob/HEAD/{file_path}"
+        )
+
+    @staticmethod
+    def format_file(
+        file_path: str,
+        code_content: str,
+        size: Optional[int],
+        sha: str,
+        github_url: str,
+        metadata: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Shape a file the way /dsa/file and /dsa/latest return it."""
+        file_name = file_path.split("/")[-1]
+        file_base = (
+            file_name.rsplit(".", 1)[0] if "." in file_name else file_name
+        )
+        return {
+            "path": file_path,
+            "name": file_base.replace("_", " ").title(),
+            "file_name": file_name,
+            "code": code_content,
+            "language": (
+                file_name.rsplit(".", 1)[1] if "." in file_name else ""
+            ),
+            "size": size,
+            "sha": sha,
+            "github_url": github_url,
+            "metadata": metadata,
         }
 
-        for key, pattern in patterns.items():
-            match = re.search(pattern, header, re.IGNORECASE)
-            if match:
-                value = match.group(1).strip()
-                if key == "tags":
-                    metadata["tags"] = [t.strip() for t in value.split(",")]
-                elif key == "time":
-                    metadata["time_complexity"] = value
-                elif key == "space":
-                    metadata["space_complexity"] = value
-                elif key == "leetcode":
-                    metadata["leetcode_link"] = value
-                else:
-                    metadata[key] = value
-
-        return metadata
-
     async def get_file_content(self, file_path: str) -> Dict[str, Any]:
         """Fetch and decode a file from the repository by its path."""
-        cache_key = f"file_{file_path}"
-        cached = self._get_cache(cache_key)
-        if cached is not None:
-            return cached
+        return await self._cached(
+            f"file_{file_path}", lambda: self._load_file_content(file_path)
+        )
 
+    async def _load_file_content(self, file_path: str) -> Dict[str, Any]:
         try:
-            async with AsyncClient() as client:
+            async with self.client() as client:
                 response = await client.get(
                     f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
                     f"/contents/{file_path}",
@@ -196,31 +685,18 @@ class GitHubService:
                 code_content = base64.b64decode(data["content"]).decode(
                     "utf-8"
                 )
-                metadata = self._extract_metadata(code_content)
-
-                file_name = file_path.split("/")[-1]
-                file_base = (
-                    file_name.rsplit(".", 1)[0]
-                    if "." in file_name
-                    else file_name
+                metadata = extract_metadata(
+                    code_content, language_for(file_path)
                 )
 
-                result = {
-                    "path": file_path,
-                    "name": file_base.replace("_", " ").title(),
-                    "file_name": file_name,
-                    "code": code_content,
-                    "language": (
-                        file_name.rsplit(".", 1)[1] if "." in file_name else ""
-                    ),
-                    "size": data["size"],
-                    "sha": data["sha"],
-                    "github_url": data["html_url"],
-                    "metadata": metadata,
-                }
-
-                self._set_cache(cache_key, result)
-                return result
+                return self.format_file(
+                    file_path,
+                    code_content,
+                    data["size"],
+                    data["sha"],
+                    data["html_url"],
+                    metadata,
+                )
 
         except HTTPStatusError as e:
             if e.response.status_code == 404:
@@ -228,79 +704,80 @@ class GitHubService:
             elif e.response.status_code == 403:
                 raise RateLimitError("GitHub API rate limit exceeded")
             raise GitHubAPIError(f"Failed to fetch file content: {e}")
+        except RateLimitError:
+            raise
         except Exception as e:
             raise GitHubAPIError(f"Unexpected error: {str(e)}")
 
     async def get_latest_file(
-        self, directory_prefix: str = "solutions/"
+        self,
+        directory_prefix: str = "solutions/",
+        load_file: Optional[
+            Callable[[str], Awaitable[Dict[str, Any]]]
+        ] = None,
     ) -> Optional[Dict[str, Any]]:
-        """Return the most recently committed file under directory_prefix."""
-        cache_key = f"latest_file_{directory_prefix}"
-        cached = self._get_cache(cache_key)
-        if cached is not None:
-            return cached
+        """
+        Return the most recently committed file under directory_prefix.
 
+        `load_file` resolves the file body (e.g. from the local blob store);
+        defaults to fetching it through the contents API.
+        """
+        return await self._cached(
+            f"latest_file_{directory_prefix}",
+            lambda: self._load_latest_file(directory_prefix, load_file),
+        )
+
+    async def _load_latest_file(
+        self,
+        directory_prefix: str,
+        load_file: Optional[Callable[[str], Awaitable[Dict[str, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
         try:
-            async with AsyncClient() as client:
+            async with self.client() as client:
                 # Get the latest commit touching the directory
-                commits_response = await client.get(
-                    f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
-                    f"/commits",
-                    params={"path": directory_prefix, "per_page": 1},
-                    headers=self.headers,
-                    timeout=10.0,
+                commits = await self.list_commits(
+                    client, {"path": directory_prefix, "per_page": 1}
                 )
-                commits_response.raise_for_status()
-                commits = commits_response.json()
 
                 if not commits:
                     return None
 
-                commit_sha = commits[0]["sha"]
-
                 # Get the commit detail to find changed files
-                detail_response = await client.get(
-                    f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}"
-                    f"/commits/{commit_sha}",
-                    headers=self.headers,
-                    timeout=10.0,
-                )
-                detail_response.raise_for_status()
-                detail = detail_response.json()
+                files = await self.get_commit_files(client, commits[0].sha)
 
                 # Find the first added/modified file under the prefix
                 target_file = None
-                for f in detail.get("files", []):
-                    if f["filename"].startswith(directory_prefix) and f[
-                        "status"
-                    ] in ("added", "modified"):
-                        target_file = f["filename"]
+                for f in files:
+                    if f.filename.startswith(
+                        directory_prefix
+                    ) and f.status in ("added", "modified"):
+                        target_file = f.filename
                         break
 
                 # Fallback: any file under prefix
                 if not target_file:
-                    for f in detail.get("files", []):
-                        if f["filename"].startswith(directory_prefix):
-                            target_file = f["filename"]
+                    for f in files:
+                        if f.filename.startswith(directory_prefix):
+                            target_file = f.filename
                             break
 
                 if not target_file:
                     return None
 
-                # Reuse existing method for full file content
-                result = await self.get_file_content(target_file)
-                result["commit_date"] = commits[0]["commit"]["committer"][
-                    "date"
-                ]
-                result["commit_message"] = commits[0]["commit"]["message"]
-
-                self._set_cache(cache_key, result)
+                # Copy so the annotations below never leak into the
+                # loader's own cache entry
+                loader = load_file or self.get_file_content
+                result = dict(await loader(target_file))
+                result["commit_date"] = commits[0].date
+                result["commit_message"] = commits[0].message
                 return result
 
         except HTTPStatusError as e:
             if e.response.status_code == 403:
                 raise RateLimitError("GitHub API rate limit exceeded")
             raise GitHubAPIError(f"Failed to fetch latest file: {e}")
+        except RateLimitError:
+            raise
         except Exception as e:
             raise GitHubAPIError(
                 f"Unexpected error fetching latest file: {str(e)}"
@@ -310,9 +787,25 @@ class GitHubService:
         """Clear all cached GitHub data."""
         cache_size = len(self._cache)
         self._cache.clear()
+        self._tree_index = None
+        self._subtree_cache.clear()
         logger.info("GitHub cache cleared (%d entries removed)", cache_size)
         return {"message": f"Cache cleared ({cache_size} entries removed)"}
 
 
-# Singleton — isolated from the rest of the application
-github_service = GitHubService()
+# One instance per configured repository — isolated from the rest of the
+# application. `github_service` is the default (first) repository.
+github_services: Dict[str, GitHubService] = {
+    repo: GitHubService(repo) for repo in settings.GITHUB_REPOS
+}
+github_service = next(iter(github_services.values()), None) or GitHubService()
+
+
+def get_github_service(repo: Optional[str] = None) -> GitHubService:
+    """Service for `repo` ("owner/name"), or the default repository."""
+    if not repo:
+        return github_service
+    try:
+        return github_services[repo]
+    except KeyError:
+        raise ValueError(f"Repository not configured: {repo}")
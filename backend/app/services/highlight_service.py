@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.models.dsa import DsaHighlight
+from app.utils.highlight import RENDER_VERSION, render_html
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Per-worker render pool, started on first use. Spawned rather than forked:
+# the parent is an event loop with live DB connections.
+_pool: Optional[ProcessPoolExecutor] = None
+
+# (sha, language) → render in progress in this worker
+_inflight: Dict[Tuple[str, str], "asyncio.Future[str]"] = {}
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.DSA_HIGHLIGHT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+class HighlightService:
+    """
+    Highlighted HTML for DSA files, rendered once per blob version.
+
+    Renders run in a process pool and are stored in dsa_highlights keyed
+    by (blob SHA, language), so every worker and every later view reuses
+    them. Concurrent views of an unrendered file share one render.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_html(
+        self, sha: str, language: str, file_name: str, code: str
+    ) -> Optional[str]:
+        """Cached or freshly rendered HTML; None if too large or failed."""
+        if len(code) > settings.DSA_HIGHLIGHT_MAX_CHARS:
+            return None
+
+        key = (sha, language[:20])
+        row = await run_in_threadpool(self.db.get, DsaHighlight, key)
+        if row is not None and row.version == RENDER_VERSION:
+            return row.html
+
+        pending = _inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        pending = loop.create_future()
+        _inflight[key] = pending
+        try:
+            html = await self._render(code, file_name)
+            if html is not None:
+                await run_in_threadpool(self._store, key, html)
+            pending.set_result(html)
+            return html
+        finally:
+            if not pending.done():
+                pending.set_result(None)
+            del _inflight[key]
+
+    async def _render(self, code: str, file_name: str) -> Optional[str]:
+        global _pool
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                _get_pool(), render_html, code, file_name
+            )
+        except BrokenProcessPool:
+            logger.warning("Highlight pool died; restarting on next use")
+            _pool = None
+        except Exception as e:
+            logger.warning("Failed to highlight %s: %s", file_name, e)
+        return None
+
+    def _store(self, key: Tuple[str, str], html: str) -> None:
+        sha, language = key
+        stmt = pg_insert(DsaHighlight).values(
+            sha=sha, language=language, version=RENDER_VERSION, html=html
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["sha", "language"],
+                set_={
+                    "version": stmt.excluded.version,
+                    "html": stmt.excluded.html,
+                },
+            )
+        )
+        self.db.commit()
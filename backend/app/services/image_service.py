@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import multiprocessing
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import Lock
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select, update
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.content_file import ContentFile
+from app.models.media import ContentImage, MediaBlob
+from app.services.file_storage import file_storage
+from app.utils.image_variants import VARIANTS_VERSION, make_variants
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Served as uploaded: vector, or possibly animated
+UNRESIZED_IMAGE_TYPES = {"image/svg+xml", "image/gif"}
+
+# Per-worker derivative pool, started on first use. Spawned rather than
+# forked: the parent is an event loop with live DB connections.
+_pool: Optional[ProcessPoolExecutor] = None
+
+# Blob SHAs with variants being generated by this worker
+_inflight: Set[str] = set()
+_inflight_lock = Lock()
+
+# Tasks awaiting variant results, held so they are not garbage collected
+_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def needs_variants(
+    content_type: str, variants: Optional[Dict[str, Any]]
+) -> bool:
+    if content_type in UNRESIZED_IMAGE_TYPES:
+        return False
+    return variants is None or variants.get("version") != VARIANTS_VERSION
+
+
+def schedule_variants(sha256: str, blob_path: str) -> None:
+    """
+    Queue responsive variants (IMAGE_VARIANT_WIDTHS × FORMATS plus a
+    placeholder) of a stored blob and return immediately.
+
+    Generation runs in the process pool, writing beside the blob; a task
+    on the event loop awaits it, then stores the entry in
+    media_blobs.variants and gives every post using the image a new
+    media_version (in a thread), so its rendered HTML picks up the
+    srcset. Failures are logged; the original is served.
+
+    Call it on the event loop; content-write threads go through
+    anyio.from_thread.
+    """
+    with _inflight_lock:
+        if sha256 in _inflight:
+            return
+        _inflight.add(sha256)
+    task = asyncio.get_running_loop().create_task(
+        _generate(sha256, blob_path)
+    )
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _done(sha256: str) -> None:
+    with _inflight_lock:
+        _inflight.discard(sha256)
+
+
+async def _generate(sha256: str, blob_path: str) -> None:
+    global _pool
+    try:
+        try:
+            entry = await asyncio.wrap_future(
+                _get_pool().submit(
+                    make_variants,
+                    posixpath.join(settings.MEDIA_ROOT, blob_path),
+                    settings.MEDIA_ROOT,
+                    posixpath.dirname(blob_path),
+                    sha256,
+                    tuple(settings.IMAGE_VARIANT_WIDTHS),
+                    tuple(settings.IMAGE_VARIANT_FORMATS),
+                )
+            )
+        except BrokenProcessPool:
+            logger.warning("Image pool died; restarting on next use")
+            _pool = None
+            return
+        except Exception as e:
+            logger.warning("No variants for blob %s: %s", sha256, e)
+            return
+        await asyncio.to_thread(_record, sha256, entry)
+    finally:
+        _done(sha256)
+
+
+def _record(sha256: str, entry: Dict[str, Any]) -> None:
+    """Store a variant entry and bump the posts using the blob"""
+    paths = [v["path"] for vs in entry["variants"].values() for v in vs]
+    db = SessionLocal()
+    try:
+        stored = db.execute(
+            update(MediaBlob)
+            .where(MediaBlob.sha256 == sha256)
+            .values(variants=entry)
+        ).rowcount
+        if not stored:
+            # Collected while the variants were being made
+            file_storage.delete_blob_files(paths)
+            return
+        db.execute(
+            update(ContentFile)
+            .where(
+                ContentFile.id.in_(
+                    select(ContentImage.content_id).where(
+                        ContentImage.sha256 == sha256
+                    )
+                )
+            )
+            .values(media_version=ContentFile.media_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning("Could not record variants for %s: %s", sha256, e)
+    finally:
+        db.close()
@@ -0,0 +1,64 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+from app.utils.content_archive import parse_entry
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Smaller imports parse inline: starting the pool would cost more
+PARALLEL_PARSE_MIN = 16
+
+# Per-worker frontmatter pool, started on first use. Spawned rather than
+# forked: the parent is an event loop with live DB connections.
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.CONTENT_IMPORT_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def parse_entries(
+    section: str, files: List[Tuple[str, bytes]]
+) -> List[Dict[str, Any]]:
+    """
+    parse_entry for every (path, markdown bytes), in order. YAML parsing
+    holds the GIL, so larger batches are spread over the process pool.
+    Blocking: call it from a content-write thread.
+    """
+    global _pool
+    sections = [section] * len(files)
+    paths = [path for path, _ in files]
+    data = [content for _, content in files]
+    if len(files) >= PARALLEL_PARSE_MIN:
+        chunksize = max(
+            1, len(files) // (settings.CONTENT_IMPORT_PROCESSES * 4)
+        )
+        try:
+            return list(
+                _get_pool().map(
+                    parse_entry, sections, paths, data, chunksize=chunksize
+                )
+            )
+        except BrokenProcessPool:
+            logger.warning("Import pool died; parsing inline")
+            _pool = None
+    return list(map(parse_entry, sections, paths, data))
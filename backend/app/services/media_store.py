@@ -0,0 +1,257 @@
+import logging
+import mimetypes
+from collections import Counter
+from datetime import timedelta
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.media import ContentImage, MediaBlob
+from app.services.file_storage import SpooledUpload, file_storage
+from app.services.image_service import needs_variants
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Extensions kept on blob paths, so the file server sends the right
+# Content-Type; anything else is derived from the upload's content type
+IMAGE_EXTENSIONS = {
+    ".avif",
+    ".bmp",
+    ".gif",
+    ".jpeg",
+    ".jpg",
+    ".png",
+    ".svg",
+    ".webp",
+}
+
+
+class AttachedImage(NamedTuple):
+    blob_path: str
+    replaced: bool
+    # Variants to generate for this blob, if any
+    needs_variants: bool
+
+
+def media_url(path: str) -> str:
+    """Public URL of a file under MEDIA_ROOT"""
+    return f"{settings.MEDIA_URL.rstrip('/')}/{path}"
+
+
+def blob_extension(filename: str, content_type: str) -> str:
+    ext = PurePosixPath(filename).suffix.lower()
+    if ext in IMAGE_EXTENSIONS:
+        return ext
+    guessed = mimetypes.guess_extension(content_type or "") or ""
+    return guessed if guessed in IMAGE_EXTENSIONS else ""
+
+
+class MediaStore:
+    """
+    Content-addressed, deduplicated image storage.
+
+    Image bytes are stored once per SHA-256 under MEDIA_ROOT/blobs/ and
+    never change, so their URLs can be cached forever. Each post maps the
+    names its markdown uses (images/<name>) to blobs in content_images;
+    media_blobs.refcount counts those mappings. A blob whose count drops
+    to zero is deleted by collect_garbage after a grace period, which
+    covers uploads racing the collection.
+
+    Methods only stage changes on the session; callers commit.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def attach(
+        self,
+        content_id: UUID,
+        name: str,
+        spooled: SpooledUpload,
+        content_type: str,
+    ) -> AttachedImage:
+        """
+        Map `name` in a post to the spooled upload's blob, storing the
+        bytes unless an identical blob exists. Replacing a name releases
+        the blob it pointed to.
+        """
+        previous = self.db.get(ContentImage, (content_id, name))
+        if previous is not None and previous.sha256 == spooled.sha256:
+            spooled.tmp.unlink(missing_ok=True)
+            blob = self.db.get(MediaBlob, spooled.sha256)
+            return AttachedImage(
+                file_storage.blob_path(blob.sha256, blob.ext), False, False
+            )
+
+        stmt = pg_insert(MediaBlob).values(
+            sha256=spooled.sha256,
+            ext=blob_extension(name, content_type),
+            content_type=content_type,
+            size=spooled.size,
+            refcount=1,
+        )
+        # Row-locks an existing blob until commit, so garbage collection
+        # cannot delete it underneath this upload
+        blob = self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["sha256"],
+                set_={
+                    "refcount": MediaBlob.refcount + 1,
+                    "released_at": None,
+                },
+            ).returning(
+                MediaBlob.ext, MediaBlob.content_type, MediaBlob.variants
+            )
+        ).one()
+
+        blob_path = file_storage.blob_path(spooled.sha256, blob.ext)
+        file_storage.commit_blob(spooled, blob_path)
+
+        if previous is not None:
+            self._release(Counter([previous.sha256]))
+            previous.sha256 = spooled.sha256
+        else:
+            self.db.add(
+                ContentImage(
+                    content_id=content_id, name=name, sha256=spooled.sha256
+                )
+            )
+
+        return AttachedImage(
+            blob_path,
+            previous is not None,
+            needs_variants(blob.content_type, blob.variants),
+        )
+
+    def image_names(self, content_ids: Iterable[UUID]) -> Set[str]:
+        """Names (images/<name>) the given posts map"""
+        content_ids = list(content_ids)
+        if not content_ids:
+            return set()
+        return {
+            name
+            for (name,) in self.db.query(ContentImage.name).filter(
+                ContentImage.content_id.in_(content_ids)
+            )
+        }
+
+    def release_content(self, content_id: UUID) -> None:
+        """Drop all of a post's image mappings"""
+        shas = [
+            sha
+            for (sha,) in self.db.query(ContentImage.sha256).filter(
+                ContentImage.content_id == content_id
+            )
+        ]
+        if not shas:
+            return
+        self.db.query(ContentImage).filter(
+            ContentImage.content_id == content_id
+        ).delete(synchronize_session=False)
+        self._release(Counter(shas))
+
+    def _release(self, counts: Counter) -> None:
+        for sha256, count in counts.items():
+            # Never below 0: collect_garbage and its partial index
+            # (idx_media_blobs_released) both match refcount = 0
+            remaining = func.greatest(MediaBlob.refcount - count, 0)
+            self.db.execute(
+                update(MediaBlob)
+                .where(MediaBlob.sha256 == sha256)
+                .values(
+                    refcount=remaining,
+                    released_at=case(
+                        (remaining == 0, func.now()),
+                        else_=MediaBlob.released_at,
+                    ),
+                )
+            )
+
+    def images_for(self, content_id: UUID) -> Dict[str, Dict[str, Any]]:
+        """
+        {"images/<name>": image} for the renderer: immutable blob URL,
+        plus size, placeholder and variant URLs once generated.
+        """
+        rows = (
+            self.db.query(
+                ContentImage.name,
+                MediaBlob.sha256,
+                MediaBlob.ext,
+                MediaBlob.variants,
+            )
+            .join(MediaBlob, MediaBlob.sha256 == ContentImage.sha256)
+            .filter(ContentImage.content_id == content_id)
+            .all()
+        )
+        images = {}
+        for name, sha256, ext, variants in rows:
+            image: Dict[str, Any] = {
+                "src": media_url(file_storage.blob_path(sha256, ext))
+            }
+            if variants:
+                image.update(
+                    width=variants["width"],
+                    height=variants["height"],
+                    placeholder=variants.get("placeholder"),
+                    variants={
+                        fmt: [
+                            {"width": v["width"], "url": media_url(v["path"])}
+                            for v in entries
+                        ]
+                        for fmt, entries in variants["variants"].items()
+                    },
+                )
+            images[f"images/{name}"] = image
+        return images
+
+    def collect_garbage(self, grace_seconds: Optional[int] = None) -> int:
+        """
+        Delete blobs (and their variants) unreferenced for longer than
+        the grace period. Files are unlinked before the deleting
+        transaction commits: an upload reusing one of these blobs waits
+        on the row lock, then finds no file and stores its own copy.
+        Commits; returns the number of blobs removed.
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.MEDIA_GC_GRACE_SECONDS
+        rows = self.db.execute(
+            delete(MediaBlob)
+            .where(
+                MediaBlob.refcount == 0,
+                MediaBlob.released_at
+                < func.now() - timedelta(seconds=grace_seconds),
+            )
+            .returning(MediaBlob.sha256, MediaBlob.ext, MediaBlob.variants)
+        ).all()
+
+        for sha256, ext, variants in rows:
+            paths = [file_storage.blob_path(sha256, ext)]
+            if variants:
+                paths.extend(
+                    v["path"]
+                    for entries in variants["variants"].values()
+                    for v in entries
+                )
+            file_storage.delete_blob_files(paths)
+        self.db.commit()
+
+        if rows:
+            logger.info("Collected %d unreferenced media blobs", len(rows))
+        return len(rows)
+
+
+def collect_garbage(grace_seconds: Optional[int] = None) -> int:
+    """MediaStore.collect_garbage in its own session"""
+    db = SessionLocal()
+    try:
+        return MediaStore(db).collect_garbage(grace_seconds)
+    finally:
+        db.close()
@@ -0,0 +1,125 @@
+import posixpath
+import re
+import tarfile
+import zipfile
+from typing import IO, Any, Dict, List, Optional
+
+from app.utils.markdown_parser import MarkdownParser
+
+# ![alt](target "title"): the target, with or without <angle brackets>
+_IMAGE_REF = re.compile(r"!\[[^\]]*\]\(\s*<?([^)\s>]+)")
+
+
+def member_path(name: str) -> Optional[str]:
+    """
+    Normalized path of an archive member, or None for anything that
+    must not be imported: absolute or escaping paths, hidden files and
+    macOS resource forks.
+    """
+    name = name.replace("\\", "/")
+    if name.startswith("/"):
+        return None
+    path = posixpath.normpath(name)
+    parts = path.split("/")
+    if path == "." or ".." in parts:
+        return None
+    if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+        return None
+    return path
+
+
+class ContentArchive:
+    """
+    Read-only view of an uploaded zip or tar (optionally compressed).
+
+    Only regular files with safe paths are listed, in archive order;
+    reading them in that order avoids rewinding compressed tar streams.
+    """
+
+    def __init__(self, path: str):
+        if zipfile.is_zipfile(path):
+            try:
+                self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(path)
+            except zipfile.BadZipFile as e:
+                raise ValueError(f"Invalid zip archive: {e}")
+            self._tar: Optional[tarfile.TarFile] = None
+            infos = [
+                (info.filename, info.file_size, info)
+                for info in self._zip.infolist()
+                if not info.is_dir()
+            ]
+        else:
+            try:
+                self._tar = tarfile.open(path, "r:*")
+            except tarfile.TarError:
+                raise ValueError("Unsupported archive: upload a zip or tar")
+            self._zip = None
+            infos = [
+                (info.name, info.size, info)
+                for info in self._tar.getmembers()
+                if info.isfile()
+            ]
+
+        # path → (size, archive info), in archive order
+        self.members: Dict[str, tuple] = {}
+        for name, size, info in infos:
+            path = member_path(name)
+            if path is not None:
+                self.members[path] = (size, info)
+
+    def size(self, path: str) -> int:
+        return self.members[path][0]
+
+    def open(self, path: str) -> IO[bytes]:
+        info = self.members[path][1]
+        if self._zip is not None:
+            return self._zip.open(info)
+        return self._tar.extractfile(info)
+
+    def read(self, path: str) -> bytes:
+        with self.open(path) as member:
+            return member.read()
+
+    def close(self) -> None:
+        (self._zip or self._tar).close()
+
+    def __enter__(self) -> "ContentArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def image_refs(markdown: str) -> List[str]:
+    """
+    Names of the images/<name> files a post's markdown references,
+    in order of first use
+    """
+    names: Dict[str, None] = {}
+    for target in _IMAGE_REF.findall(markdown):
+        if "://" in target or target.startswith(("/", "#", "data:")):
+            continue
+        path = posixpath.normpath(target.split("#")[0].split("?")[0])
+        head, name = posixpath.split(path)
+        if head == "images" and name:
+            names[name] = None
+    return list(names)
+
+
+def parse_entry(section: str, path: str, data: bytes) -> Dict[str, Any]:
+    """
+    Parse and validate one archived markdown file. Pure, so it can run
+    in a process pool: {"path", "metajson", "markdown", "images"} or
+    {"path", "error"}.
+    """
+    try:
+        metajson, markdown = MarkdownParser.parse(data)
+        MarkdownParser.validate_required_fields(section, metajson)
+    except ValueError as e:
+        return {"path": path, "error": str(e)}
+    return {
+        "path": path,
+        "metajson": metajson,
+        "markdown": markdown,
+        "images": image_refs(markdown),
+    }
@@ -0,0 +1,44 @@
+from functools import lru_cache
+
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import TextLexer, get_lexer_for_filename
+from pygments.util import ClassNotFound
+
+# Bump when the markup changes; cached renders from older versions are
+# re-rendered on next view
+RENDER_VERSION = 1
+
+CSS_CLASS = "highlight"
+
+# Pygments styles for the viewer's light and dark themes
+LIGHT_STYLE = "default"
+DARK_STYLE = "one-dark"
+
+
+def _formatter(**options) -> HtmlFormatter:
+    return HtmlFormatter(
+        cssclass=CSS_CLASS, linenos="table", wrapcode=True, **options
+    )
+
+
+def render_html(code: str, file_name: str) -> str:
+    """
+    Highlight `code` as HTML with line numbers. Lexer is picked from the
+    file name (plain text if unknown). CPU-bound: run it in a pool.
+    """
+    try:
+        lexer = get_lexer_for_filename(file_name, stripnl=False)
+    except ClassNotFound:
+        lexer = TextLexer(stripnl=False)
+    return highlight(code, lexer, _formatter())
+
+
+@lru_cache(maxsize=1)
+def stylesheet() -> str:
+    """Token CSS for both themes; dark applies under `.dark`."""
+    light = _formatter(style=LIGHT_STYLE).get_style_defs(f".{CSS_CLASS}")
+    dark = _formatter(style=DARK_STYLE).get_style_defs(
+        f".dark .{CSS_CLASS}"
+    )
+    return f"{light}\n{dark}\n"
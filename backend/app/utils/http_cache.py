@@ -0,0 +1,53 @@
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+# For content-addressed URLs, whose bytes can never change
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def cache_headers(
+    etag: str, max_age: int, stale_while_revalidate: int = 0
+) -> Dict[str, str]:
+    """Validator + freshness headers for a cacheable GET response."""
+    control = f"public, max-age={max_age}"
+    if stale_while_revalidate:
+        control += f", stale-while-revalidate={stale_while_revalidate}"
+    return {"ETag": etag, "Cache-Control": control}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    True if If-None-Match names `etag`. Uses weak comparison, as RFC 9110
+    requires for If-None-Match (nginx weakens ETags when it gzips).
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in header.split(",")
+    )
+
+
+def not_modified(
+    request: Request, headers: Dict[str, str]
+) -> Optional[Response]:
+    """A 304 carrying `headers` if the client's copy is current."""
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-addressed files: cached for a year."""
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
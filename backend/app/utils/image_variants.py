@@ -0,0 +1,101 @@
+import base64
+import io
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Sequence
+
+from PIL import Image, ImageOps
+
+# Bump when encoding settings change; entries record the version they
+# were made with, and older ones are regenerated on the next upload
+VARIANTS_VERSION = 1
+
+# Encoder settings per output format: (Pillow format, save options)
+ENCODERS = {
+    "avif": ("AVIF", {"quality": 55, "speed": 6}),
+    "webp": ("WEBP", {"quality": 78, "method": 4}),
+}
+
+# Width of the inline blur-up placeholder
+PLACEHOLDER_WIDTH = 16
+
+
+def _save_atomic(image: Image.Image, path: Path, fmt: str, **options) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".variant-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            image.save(out, fmt, **options)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _placeholder(image: Image.Image) -> str:
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    tiny = image.resize((PLACEHOLDER_WIDTH, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    tiny.save(buffer, "WEBP", quality=40)
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    return f"data:image/webp;base64,{encoded}"
+
+
+def make_variants(
+    source: str,
+    media_root: str,
+    blob_dir: str,
+    sha256: str,
+    widths: Sequence[int],
+    formats: Sequence[str],
+) -> Dict[str, Any]:
+    """
+    Write resized copies of the image at `source` beside its blob, as
+    <blob_dir>/<sha256>-<width>.<format>, and return the entry recorded
+    in media_blobs.variants (paths relative to `media_root`).
+
+    Widths at or above the original are dropped (never upscaled); an
+    original narrower than the largest width is also encoded at its own
+    width. Animated images are left alone. CPU-bound: run it in a pool.
+    """
+    with Image.open(source) as opened:
+        if getattr(opened, "is_animated", False):
+            raise ValueError("animated images are served as uploaded")
+        image = ImageOps.exif_transpose(opened)
+        image.load()
+
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    targets = sorted({w for w in widths if w < image.width})
+    if not targets or image.width < max(widths):
+        targets.append(image.width)
+
+    out_dir = Path(media_root) / blob_dir
+
+    variants: Dict[str, list] = {fmt: [] for fmt in formats}
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = (
+            image
+            if width == image.width
+            else image.resize((width, height), Image.LANCZOS)
+        )
+        for fmt in formats:
+            pil_format, options = ENCODERS[fmt]
+            name = f"{sha256}-{width}.{fmt}"
+            _save_atomic(resized, out_dir / name, pil_format, **options)
+            variants[fmt].append(
+                {"width": width, "path": f"{blob_dir}/{name}"}
+            )
+
+    return {
+        "version": VARIANTS_VERSION,
+        "width": image.width,
+        "height": image.height,
+        # A blurred backdrop would show through transparent images
+        "placeholder": None if image.mode == "RGBA" else _placeholder(image),
+        "variants": variants,
+    }
@@ -0,0 +1,177 @@
+import codecs
+import json
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from httpx import Response
+
+T = TypeVar("T")
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _StreamReader:
+    """
+    Incremental view over a streamed response body.
+
+    Holds at most the unconsumed tail of the previous chunk plus the
+    current one; whole values are decoded by the C scanner via raw_decode.
+    """
+
+    def __init__(self, response: Response) -> None:
+        self._chunks = response.aiter_bytes()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at EOF."""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+            text = self._utf8.decode(chunk)
+        except StopAsyncIteration:
+            text = self._utf8.decode(b"", final=True)
+            self.eof = True
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        return not self.eof
+
+    async def peek(self) -> str:
+        """Next non-whitespace character, without consuming it."""
+        while True:
+            buf = self.buf
+            while self.pos < len(buf) and buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(buf):
+                return buf[self.pos]
+            if not await self.fill():
+                raise ValueError("Unexpected end of JSON body")
+
+    async def expect(self, char: str) -> None:
+        if await self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON body")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value continues in the next chunk
+                if not await self.fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may be cut short
+            if end == len(self.buf) and await self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def _dig(item: Any, keys: List[str]) -> Any:
+    for key in keys:
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+
+async def stream_records(
+    response: Response,
+    array_key: Optional[str],
+    fields: Sequence[str],
+    record: Callable[..., T],
+    intern: Sequence[int] = (),
+) -> Tuple[List[T], Dict[str, Any]]:
+    """
+    Parse a streamed JSON response into compact records.
+
+    Elements of the array at top-level key `array_key` (or of the top-level
+    array itself when None) are decoded one at a time and reduced to
+    `record(*values)` for the dotted `fields`; the rest of each element is
+    dropped immediately. Field positions in `intern` go through sys.intern.
+
+    Returns:
+        (records, {other top-level key: value})
+    """
+    reader = _StreamReader(response)
+    getters = [f.split(".") for f in fields]
+    records: List[T] = []
+    top: Dict[str, Any] = {}
+
+    async def read_array() -> None:
+        await reader.expect("[")
+        empty, after_value = True, False
+        while True:
+            # Decode as many whole elements as the buffer holds before
+            # awaiting the next chunk
+            buf, pos, end = reader.buf, reader.pos, len(reader.buf)
+            while True:
+                while pos < end and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos >= end:
+                    break
+                char = buf[pos]
+                if char == "]" and (after_value or empty):
+                    reader.pos = pos + 1
+                    return
+                if after_value:
+                    if char != ",":
+                        raise ValueError("Malformed JSON array")
+                    after_value = False
+                    pos += 1
+                    continue
+                try:
+                    item, stop = _decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    break
+                if stop == end:
+                    # Might be cut short (a number); decode again after fill
+                    break
+                values = [_dig(item, keys) for keys in getters]
+                for i in intern:
+                    if values[i] is not None:
+                        values[i] = sys.intern(values[i])
+                records.append(record(*values))
+                empty, after_value = False, True
+                pos = stop
+            reader.pos = pos
+            if not await reader.fill():
+                raise ValueError("Unexpected end of JSON body")
+
+    if array_key is None:
+        await read_array()
+        return records, top
+
+    await reader.expect("{")
+    if await reader.peek() == "}":
+        return records, top
+    while True:
+        key = await reader.value()
+        await reader.expect(":")
+        if key == array_key:
+            await read_array()
+        else:
+            top[key] = await reader.value()
+
+        separator = await reader.peek()
+        reader.pos += 1
+        if separator == "}":
+            return records, top
+        if separator != ",":
+            raise ValueError("Malformed JSON object")
@@ -1,7 +1,21 @@
 import frontmatter
 import yaml
+from frontmatter.default_handlers import YAMLHandler
 from typing import Dict, Tuple
 
+# libyaml's loader when PyYAML was built with it: several times faster on
+# large frontmatter, which keeps upload parsing short
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _YAMLHandler(YAMLHandler):
+    def load(self, fm: str, **kwargs: object):
+        kwargs.setdefault("Loader", SafeLoader)
+        return super().load(fm, **kwargs)
+
+
+_yaml_handler = _YAMLHandler()
+
 class MarkdownParser:
     """Parse markdown files with frontmatter"""
 
@@ -23,7 +37,7 @@ class MarkdownParser:
             content = content.decode('utf-8')
 
         try:
-            post = frontmatter.loads(content)
+            post = frontmatter.loads(content, handler=_yaml_handler)
             return dict(post.metadata), post.content
         except yaml.scanner.ScannerError as e:
             # Provide helpful error message for YAML syntax errors
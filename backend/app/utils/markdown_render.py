@@ -0,0 +1,163 @@
+import posixpath
+import re
+from html import escape
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+from mdit_py_plugins.dollarmath import dollarmath_plugin
+from mdit_py_plugins.tasklists import tasklists_plugin
+from pygments import highlight
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+from pygments.util import ClassNotFound
+
+from app.utils.highlight import CSS_CLASS
+
+# Bump when the output changes; renders from older versions are redone
+RENDER_VERSION = 3
+
+# Headings listed in the table of contents
+TOC_MAX_LEVEL = 3
+
+# Rendered width of content images: the prose column, or the viewport
+IMAGE_SIZES = "(min-width: 768px) 768px, 100vw"
+
+_ID_STRIP = re.compile(r"[^\w\s-]", re.ASCII)
+_ID_SPACE = re.compile(r"\s+")
+_SCHEME = re.compile(r"^[a-z][a-z0-9+.-]*:", re.IGNORECASE)
+
+
+class RenderedMarkdown(NamedTuple):
+    html: str
+    toc: List[Dict[str, Any]]
+
+
+def heading_id(text: str) -> str:
+    """Anchor id for a heading, as the frontend generates it."""
+    return _ID_SPACE.sub("-", _ID_STRIP.sub("", text.lower()))
+
+
+def _highlight_code(code: str, lang: str, attrs: str) -> str:
+    try:
+        lexer = get_lexer_by_name(lang)
+    except ClassNotFound:
+        # markdown-it escapes and wraps it as plain code
+        return ""
+    spans = highlight(code, lexer, HtmlFormatter(nowrap=True))
+    return (
+        f'<pre class="{CSS_CLASS}"><code class="language-{lang}">'
+        f"{spans}</code></pre>"
+    )
+
+
+def _render_image(self, tokens: List[Token], idx: int, options, env) -> str:
+    img = self.image(tokens, idx, options, env)
+    entry = tokens[idx].meta.get("variants")
+    if not entry:
+        return img
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{escape(srcset)}" '
+        f'sizes="{IMAGE_SIZES}">'
+        for fmt, srcset in entry["srcsets"]
+    )
+    return f"<picture>{sources}{img}</picture>"
+
+
+_md = (
+    MarkdownIt("commonmark", {"html": False, "highlight": _highlight_code})
+    .enable(["table", "strikethrough"])
+    .use(tasklists_plugin)
+    .use(dollarmath_plugin)
+)
+_md.add_render_rule("image", _render_image)
+
+
+def _inline_text(token: Token) -> str:
+    return "".join(
+        child.content
+        for child in token.children or ()
+        if child.type in ("text", "code_inline", "math_inline")
+    )
+
+
+def _is_relative(src: str) -> bool:
+    # Absolute URLs, root paths, anchors and data URIs are left alone
+    if not src or src.startswith(("/", "#")):
+        return False
+    return not _SCHEME.match(src)
+
+
+def _apply_variants(image: Token, entry: Dict[str, Any]) -> None:
+    """Responsive markup for a stored image with generated variants"""
+    srcsets = [
+        (
+            fmt,
+            ", ".join(f"{v['url']} {v['width']}w" for v in variants),
+        )
+        for fmt, variants in entry["variants"].items()
+        if variants
+    ]
+    image.meta["variants"] = {"srcsets": srcsets}
+    # Intrinsic size lets the browser reserve space before loading
+    image.attrSet("width", str(entry["width"]))
+    image.attrSet("height", str(entry["height"]))
+    image.attrSet("decoding", "async")
+    if entry.get("placeholder"):
+        image.attrSet(
+            "style",
+            f"background:url({entry['placeholder']}) center/cover no-repeat",
+        )
+
+
+def render_markdown(
+    markdown: str,
+    image_base: Optional[str] = None,
+    images: Optional[Dict[str, Any]] = None,
+) -> RenderedMarkdown:
+    """
+    Render markdown to HTML (CommonMark + tables, strikethrough, task
+    lists, $math$ left for KaTeX). Headings get unique anchor ids and are
+    collected into a table of contents; relative image paths resolve
+    against `image_base`. Raw HTML in the source is escaped.
+
+    `images` maps paths relative to the content folder ("images/a.png")
+    to stored images (MediaStore.images_for): those point at their
+    immutable blob URL and, once variants exist, render as <picture> with
+    AVIF/WebP srcsets, intrinsic size and a blurred placeholder.
+    """
+    tokens = _md.parse(markdown)
+    toc: List[Dict[str, Any]] = []
+    seen: Dict[str, int] = {}
+
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open":
+            text = _inline_text(tokens[i + 1])
+            anchor = heading_id(text)
+            if anchor in seen:
+                seen[anchor] += 1
+                anchor = f"{anchor}-{seen[anchor]}"
+            else:
+                seen[anchor] = 0
+            token.attrSet("id", anchor)
+            level = int(token.tag[1])
+            if level <= TOC_MAX_LEVEL:
+                toc.append({"id": anchor, "text": text, "level": level})
+        elif token.type == "inline" and image_base:
+            for child in token.children or ():
+                if child.type != "image":
+                    continue
+                child.attrSet("loading", "lazy")
+                src = child.attrGet("src") or ""
+                if not _is_relative(src):
+                    continue
+                entry = (images or {}).get(posixpath.normpath(src))
+                if not entry:
+                    child.attrSet("src", urljoin(image_base, src))
+                    continue
+                child.attrSet("src", entry["src"])
+                if entry.get("variants"):
+                    _apply_variants(child, entry)
+
+    return RenderedMarkdown(_md.renderer.render(tokens, _md.options, {}), toc)
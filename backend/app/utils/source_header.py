@@ -0,0 +1,146 @@
+import re
+from typing import Any, Dict, Optional, Pattern
+
+# Extension → language display name
+EXT_MAP = {
+    "py": "Python",
+    "js": "JavaScript",
+    "ts": "TypeScript",
+    "cpp": "C++",
+    "java": "Java",
+    "go": "Go",
+    "rs": "Rust",
+    "c": "C",
+    "rb": "Ruby",
+    "swift": "Swift",
+    "kt": "Kotlin",
+}
+
+# Metadata tags are only honoured in the header region: the first
+# HEADER_LINES lines, capped at HEADER_MAX_BYTES for minified files.
+HEADER_LINES = 20
+HEADER_MAX_BYTES = 8 * 1024
+
+_C_STYLE = ("*/",)
+
+# Language → comment closers stripped from the end of a tag's value
+COMMENT_CLOSERS = {
+    "Python": ('"""', "'''"),
+    "Ruby": ("=end",),
+    "JavaScript": _C_STYLE,
+    "TypeScript": _C_STYLE,
+    "C++": _C_STYLE,
+    "Java": _C_STYLE,
+    "Go": _C_STYLE,
+    "Rust": _C_STYLE,
+    "C": _C_STYLE,
+    "Swift": _C_STYLE,
+    "Kotlin": _C_STYLE,
+}
+
+# One alternation per tag; each has its own named value group. Free-text
+# values run to the end of the line, less any closer ({end}).
+_TAGS = (
+    r"difficulty:[ \t]*(?P<difficulty>\w+)"
+    r"|tags:[ \t]*(?P<tags>[^\n]+?){end}"
+    r"|time:[ \t]*(?P<time>[^\n]+?){end}"
+    r"|space:[ \t]*(?P<space>[^\n]+?){end}"
+    r"|leetcode:[ \t]*(?P<leetcode>https?://\S+)"
+)
+
+_FIELDS = {
+    "difficulty": "difficulty",
+    "tags": "tags",
+    "time": "time_complexity",
+    "space": "space_complexity",
+    "leetcode": "leetcode_link",
+}
+
+
+def _alternation(markers) -> str:
+    # Longest first, so a longer marker wins over its own prefix
+    ordered = sorted(markers, key=len, reverse=True)
+    return "|".join(re.escape(m) for m in ordered)
+
+
+def _compile(closers=()) -> Pattern[str]:
+    # A tag may sit anywhere on a line ("# Two Sum @difficulty: Easy"),
+    # so nothing before the "@" is matched
+    closer = f"(?:{_alternation(closers)})?" if closers else ""
+    end = rf"(?=[ \t]*{closer}[ \t]*$)"
+    return re.compile(
+        "@(?:" + _TAGS.format(end=end) + ")",
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+
+_PATTERNS: Dict[str, Pattern[str]] = {
+    language: _compile(closers)
+    for language, closers in COMMENT_CLOSERS.items()
+}
+# Unknown languages strip any of the known closers
+_ANY_PATTERN = _compile(
+    {m for closers in COMMENT_CLOSERS.values() for m in closers}
+)
+
+
+def language_for(path: str) -> Optional[str]:
+    """Display language for a file path, or None if not in EXT_MAP."""
+    name = path.rsplit("/", 1)[-1]
+    ext = name.rsplit(".", 1)[1] if "." in name else ""
+    return EXT_MAP.get(ext)
+
+
+def default_metadata() -> Dict[str, Any]:
+    return {
+        "difficulty": "Medium",
+        "tags": [],
+        "time_complexity": None,
+        "space_complexity": None,
+        "leetcode_link": None,
+    }
+
+
+def header_region(source: str) -> str:
+    """The part of `source` that may carry metadata tags."""
+    lines = source[:HEADER_MAX_BYTES].split("\n", HEADER_LINES)
+    return "\n".join(lines[:HEADER_LINES])
+
+
+def header_complete(source: bytes) -> bool:
+    """True once a streamed body prefix covers the whole header region."""
+    return (
+        len(source) >= HEADER_MAX_BYTES
+        or source.count(b"\n") >= HEADER_LINES
+    )
+
+
+def extract_metadata(
+    source: str, language: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Extract `@difficulty`, `@tags`, `@time`, `@space` and `@leetcode`
+    tags from the header region of a solution file.
+
+    Only the header is scanned, with a single pattern built from the
+    comment closers of `language`. A tag may appear anywhere on a line;
+    the first occurrence of each wins and missing tags keep their
+    defaults.
+    """
+    metadata = default_metadata()
+    pattern = _PATTERNS.get(language, _ANY_PATTERN)
+
+    seen = set()
+    for match in pattern.finditer(header_region(source)):
+        for key, value in match.groupdict().items():
+            if value is None or key in seen:
+                continue
+            seen.add(key)
+            value = value.strip()
+            if key == "tags":
+                value = [t.strip() for t in value.split(",")]
+            metadata[_FIELDS[key]] = value
+        if len(seen) == len(_FIELDS):
+            break
+
+    return metadata
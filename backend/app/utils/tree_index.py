@@ -0,0 +1,91 @@
+import json
+from bisect import bisect_left
+from collections import OrderedDict
+from operator import itemgetter
+from threading import Lock
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+# Sorts after every character that can appear in a path
+_PATH_MAX = "\U0010ffff"
+
+
+class TreeRecord(NamedTuple):
+    """One tree item with only the fields the app uses."""
+
+    path: str
+    type: str
+    sha: str
+    size: Optional[int]
+
+
+class TreeIndex:
+    """
+    Sorted path index over a repository tree.
+
+    Prefix queries are two bisects over the sorted path list instead of a
+    scan of every entry. Serialized JSON bodies are memoized for the
+    JSON_MEMO_SIZE most recent prefixes (they come from ?prefix=, so
+    the memo must be bounded); a new tree SHA means a new index, so the
+    memo never goes stale.
+    """
+
+    JSON_MEMO_SIZE = 128
+
+    def __init__(self, sha: str, records: Iterable[TreeRecord]) -> None:
+        self.sha = sha
+        self._entries: List[TreeRecord] = sorted(records, key=itemgetter(0))
+        self._paths: List[str] = [e.path for e in self._entries]
+        # prefix → JSON body, least recently used first
+        self._json: "OrderedDict[str, bytes]" = OrderedDict()
+        self._json_lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, path: str) -> Optional[TreeRecord]:
+        i = bisect_left(self._paths, path)
+        if i < len(self._paths) and self._paths[i] == path:
+            return self._entries[i]
+        return None
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect_left(self._paths, prefix)
+        hi = bisect_left(self._paths, prefix + _PATH_MAX, lo)
+        return lo, hi
+
+    def query(self, prefix: str = "") -> List[TreeRecord]:
+        """
+        Entries whose path starts with `prefix`, plus the prefix
+        directory itself (e.g. "solutions" for "solutions/").
+        """
+        if not prefix:
+            return list(self._entries)
+
+        result = []
+        root = prefix.rstrip("/")
+        if root != prefix:
+            entry = self._lookup(root)
+            if entry is not None:
+                result.append(entry)
+
+        lo, hi = self._range(prefix)
+        result.extend(self._entries[lo:hi])
+        return result
+
+    def query_json(self, prefix: str = "") -> bytes:
+        """`{"tree": [...]}` for `prefix`, serialized once per index."""
+        with self._json_lock:
+            body = self._json.get(prefix)
+            if body is not None:
+                self._json.move_to_end(prefix)
+                return body
+
+        body = json.dumps(
+            {"tree": [e._asdict() for e in self.query(prefix)]},
+            separators=(",", ":"),
+        ).encode()
+        with self._json_lock:
+            self._json[prefix] = body
+            while len(self._json) > self.JSON_MEMO_SIZE:
+                self._json.popitem(last=False)
+        return body
@@ -0,0 +1,186 @@
+"""
+Benchmark content listings: OFFSET vs keyset pages, full vs sparse metajson.
+
+Seeds synthetic content rows (50k by default) spread over the three
+sections, then walks the published blog listing page by page under
+EXPLAIN ANALYZE:
+
+  offset  — the old query, ORDER BY published_at DESC LIMIT/OFFSET
+  keyset  — what ContentService.list_by_section now issues, continuing
+            after the last (published_at, id) of the previous page
+
+and compares the JSON size of a page with the full metajson against one
+projected to the card fields with jsonb_build_object.
+
+Everything happens inside one transaction that is rolled back at the end,
+so the target database is left untouched.
+
+Usage:
+    docker compose exec backend python3 scripts/bench_content_list.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_content_list.py \
+        --rows 50000 --page-size 100 --pages 50
+"""
+import sys
+import os
+import argparse
+import statistics
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+from sqlalchemy import text
+
+from app.database import engine
+
+SEED_SQL = """
+    INSERT INTO content_files (
+        id, section, filename, file_path, metajson, is_published,
+        published_at
+    )
+    SELECT
+        gen_random_uuid(),
+        (ARRAY['blog', 'project', 'case-study'])[1 + g % 3],
+        'bench-post-' || g || '.md',
+        'markdown/bench/Bench_Post_' || g || '/content.md',
+        jsonb_build_object(
+            'slug', 'bench-post-' || g,
+            'title', 'Bench post ' || g,
+            'summary', repeat('lorem ipsum ', 20),
+            'category', 'bench',
+            'tags', jsonb_build_array('tag-' || (g % 30)),
+            'notes', repeat('long-form frontmatter ', 100)
+        ),
+        g % 4 <> 0,
+        now() - (g || ' minutes')::interval
+    FROM generate_series(1, :rows) AS g
+"""
+
+COLUMNS = (
+    "id, section, filename, {metajson} AS metajson, is_published, "
+    "published_at, created_at"
+)
+WHERE = "section = 'blog' AND is_published = true"
+ORDER = "ORDER BY published_at DESC, id DESC"
+
+OFFSET_SQL = (
+    f"SELECT {COLUMNS} FROM content_files WHERE {WHERE} {ORDER} "
+    "LIMIT %(limit)s OFFSET %(offset)s"
+)
+KEYSET_SQL = (
+    f"SELECT {COLUMNS} FROM content_files WHERE {WHERE} "
+    "AND (published_at, id) < (%(published_at)s, %(id)s) "
+    f"{ORDER} LIMIT %(limit)s"
+)
+FIRST_SQL = (
+    f"SELECT {COLUMNS} FROM content_files WHERE {WHERE} {ORDER} "
+    "LIMIT %(limit)s"
+)
+
+FULL = "metajson"
+SPARSE = (
+    "jsonb_strip_nulls(jsonb_build_object("
+    "'slug', metajson->'slug', 'title', metajson->'title', "
+    "'summary', metajson->'summary', 'category', metajson->'category', "
+    "'tags', metajson->'tags', 'readTime', metajson->'readTime'))"
+)
+
+
+def _explain_ms(connection, statement: str, parameters) -> float:
+    row = connection.exec_driver_sql(
+        "EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters
+    ).fetchone()
+    plan = row[0][0]
+    return plan["Planning Time"] + plan["Execution Time"]
+
+
+def _page_bytes(connection, metajson: str, limit: int) -> int:
+    statement = FIRST_SQL.format(metajson=metajson)
+    return connection.exec_driver_sql(
+        f"SELECT coalesce(sum(octet_length(row_to_json(p)::text)), 0) "
+        f"FROM ({statement}) AS p",
+        {"limit": limit},
+    ).scalar()
+
+
+def _summary(label: str, timings: list) -> str:
+    return (
+        f"{label:<8} {statistics.median(timings):>10.3f} "
+        f"{timings[-1]:>12.3f}"
+    )
+
+
+def run_benchmark(rows: int, page_size: int, pages: int) -> None:
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    try:
+        print(f"Seeding {rows} content rows...")
+        connection.execute(text(SEED_SQL), {"rows": rows})
+        connection.execute(text("ANALYZE content_files"))
+
+        offset_ms, keyset_ms = [], []
+        last = None
+        for page in range(pages):
+            params = {"limit": page_size, "offset": page * page_size}
+            offset_ms.append(
+                _explain_ms(
+                    connection, OFFSET_SQL.format(metajson=FULL), params
+                )
+            )
+
+            if last is None:
+                statement = FIRST_SQL
+            else:
+                statement = KEYSET_SQL
+                params = {
+                    "limit": page_size,
+                    "published_at": last[0],
+                    "id": last[1],
+                }
+            keyset_ms.append(
+                _explain_ms(
+                    connection, statement.format(metajson=FULL), params
+                )
+            )
+            page_rows = connection.exec_driver_sql(
+                statement.format(metajson=FULL), params
+            ).fetchall()
+            if not page_rows:
+                break
+            last = (page_rows[-1].published_at, page_rows[-1].id)
+
+        full_bytes = _page_bytes(connection, FULL, page_size)
+        sparse_bytes = _page_bytes(connection, SPARSE, page_size)
+    finally:
+        transaction.rollback()
+        connection.close()
+
+    print()
+    print(f"{len(offset_ms)} pages of {page_size}")
+    print(f"{'paging':<8} {'median ms':>10} {'last page ms':>12}")
+    print("-" * 32)
+    print(_summary("offset", offset_ms))
+    print(_summary("keyset", keyset_ms))
+    print()
+    print(f"First page JSON: full metajson {full_bytes} bytes, "
+          f"card fields {sparse_bytes} bytes "
+          f"({100 * sparse_bytes / max(full_bytes, 1):.0f}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Content listing: OFFSET vs keyset, full vs sparse"
+    )
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=50)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.page_size, args.pages)
@@ -0,0 +1,150 @@
+"""
+Benchmark content slug lookups: JSONB expression vs indexed slug column.
+
+Seeds synthetic content rows (50k by default) spread over the three
+sections, then runs the same (section, slug) lookup two ways under
+EXPLAIN ANALYZE:
+
+  jsonb   — the old filter, metajson->>'slug' = :slug (GIN cannot serve it)
+  column  — what ContentService.get_by_slug now issues: the generated slug
+            column, served by the unique (section, slug) B-tree index
+
+Everything happens inside one transaction that is rolled back at the end,
+so the target database is left untouched.
+
+Usage:
+    docker compose exec backend python3 scripts/bench_content_slug.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_content_slug.py \
+        --rows 50000 --lookups 200 --repeat 5
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+from sqlalchemy import text
+
+from app.database import engine
+
+SECTIONS = ("blog", "project", "case-study")
+
+SEED_SQL = """
+    INSERT INTO content_files (
+        id, section, filename, file_path, metajson, is_published,
+        published_at
+    )
+    SELECT
+        gen_random_uuid(),
+        (ARRAY['blog', 'project', 'case-study'])[1 + g % 3],
+        'bench-post-' || g || '.md',
+        'markdown/bench/Bench_Post_' || g || '/content.md',
+        jsonb_build_object(
+            'slug', 'bench-post-' || g,
+            'title', 'Bench post ' || g,
+            'summary', repeat('lorem ipsum ', 20),
+            'category', 'bench',
+            'tags', jsonb_build_array('tag-' || (g % 30))
+        ),
+        g % 4 <> 0,
+        now() - (g || ' minutes')::interval
+    FROM generate_series(1, :rows) AS g
+"""
+
+JSONB_SQL = (
+    "SELECT * FROM content_files "
+    "WHERE section = %(section)s AND metajson->>'slug' = %(slug)s LIMIT 1"
+)
+
+COLUMN_SQL = (
+    "SELECT * FROM content_files "
+    "WHERE section = %(section)s AND slug = %(slug)s LIMIT 1"
+)
+
+
+def _index_names(node: dict) -> list:
+    names = []
+    if "Index Name" in node:
+        names.append(node["Index Name"])
+    for child in node.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def _explain(connection, statement: str, parameters, repeat: int):
+    """(best-of-repeat ms, plan root node, indexes used)"""
+    best = None
+    plan = None
+    for _ in range(repeat):
+        row = connection.exec_driver_sql(
+            "EXPLAIN (ANALYZE, FORMAT JSON) " + statement, parameters
+        ).fetchone()
+        plan = row[0][0]
+        ms = plan["Planning Time"] + plan["Execution Time"]
+        best = ms if best is None else min(best, ms)
+    return best, plan["Plan"]["Node Type"], _index_names(plan["Plan"])
+
+
+def run_benchmark(rows: int, lookups: int, repeat: int) -> None:
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    try:
+        print(f"Seeding {rows} content rows...")
+        connection.execute(text(SEED_SQL), {"rows": rows})
+        connection.execute(text("ANALYZE content_files"))
+
+        samples = [random.randint(1, rows) for _ in range(lookups)]
+        results = {"jsonb": [], "column": []}
+        plans = {}
+        for g in samples:
+            params = {
+                "section": SECTIONS[g % 3],
+                "slug": f"bench-post-{g}",
+            }
+            for label, statement in (
+                ("jsonb", JSONB_SQL),
+                ("column", COLUMN_SQL),
+            ):
+                ms, node, indexes = _explain(
+                    connection, statement, params, repeat
+                )
+                results[label].append(ms)
+                plans[label] = (node, indexes)
+    finally:
+        transaction.rollback()
+        connection.close()
+
+    print()
+    print(f"{'lookup':<8} {'median ms':>10} {'p95 ms':>9}  plan / indexes")
+    print("-" * 70)
+    for label, timings in results.items():
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        node, indexes = plans[label]
+        print(
+            f"{label:<8} {statistics.median(timings):>10.3f} {p95:>9.3f}"
+            f"  {node} / {', '.join(indexes) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Content slug lookup: JSONB filter vs slug column"
+    )
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.lookups, args.repeat)
@@ -0,0 +1,223 @@
+"""
+Benchmark DSA read-path query plans against a large synthetic dataset.
+
+Seeds synthetic problems (100k by default) plus six months of daily
+activity, captures every statement the DSA read paths issue, and re-runs
+each one under EXPLAIN ANALYZE. Everything happens inside one transaction
+that is rolled back at the end, so the target database is left untouched.
+
+Usage:
+    docker compose exec backend python3 scripts/bench_dsa_queries.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_dsa_queries.py \
+        --rows 100000 --repeat 5 --output dsa_plans.json
+
+Compare two --output files from before/after a change to spot plan
+regressions (a node type flipping to "Seq Scan" or an index disappearing).
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+from datetime import datetime, timezone
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.services.dsa_sync_service import DsaSyncService
+
+BENCH_PREFIX = "solutions/bench_topic_"
+
+SEED_PROBLEMS_SQL = """
+    INSERT INTO dsa_problems (
+        repo, path, filename, folder, language, difficulty, tags,
+        sha, first_seen_at, last_updated_at
+    )
+    SELECT
+        :repo,
+        :prefix || (g % :folders) || '/bench_problem_' || g || '.py',
+        'bench_problem_' || g || '.py',
+        'bench_topic_' || (g % :folders),
+        'Python',
+        (ARRAY['Easy', 'Medium', 'Hard', 'medium'])[1 + g % 4],
+        jsonb_build_array('tag_' || (g % 40), 'tag_' || (g % 7)),
+        md5(g::text),
+        ts - (random() * interval '30 days'),
+        ts
+    FROM (
+        SELECT g, now() - (random() * interval '365 days') AS ts
+        FROM generate_series(1, :rows) AS g
+    ) AS seed
+"""
+
+SEED_ACTIVITY_SQL = """
+    INSERT INTO dsa_daily_activity (
+        date, commit_count, problems_added, problems_modified
+    )
+    SELECT current_date - d, 1 + d % 5, d % 3, d % 2
+    FROM generate_series(0, 180) AS d
+    ON CONFLICT (date) DO NOTHING
+"""
+
+
+def _workloads():
+    """(label, callable) pairs covering every DSA read path."""
+    sample_path = f"{BENCH_PREFIX}0/bench_problem_40.py"
+    now = datetime.now(timezone.utc)
+    return [
+        ("get_stats", lambda s: s.get_stats()),
+        ("rebuild_topic_stats", lambda s: s._rebuild_topic_stats()),
+        (
+            "upsert_problem",
+            lambda s: s._upsert_problem(sample_path, "0" * 40, {}, now),
+        ),
+        ("list_problems", lambda s: s.list_problems()),
+        (
+            "list_problems_filtered",
+            lambda s: s.list_problems(
+                folder="bench_topic_3", difficulty="medium", tag="tag_3"
+            ),
+        ),
+        (
+            "list_problems_page2",
+            lambda s: s.list_problems(
+                sort="name",
+                cursor=s.list_problems(sort="name")["next_cursor"],
+                fields=["path", "filename"],
+            ),
+        ),
+        ("search_problems", lambda s: s.search_problems("problem_42")),
+    ]
+
+
+def _index_names(node: dict) -> list:
+    """Collect index names used anywhere in a JSON plan tree."""
+    names = []
+    if "Index Name" in node:
+        names.append(node["Index Name"])
+    for child in node.get("Plans", []):
+        names.extend(_index_names(child))
+    return names
+
+
+def _explain(connection, statement: str, parameters, repeat: int) -> dict:
+    timings = []
+    plan = None
+    for _ in range(repeat):
+        row = connection.exec_driver_sql(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement,
+            parameters,
+        ).fetchone()
+        plan = row[0][0]
+        timings.append(plan["Planning Time"] + plan["Execution Time"])
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "root_node": plan["Plan"]["Node Type"],
+        "indexes": sorted(set(_index_names(plan["Plan"]))),
+        "plan": plan["Plan"],
+    }
+
+
+def run_benchmark(rows: int, folders: int, repeat: int) -> list:
+    connection = engine.connect()
+    transaction = connection.begin()
+    results = []
+
+    try:
+        service = DsaSyncService(Session(bind=connection))
+
+        print(f"Seeding {rows} problems across {folders} folders...")
+        connection.execute(
+            text(SEED_PROBLEMS_SQL),
+            {
+                "repo": service.repo,
+                "prefix": BENCH_PREFIX,
+                "rows": rows,
+                "folders": folders,
+            },
+        )
+        connection.execute(text(SEED_ACTIVITY_SQL))
+        connection.execute(text("ANALYZE dsa_problems"))
+        connection.execute(text("ANALYZE dsa_daily_activity"))
+
+        for label, workload in _workloads():
+            captured = []
+
+            def _capture(conn, cursor, statement, parameters, context, many):
+                if statement.lstrip().upper().startswith("SELECT"):
+                    captured.append((statement, parameters))
+
+            event.listen(engine, "before_cursor_execute", _capture)
+            try:
+                workload(service)
+                service.db.flush()
+            finally:
+                event.remove(engine, "before_cursor_execute", _capture)
+
+            for i, (statement, parameters) in enumerate(captured, start=1):
+                result = _explain(connection, statement, parameters, repeat)
+                result["query"] = f"{label}[{i}]"
+                result["sql"] = " ".join(statement.split())
+                results.append(result)
+    finally:
+        transaction.rollback()
+        connection.close()
+
+    return results
+
+
+def print_report(results: list) -> None:
+    print()
+    print(f"{'query':<26} {'median ms':>10} {'max ms':>9}  plan / indexes")
+    print("-" * 90)
+    for r in results:
+        indexes = ", ".join(r["indexes"]) or "-"
+        print(
+            f"{r['query']:<26} {r['median_ms']:>10.3f} {r['max_ms']:>9.3f}"
+            f"  {r['root_node']} / {indexes}"
+        )
+        print(f"{'':<26} {r['sql'][:110]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN ANALYZE every DSA read query on seeded data"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--folders", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--output", type=str, help="Write full plans as JSON to this path"
+    )
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.folders, args.repeat)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "rows": args.rows,
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "queries": results,
+                },
+                f,
+                indent=2,
+                default=str,
+            )
+        print(f"\nPlans written to {args.output}")
@@ -0,0 +1,220 @@
+"""
+Micro-benchmark solution metadata extraction on large files.
+
+For synthetic Python and C++ solutions of increasing size, compares:
+
+  legacy  — the old extractor: split the whole file on newlines, then five
+            separate re.search calls over the first 20 lines
+  header  — source_header.extract_metadata (header region only, one
+            combined per-language pattern)
+
+and, per fetch path served through an in-process httpx transport:
+
+  json    — contents API JSON: download, base64-decode, extract (old sync)
+  raw     — GitHubService.fetch_source(max_bytes=0): raw media type,
+            response closed once the header region has arrived
+
+Usage:
+    docker compose exec backend python3 scripts/bench_metadata_extract.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_metadata_extract.py \
+        --sizes 4096 1048576 16777216 --repeat 20
+"""
+import sys
+import os
+import argparse
+import asyncio
+import base64
+import json
+import re
+import time
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+import httpx
+
+from app.services.github_service import GitHubService
+from app.utils.source_header import extract_metadata, language_for
+
+CHUNK_SIZE = 16 * 1024
+
+HEADERS = {
+    "py": (
+        '"""\n@difficulty: Medium\n@tags: array, two pointers\n'
+        "@time: O(n)\n@space: O(1)\n"
+        "@leetcode: https://leetcode.com/problems/two-sum/\n\"\"\"\n"
+    ),
+    "cpp": (
+        "/*\n * @difficulty: Hard\n * @tags: dp, graphs\n"
+        " * @time: O(n log n)\n * @space: O(n)\n"
+        " * @leetcode: https://leetcode.com/problems/two-sum/\n */\n"
+    ),
+}
+
+BODY_LINE = {
+    "py": "    total += values[i] * weights[i]  # accumulate\n",
+    "cpp": "    total += values[i] * weights[i];  // accumulate\n",
+}
+
+
+def build_source(ext: str, size: int) -> str:
+    header = HEADERS[ext]
+    line = BODY_LINE[ext]
+    return header + line * max(0, (size - len(header)) // len(line))
+
+
+def legacy_extract(code_content: str) -> dict:
+    """The extractor this benchmark replaces, kept verbatim."""
+    metadata = {
+        "difficulty": "Medium",
+        "tags": [],
+        "time_complexity": None,
+        "space_complexity": None,
+        "leetcode_link": None,
+    }
+
+    header = "\n".join(code_content.split("\n")[:20])
+
+    patterns = {
+        "difficulty": r"@difficulty:\s*(\w+)",
+        "tags": r"@tags:\s*(.+)",
+        "time": r"@time:\s*(.+)",
+        "space": r"@space:\s*(.+)",
+        "leetcode": r"@leetcode:\s*(https?://\S+)",
+    }
+
+    for key, pattern in patterns.items():
+        match = re.search(pattern, header, re.IGNORECASE)
+        if match:
+            value = match.group(1).strip()
+            if key == "tags":
+                metadata["tags"] = [t.strip() for t in value.split(",")]
+            elif key == "time":
+                metadata["time_complexity"] = value
+            elif key == "space":
+                metadata["space_complexity"] = value
+            elif key == "leetcode":
+                metadata["leetcode_link"] = value
+            else:
+                metadata[key] = value
+
+    return metadata
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median milliseconds per call."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def contents_body(raw: bytes) -> bytes:
+    """A GitHub-shaped contents API response for `raw`."""
+    return json.dumps({
+        "sha": "0" * 40,
+        "size": len(raw),
+        "encoding": "base64",
+        "content": base64.encodebytes(raw).decode(),
+    }).encode()
+
+
+def make_client(
+    raw: bytes, contents: bytes, sent: list
+) -> httpx.AsyncClient:
+    def handler(request):
+        body = raw if "raw" in request.headers["accept"] else contents
+
+        async def chunks():
+            for i in range(0, len(body), CHUNK_SIZE):
+                sent[0] += min(CHUNK_SIZE, len(body) - i)
+                yield body[i:i + CHUNK_SIZE]
+
+        return httpx.Response(200, content=chunks())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def fetch_json(client: httpx.AsyncClient, path: str) -> dict:
+    resp = await client.get(
+        f"https://api.github.com/repos/o/r/contents/{path}",
+        headers={"Accept": "application/vnd.github.v3+json"},
+    )
+    code = base64.b64decode(resp.json()["content"]).decode("utf-8")
+    return legacy_extract(code)
+
+
+async def fetch_raw(client: httpx.AsyncClient, path: str) -> dict:
+    service = GitHubService()
+    return (await service.fetch_source(client, path)).metadata
+
+
+def bench_fetch(source: str, path: str, fetch, repeat: int):
+    raw = source.encode()
+    contents = contents_body(raw)
+    sent = [0]
+
+    async def run():
+        async with make_client(raw, contents, sent) as client:
+            for _ in range(repeat):
+                await fetch(client, path)
+
+    start = time.perf_counter()
+    asyncio.run(run())
+    elapsed = (time.perf_counter() - start) * 1000 / repeat
+    return elapsed, sent[0] / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Metadata extraction and header-only fetch benchmark"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[4 * 1024, 1024 * 1024, 16 * 1024 * 1024],
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'file':<14} {'legacy ms':>10} {'header ms':>10} "
+        f"{'json ms':>9} {'json KB':>9} {'raw ms':>8} {'raw KB':>8}"
+    )
+    for ext in HEADERS:
+        for size in args.sizes:
+            source = build_source(ext, size)
+            path = f"solutions/bench/problem.{ext}"
+            language = language_for(path)
+
+            assert legacy_extract(source) == extract_metadata(
+                source, language
+            )
+
+            legacy_ms = time_call(lambda: legacy_extract(source), args.repeat)
+            header_ms = time_call(
+                lambda: extract_metadata(source, language), args.repeat
+            )
+            json_ms, json_bytes = bench_fetch(
+                source, path, fetch_json, args.repeat
+            )
+            raw_ms, raw_bytes = bench_fetch(
+                source, path, fetch_raw, args.repeat
+            )
+            print(
+                f"{ext + ' ' + str(size // 1024) + 'KB':<14} "
+                f"{legacy_ms:>10.3f} {header_ms:>10.3f} "
+                f"{json_ms:>9.2f} {json_bytes / 1024:>9.0f} "
+                f"{raw_ms:>8.2f} {raw_bytes / 1024:>8.0f}"
+            )
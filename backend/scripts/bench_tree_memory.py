@@ -0,0 +1,136 @@
+"""
+Measure peak memory of repository-tree ingestion on a synthetic tree.
+
+Serves a synthetic GitHub `git/trees?recursive=1` response (200k entries
+by default, with the URLs and modes GitHub includes) through an in-process
+httpx transport in 64KB chunks, then compares:
+
+  json    — resp.json() and keeping the full GitHub dicts (old behaviour)
+  stream  — GitHubService._stream_tree() into compact TreeRecords + index
+
+Usage:
+    docker compose exec backend python3 scripts/bench_tree_memory.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_tree_memory.py \
+        --entries 200000 --folders 500
+"""
+import sys
+import os
+import argparse
+import asyncio
+import gc
+import hashlib
+import json
+import time
+import tracemalloc
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+import httpx
+
+from app.services.github_service import GitHubService
+from app.utils.tree_index import TreeIndex, TreeRecord
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_tree_body(entries: int, folders: int) -> bytes:
+    """A GitHub-shaped recursive tree response."""
+    api = "https://api.github.com/repos/owner/repo/git"
+    tree = [{
+        "path": "solutions", "mode": "040000", "type": "tree",
+        "sha": hashlib.sha1(b"solutions").hexdigest(),
+        "url": f"{api}/trees/0",
+    }]
+    for f in range(folders):
+        sha = hashlib.sha1(f"dir{f}".encode()).hexdigest()
+        tree.append({
+            "path": f"solutions/topic_{f}", "mode": "040000", "type": "tree",
+            "sha": sha, "url": f"{api}/trees/{sha}",
+        })
+    for i in range(entries - folders - 1):
+        sha = hashlib.sha1(str(i).encode()).hexdigest()
+        tree.append({
+            "path": f"solutions/topic_{i % folders}/problem_{i}.py",
+            "mode": "100644", "type": "blob", "sha": sha,
+            "size": 800 + i % 4000, "url": f"{api}/blobs/{sha}",
+        })
+    return json.dumps({
+        "sha": hashlib.sha1(b"root").hexdigest(),
+        "url": f"{api}/trees/root",
+        "tree": tree,
+        "truncated": False,
+    }).encode()
+
+
+def make_client(body: bytes) -> httpx.AsyncClient:
+    async def chunks():
+        for i in range(0, len(body), CHUNK_SIZE):
+            yield body[i:i + CHUNK_SIZE]
+
+    def handler(request):
+        return httpx.Response(200, content=chunks())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def ingest_json(body: bytes):
+    async with make_client(body) as client:
+        resp = await client.get("https://api.github.com/tree")
+        data = resp.json()
+        return data["tree"]
+
+
+async def ingest_stream(body: bytes):
+    service = GitHubService()
+    async with make_client(body) as client:
+        sha, _, records = await service._stream_tree(client, "main", True)
+    return TreeIndex(sha, records)
+
+
+def measure(label: str, coro_fn, body: bytes) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = asyncio.run(coro_fn(body))
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "label": label,
+        "peak_mb": peak / 1024 / 1024,
+        "retained_mb": retained / 1024 / 1024,
+        "seconds": elapsed,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Peak memory of tree ingestion on a synthetic tree"
+    )
+    parser.add_argument("--entries", type=int, default=200_000)
+    parser.add_argument("--folders", type=int, default=500)
+    args = parser.parse_args()
+
+    body = build_tree_body(args.entries, args.folders)
+    print(
+        f"Synthetic tree: {args.entries} entries, "
+        f"{len(body) / 1024 / 1024:.1f} MB JSON "
+        f"(record fields: {', '.join(TreeRecord._fields)})\n"
+    )
+
+    print(f"{'mode':<8} {'peak MB':>9} {'retained MB':>12} {'seconds':>8}")
+    for label, fn in (("json", ingest_json), ("stream", ingest_stream)):
+        r = measure(label, fn, body)
+        print(
+            f"{r['label']:<8} {r['peak_mb']:>9.1f} "
+            f"{r['retained_mb']:>12.1f} {r['seconds']:>8.2f}"
+        )
@@ -0,0 +1,137 @@
+"""
+Measure read latency while content uploads are in flight.
+
+Logs in as an admin, samples GET /content/blog latency on its own for a
+few seconds (baseline), then samples it again while uploading markdown
+files whose frontmatter is large enough to make YAML parsing expensive.
+Every upload it creates is deleted afterwards.
+
+Reads should stay near the baseline: uploads parse, commit and write in
+content-write threads (see run_content_write), not on the event loop.
+Point it at a single worker (uvicorn without --workers) for the clearest
+signal; with several workers reads and uploads may land apart.
+
+Usage:
+    docker compose exec backend python3 scripts/bench_upload_concurrency.py \
+        --email admin@example.com --password secret
+
+Or with custom values:
+    docker compose exec backend python3 scripts/bench_upload_concurrency.py \
+        --email admin@example.com --password secret \
+        --base-url http://localhost:8000/api/v1 --uploads 8 --tags 20000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def _markdown(tags: int) -> bytes:
+    slug = f"bench-upload-{uuid.uuid4().hex[:12]}"
+    tag_lines = "\n".join(f"  - tag-{i}" for i in range(tags))
+    return (
+        f"---\nslug: {slug}\ntitle: {slug}\nsummary: Upload benchmark\n"
+        f"category: bench\ntags:\n{tag_lines}\n---\n\n# Body\n"
+    ).encode()
+
+
+async def _sample_reads(
+    client: httpx.AsyncClient, stop: asyncio.Event, interval: float
+) -> list:
+    timings = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get("/content/blog")
+        response.raise_for_status()
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return timings
+
+
+def _report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{label:<16} {len(timings):>6} {statistics.median(timings):>10.1f}"
+        f" {p95:>9.1f} {timings[-1]:>9.1f}"
+    )
+
+
+async def run_benchmark(args) -> None:
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=120
+    ) as client:
+        login = await client.post(
+            "/auth/login",
+            json={"email": args.email, "password": args.password},
+        )
+        login.raise_for_status()
+        auth = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(
+            _sample_reads(client, stop, args.interval)
+        )
+        await asyncio.sleep(args.baseline)
+        stop.set()
+        baseline = await sampler
+
+        async def upload(i: int):
+            response = await client.post(
+                "/content/upload",
+                params={"section": "blog"},
+                files={"file": (f"bench-{i}.md", _markdown(args.tags))},
+                headers=auth,
+            )
+            response.raise_for_status()
+            return response.json()["id"]
+
+        print(f"Uploading {args.uploads} files ({args.tags} tags each)...")
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(
+            _sample_reads(client, stop, args.interval)
+        )
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(upload(i) for i in range(args.uploads)),
+            return_exceptions=True,
+        )
+        upload_seconds = time.perf_counter() - started
+        stop.set()
+        during = await sampler
+
+        created = [r for r in results if isinstance(r, str)]
+        for content_id in created:
+            await client.delete(f"/content/{content_id}", headers=auth)
+        failures = [r for r in results if not isinstance(r, str)]
+
+    print()
+    print(f"{len(created)} uploads in {upload_seconds:.1f}s, "
+          f"{len(failures)} failed")
+    for failure in failures[:3]:
+        print(f"  {failure}")
+    print()
+    print(f"{'GET /content/blog':<16} {'n':>6} {'median ms':>10} "
+          f"{'p95 ms':>9} {'max ms':>9}")
+    print("-" * 54)
+    _report("baseline", baseline)
+    _report("during uploads", during)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Read latency during concurrent content uploads"
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--tags", type=int, default=20_000)
+    parser.add_argument("--baseline", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.02)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args))
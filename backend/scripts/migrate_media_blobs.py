@@ -0,0 +1,183 @@
+"""
+Move existing post images into the content-addressed blob store.
+
+Images uploaded before the blob store are plain files in
+markdown/<section>/<folder>/images/. For every post, each such file is
+hashed, stored once under media/blobs/ (identical images across posts
+share a blob), mapped to the post in content_images and replaced by a
+symlink to its blob, so images/<name> URLs keep working. Files that are
+already links are skipped, so the script can be re-run safely.
+
+With --variants, responsive variants are generated inline for every
+blob that lacks them; otherwise they are made on the next upload.
+With --gc, unreferenced blobs past the grace period are collected too.
+
+Usage:
+    docker compose exec backend python3 scripts/migrate_media_blobs.py
+
+Or with custom values:
+    docker compose exec backend python3 scripts/migrate_media_blobs.py \
+        --variants --gc --dry-run
+"""
+import sys
+import os
+import argparse
+import hashlib
+import mimetypes
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add backend to path FIRST (before importing app modules)
+if os.path.exists('/app/app'):
+    sys.path.insert(0, '/app')
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    backend_path = os.path.abspath(os.path.join(script_dir, '..'))
+    sys.path.insert(0, backend_path)
+
+from app.config import get_settings
+from app.database import SessionLocal
+from app.models.content_file import ContentFile
+from app.models.media import MediaBlob
+from app.services.file_storage import (
+    BLOBS_DIR,
+    CHUNK_SIZE,
+    FILE_MODE,
+    SpooledUpload,
+    file_storage,
+)
+from app.services.image_service import needs_variants
+from app.services.media_store import MediaStore
+from app.utils.image_variants import make_variants
+
+settings = get_settings()
+
+
+def _spool(source: Path, incoming: Path) -> SpooledUpload:
+    """Copy `source` into the blob store's spool dir, hashing it"""
+    fd, tmp = tempfile.mkstemp(dir=incoming, prefix=".upload-")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out, source.open("rb") as src:
+            while chunk := src.read(CHUNK_SIZE):
+                size += len(chunk)
+                digest.update(chunk)
+                out.write(chunk)
+        os.chmod(tmp, FILE_MODE)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return SpooledUpload(Path(tmp), size, digest.hexdigest())
+
+
+def migrate_images(db, dry_run: bool) -> int:
+    media_root = Path(settings.MEDIA_ROOT)
+    incoming = media_root / BLOBS_DIR / ".incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    store = MediaStore(db)
+    migrated = 0
+
+    for content in db.query(ContentFile).order_by(ContentFile.created_at):
+        images_dir = (media_root / content.file_path).parent / "images"
+        if not images_dir.is_dir():
+            continue
+        files = sorted(
+            path
+            for path in images_dir.iterdir()
+            if path.is_file()
+            and not path.is_symlink()
+            and not path.name.startswith(".")
+        )
+        for path in files:
+            print(f"  {content.section}/{content.slug}: {path.name}")
+            migrated += 1
+            if dry_run:
+                continue
+            content_type = (
+                mimetypes.guess_type(path.name)[0]
+                or "application/octet-stream"
+            )
+            spooled = _spool(path, incoming)
+            try:
+                attached = store.attach(
+                    content.id, path.name, spooled, content_type
+                )
+                content.media_version = ContentFile.media_version + 1
+                db.commit()
+            except BaseException:
+                db.rollback()
+                spooled.tmp.unlink(missing_ok=True)
+                raise
+            # The original goes only once its blob is committed
+            file_storage.link_image(
+                content.file_path, path.name, attached.blob_path
+            )
+
+    shutil.rmtree(incoming, ignore_errors=True)
+    return migrated
+
+
+def generate_variants(db) -> int:
+    generated = 0
+    for blob in db.query(MediaBlob).filter(MediaBlob.refcount > 0):
+        if not needs_variants(blob.content_type, blob.variants):
+            continue
+        blob_path = file_storage.blob_path(blob.sha256, blob.ext)
+        try:
+            blob.variants = make_variants(
+                os.path.join(settings.MEDIA_ROOT, blob_path),
+                settings.MEDIA_ROOT,
+                os.path.dirname(blob_path),
+                blob.sha256,
+                tuple(settings.IMAGE_VARIANT_WIDTHS),
+                tuple(settings.IMAGE_VARIANT_FORMATS),
+            )
+        except Exception as e:
+            print(f"  {blob_path}: no variants ({e})")
+            continue
+        print(f"  {blob_path}: {blob.variants['width']}px")
+        generated += 1
+    # Renders pick up the srcsets through a new media_version
+    db.query(ContentFile).update(
+        {ContentFile.media_version: ContentFile.media_version + 1},
+        synchronize_session=False,
+    )
+    db.commit()
+    return generated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move post images into the content-addressed blob store"
+    )
+    parser.add_argument(
+        "--variants",
+        action="store_true",
+        help="generate missing responsive variants inline",
+    )
+    parser.add_argument(
+        "--gc",
+        action="store_true",
+        help="collect unreferenced blobs past the grace period",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="list the images that would be moved",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print("Migrating post images...")
+        count = migrate_images(db, args.dry_run)
+        print(f"{count} image(s) {'to move' if args.dry_run else 'moved'}")
+        if args.variants and not args.dry_run:
+            print("Generating variants...")
+            print(f"{generate_variants(db)} blob(s) with new variants")
+        if args.gc and not args.dry_run:
+            print(f"{MediaStore(db).collect_garbage()} blob(s) collected")
+    finally:
+        db.close()
@@ -0,0 +1,48 @@
+"""An incremental sync that aborts must not move the commit cursor."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.exceptions import RateLimitError
+from app.services import dsa_sync_service
+from app.services.dsa_sync_service import DsaSyncService, SyncRun
+
+
+class FakeGitHub:
+    def __init__(self, repo):
+        self.repo = repo
+
+    @asynccontextmanager
+    async def client(self):
+        yield None
+
+    async def list_commits(self, client, params):
+        if params["page"] > 1:
+            return []
+        return [
+            SimpleNamespace(
+                sha=sha, date="2026-10-18T10:00:00Z", message="solve"
+            )
+            for sha in ("new", "older")
+        ]
+
+    async def get_commit_files(self, client, sha):
+        if sha == "older":
+            # The shared request budget is spent
+            raise RateLimitError("reserve reached")
+        return []
+
+
+def test_rate_limit_keeps_the_previous_cursor(monkeypatch):
+    monkeypatch.setattr(dsa_sync_service, "get_github_service", FakeGitHub)
+    service = DsaSyncService(None, "owner/one")
+    state = SimpleNamespace(last_commit_sha="oldest", last_synced_at=None)
+    run = SyncRun(service.repo, "incremental", "test")
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(service._incremental_sync("solutions/", state, run))
+
+    assert state.last_commit_sha == "oldest"
+    assert state.last_synced_at is None
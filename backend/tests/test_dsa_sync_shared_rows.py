@@ -0,0 +1,148 @@
+"""
+Repos syncing concurrently must not hold shared row locks across awaits.
+
+The fake session below models Postgres row locks on the shared tables
+(dsa_daily_activity by date, dsa_blobs by sha): writing a row another
+open transaction holds raises instead of blocking, which is what would
+freeze the event loop inside psycopg2.
+"""
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import dsa_sync_service
+from app.services.dsa_sync_service import DsaSyncService, SyncRun
+
+SHARED_KEYS = {"dsa_daily_activity": "date", "dsa_blobs": "sha"}
+
+
+class RowLocked(Exception):
+    pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.locks = {}
+        self.activity = {}
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+        self.held = set()
+        self.pending_activity = []
+
+    def query(self, *args):
+        return self
+
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return None
+
+    def scalar(self):
+        return None
+
+    def execute(self, stmt):
+        table = getattr(getattr(stmt, "table", None), "name", None)
+        key = SHARED_KEYS.get(table)
+        if key is None:
+            return None
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = {}
+        for name, value in params.items():
+            match = re.fullmatch(r"(\w+?)(?:_m(\d+))?", name)
+            column, index = match.group(1), match.group(2) or "0"
+            rows.setdefault(index, {})[column] = value
+        for row in rows.values():
+            lock = (table, row[key])
+            owner = self.database.locks.get(lock)
+            if owner is not None and owner is not self:
+                raise RowLocked(lock)
+            self.database.locks[lock] = self
+            self.held.add(lock)
+            if table == "dsa_daily_activity":
+                self.pending_activity.append(
+                    (row["date"], row["commit_count"])
+                )
+        return None
+
+    def commit(self):
+        for day, count in self.pending_activity:
+            self.database.activity[day] = (
+                self.database.activity.get(day, 0) + count
+            )
+        self.rollback()
+
+    def rollback(self):
+        for lock in self.held:
+            self.database.locks.pop(lock, None)
+        self.held.clear()
+        self.pending_activity.clear()
+
+
+class FakeGitHub:
+    def __init__(self, repo):
+        self.repo = repo
+
+    @asynccontextmanager
+    async def client(self):
+        yield None
+
+    async def list_commits(self, client, params):
+        await asyncio.sleep(0)
+        if params["page"] > 1:
+            return []
+        return [
+            SimpleNamespace(
+                sha=f"{self.repo}-{i}",
+                date="2026-10-18T10:00:00Z",
+                message="solve",
+            )
+            for i in range(2)
+        ]
+
+    async def get_commit_files(self, client, sha):
+        await asyncio.sleep(0)
+        return [
+            SimpleNamespace(
+                filename="solutions/arrays/two_sum.py",
+                status="modified",
+                sha="b1",
+            )
+        ]
+
+
+async def _sync(service):
+    run = SyncRun(service.repo, "full", "test")
+    since = datetime(2026, 4, 21, tzinfo=timezone.utc)
+    await service._apply_commit_history("solutions/", since, run)
+    service._upsert_blob("shared-blob", "print('same file in both')")
+    await asyncio.sleep(0)
+    service._write_shared_rows()
+    service.db.commit()
+    return run
+
+
+def test_repos_sharing_a_date_and_blob_sync_concurrently(monkeypatch):
+    monkeypatch.setattr(dsa_sync_service, "get_github_service", FakeGitHub)
+    database = FakeDatabase()
+    services = [
+        DsaSyncService(FakeSession(database), repo)
+        for repo in ("owner/one", "owner/two")
+    ]
+
+    async def main():
+        return await asyncio.gather(*(_sync(s) for s in services))
+
+    runs = asyncio.run(main())
+
+    assert [run.errors for run in runs] == [[], []]
+    # Two commits per repo, all on the same IST day
+    assert list(database.activity.values()) == [4]
+    assert database.locks == {}
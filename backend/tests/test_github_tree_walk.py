@@ -0,0 +1,44 @@
+"""Walking a truncated tree by subtree SHA."""
+import asyncio
+
+from app.services.github_service import GitHubService
+from app.utils.tree_index import TreeRecord
+
+
+def _tree(path, sha):
+    return TreeRecord(path, "tree", sha, None)
+
+
+def _blob(path, sha):
+    return TreeRecord(path, "blob", sha, 10)
+
+
+def test_identical_subdirectories_are_listed_once(monkeypatch):
+    # solutions/ holds two directories with the same contents, so the
+    # same tree SHA ("same") under two paths
+    listings = {
+        ("root", False): [_tree("solutions", "sol")],
+        ("sol", True): [
+            _tree("a", "same"),
+            _blob("a/f.py", "f"),
+            _tree("b", "same"),
+            _blob("b/f.py", "f"),
+        ],
+    }
+
+    async def fetch_subtree(client, sha, recursive, semaphore):
+        return False, listings[(sha, recursive)]
+
+    service = GitHubService("owner/repo")
+    monkeypatch.setattr(service, "_fetch_subtree", fetch_subtree)
+
+    records = asyncio.run(service._walk_tree(None, "root"))
+
+    assert sorted(r.path for r in records) == [
+        "solutions",
+        "solutions/a",
+        "solutions/a/f.py",
+        "solutions/b",
+        "solutions/b/f.py",
+    ]
+    assert service._subtree_cache["same"] == [_blob("f.py", "f")]
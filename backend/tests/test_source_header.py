@@ -0,0 +1,40 @@
+"""Metadata tags in solution file headers."""
+from app.utils.source_header import extract_metadata
+
+
+def test_tag_after_text_on_the_same_line():
+    source = "# Two Sum @difficulty: Easy\n# @tags: array, hash map\n"
+
+    metadata = extract_metadata(source, "Python")
+
+    assert metadata["difficulty"] == "Easy"
+    assert metadata["tags"] == ["array", "hash map"]
+
+
+def test_comment_closers_are_not_part_of_the_value():
+    source = (
+        "/* @difficulty: Hard */\n"
+        "/* @time: O(n log n) */\n"
+        " * @space: O(1)\n"
+        "// @leetcode: https://leetcode.com/problems/two-sum/\n"
+    )
+
+    metadata = extract_metadata(source, "Java")
+
+    assert metadata["difficulty"] == "Hard"
+    assert metadata["time_complexity"] == "O(n log n)"
+    assert metadata["space_complexity"] == "O(1)"
+    assert (
+        metadata["leetcode_link"]
+        == "https://leetcode.com/problems/two-sum/"
+    )
+
+
+def test_first_tag_wins_and_only_the_header_is_scanned():
+    header = '"""@difficulty: Easy"""\n# @difficulty: Hard\n'
+    source = header + "\n" * 20 + "# @tags: late\n"
+
+    metadata = extract_metadata(source, "Python")
+
+    assert metadata["difficulty"] == "Easy"
+    assert metadata["tags"] == []
@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { api } from '@/lib/api'
+import { api, CARD_FIELDS } from '@/lib/api'
 import { Container } from '@/components/layout/Container'
 import { ContentCard } from '@/components/content/ContentCard'
 
@@ -12,7 +12,7 @@ export default function BlogPage() {
   useEffect(() => {
     async function fetchPosts() {
       try {
-        const data = await api.content.list('blog')
+        const data = await api.content.list('blog', true, CARD_FIELDS)
         setPosts(data)
       } catch (error) {
         console.error('Failed to fetch blog posts:', error)
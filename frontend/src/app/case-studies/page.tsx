@@ -1,7 +1,7 @@
 'use client'
 
 import { useState, useEffect } from 'react'
-import { api } from '@/lib/api'
+import { api, CARD_FIELDS } from '@/lib/api'
 import { Container } from '@/components/layout/Container'
 import { ContentCard } from '@/components/content/ContentCard'
 
@@ -12,7 +12,7 @@ export default function CaseStudiesPage() {
   useEffect(() => {
     async function fetchCaseStudies() {
       try {
-        const data = await api.content.list('case-study')
+        const data = await api.content.list('case-study', true, CARD_FIELDS)
         setCaseStudies(data)
       } catch (error) {
         console.error('Failed to fetch case studies:', error)
@@ -4,7 +4,11 @@ import { useState, useEffect } from 'react'
 import { useParams } from 'next/navigation'
 import { Prism as SyntaxHighlighter } from 'react-syntax-highlighter'
 import { oneDark, oneLight } from 'react-syntax-highlighter/dist/esm/styles/prism'
-import { fetchFileContent, type FileDetail } from '@/lib/github'
+import {
+  fetchFileContent,
+  HIGHLIGHT_CSS_URL,
+  type FileDetail,
+} from '@/lib/github'
 import { MarkdownRenderer } from '@/components/content/MarkdownRenderer'
 
 const LANGUAGE_MAP: Record<string, string> = {
@@ -56,7 +60,9 @@ export default function ProblemDetailPage() {
     async function loadProblem() {
       try {
         setLoading(true)
-        const data = await fetchFileContent(filePath)
+        // Markdown renders client-side; code comes pre-highlighted
+        const ext = filePath.split('.').pop() || ''
+        const data = await fetchFileContent(filePath, !MD_EXTENSIONS.has(ext))
         setProblem(data)
         setError(null)
       } catch {
@@ -284,18 +290,26 @@ export default function ProblemDetailPage() {
               {copied ? 'Copied!' : 'Copy'}
             </button>
           </div>
-          <SyntaxHighlighter
-            language={LANGUAGE_MAP[problem.language] || 'text'}
-            style={isDark ? oneDark : oneLight}
-            showLineNumbers
-            customStyle={{
-              margin: 0,
-              borderRadius: 0,
-              fontSize: '13px',
-            }}
-          >
-            {problem.code}
-          </SyntaxHighlighter>
+          {problem.html ? (
+            <>
+              <link rel="stylesheet" href={HIGHLIGHT_CSS_URL} />
+              {/* Rendered and escaped by the backend (Pygments) */}
+              <div dangerouslySetInnerHTML={{ __html: problem.html }} />
+            </>
+          ) : (
+            <SyntaxHighlighter
+              language={LANGUAGE_MAP[problem.language] || 'text'}
+              style={isDark ? oneDark : oneLight}
+              showLineNumbers
+              customStyle={{
+                margin: 0,
+                borderRadius: 0,
+                fontSize: '13px',
+              }}
+            >
+              {problem.code}
+            </SyntaxHighlighter>
+          )}
         </div>
       )}
     </div>
@@ -1,7 +1,7 @@
 'use client'
 
-import { useState, useEffect } from 'react'
-import { fetchStats, type DsaStats } from '@/lib/github'
+import { useState, useEffect, useRef } from 'react'
+import { fetchStats, subscribeDsaEvents, type DsaStats } from '@/lib/github'
 import RecentFiles from './components/RecentFiles'
 import StatCards from './components/StatCards'
 import ActivityHeatmap from './components/ActivityHeatmap'
@@ -29,6 +29,24 @@ export default function DSAPage() {
     load()
   }, [])
 
+  // Live updates: refetch only when a sync reports a newer data version
+  const version = useRef<number | null>(null)
+  useEffect(() => {
+    function refresh(latest: number) {
+      const seen = version.current
+      version.current = latest
+      if (seen !== null && latest !== seen) {
+        fetchStats(true)
+          .then(setStats)
+          .catch(() => {})
+      }
+    }
+    return subscribeDsaEvents({
+      onHello: refresh,
+      onSync: (delta) => refresh(delta.version),
+    })
+  }, [])
+
   if (loading) {
     return (
       <div className="flex flex-col items-center justify-center h-full gap-4">
@@ -12,11 +12,58 @@ export interface ContentFile {
   updated_at: string
 }
 
+export interface ContentListPage {
+  items: ContentFile[]
+  next_cursor: string | null
+}
+
+// metajson keys ContentCard reads
+export const CARD_FIELDS = [
+  'slug',
+  'title',
+  'summary',
+  'category',
+  'tags',
+  'readTime',
+] as const
+
 export interface MarkdownContent {
   content: string
   metajson: Record<string, any>
 }
 
+export interface TocEntry {
+  id: string
+  text: string
+  level: number
+}
+
+// Server-rendered markdown: heading ids match TocEntry.id, image URLs are
+// absolute, code blocks use the `.highlight` classes, math is left as
+// `.math` spans for KaTeX
+export interface RenderedContent {
+  html: string
+  toc: TocEntry[]
+}
+
+export interface ContentImportFile {
+  path: string
+  status: 'created' | 'valid' | 'conflict' | 'invalid'
+  slug: string | null
+  id: string | null
+  images: number
+  missing_images: string[]
+  detail: string | null
+}
+
+export interface ContentImportReport {
+  section: string
+  dry_run: boolean
+  created: number
+  failed: number
+  files: ContentImportFile[]
+}
+
 class ApiClient {
   private baseUrl: string
   private token: string | null = null
@@ -71,11 +118,36 @@ class ApiClient {
 
   // Content Operations
   content = {
+    // First page (up to 100), newest first. `fields` trims metajson to
+    // the given keys; use CARD_FIELDS for listing cards.
     list: async (
       section: 'blog' | 'project' | 'case-study',
-      publishedOnly: boolean = true
+      publishedOnly: boolean = true,
+      fields?: readonly string[]
     ): Promise<ContentFile[]> => {
-      return this.request(`/content/${section}?published_only=${publishedOnly}`)
+      const page = await this.content.listPage(section, {
+        publishedOnly,
+        fields,
+      })
+      return page.items
+    },
+
+    listPage: async (
+      section: 'blog' | 'project' | 'case-study',
+      options: {
+        publishedOnly?: boolean
+        fields?: readonly string[]
+        cursor?: string | null
+        limit?: number
+      } = {}
+    ): Promise<ContentListPage> => {
+      const params = new URLSearchParams({
+        published_only: String(options.publishedOnly ?? true),
+      })
+      if (options.fields?.length) params.set('fields', options.fields.join(','))
+      if (options.cursor) params.set('cursor', options.cursor)
+      if (options.limit) params.set('limit', String(options.limit))
+      return this.request(`/content/${section}?${params}`)
     },
 
     get: async (
@@ -95,6 +167,13 @@ class ApiClient {
       return data.content
     },
 
+    getHtml: async (
+      section: 'blog' | 'project' | 'case-study',
+      slug: string
+    ): Promise<RenderedContent> => {
+      return this.request(`/content/${section}/${slug}/html`)
+    },
+
     upload: async (
       section: 'blog' | 'project' | 'case-study',
       file: File,
@@ -128,6 +207,39 @@ class ApiClient {
       return response.json()
     },
 
+    importArchive: async (
+      section: 'blog' | 'project' | 'case-study',
+      archive: File,
+      dryRun = false,
+      token?: string
+    ): Promise<ContentImportReport> => {
+      const formData = new FormData()
+      formData.append('archive', archive)
+
+      const headers: Record<string, string> = {}
+
+      const authToken = token || this.token
+      if (authToken) {
+        headers['Authorization'] = `Bearer ${authToken}`
+      }
+
+      const response = await fetch(
+        `${this.baseUrl}/content/import?section=${section}&dry_run=${dryRun}`,
+        {
+          method: 'POST',
+          headers,
+          body: formData,
+        }
+      )
+
+      if (!response.ok) {
+        const error = await response.json().catch(() => ({ detail: 'Import failed' }))
+        throw new Error(error.detail)
+      }
+
+      return response.json()
+    },
+
     update: async (
       contentId: string,
       data: Partial<ContentFile>
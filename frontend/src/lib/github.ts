@@ -26,6 +26,8 @@ export interface FileDetail {
   size: number
   sha: string
   github_url: string
+  // Server-highlighted markup (format=html); null if not rendered
+  html?: string | null
   metadata: {
     difficulty: string
     tags: string[]
@@ -50,6 +52,7 @@ export interface DsaStats {
   activity: { date: string; count: number }[]
   weekly_performance: { week_start: string; label: string; total: number }[]
   recent: {
+    repo: string
     filename: string
     path: string
     difficulty: string
@@ -60,9 +63,85 @@ export interface DsaStats {
   }[]
 }
 
-// Fetch aggregated DSA dashboard stats
-export async function fetchStats(): Promise<DsaStats> {
-  const response = await fetch(`${API_BASE}/github/dsa/stats`)
+// One row from the filterable problem listing
+export interface ProblemItem {
+  repo: string
+  path: string
+  filename: string
+  folder: string | null
+  language: string | null
+  difficulty: string
+  tags: string[]
+  time_complexity: string | null
+  space_complexity: string | null
+  leetcode_link: string | null
+  sha: string
+  first_seen_at: string
+  last_updated_at: string
+  last_commit_message: string | null
+}
+
+export interface ProblemsPage<T = ProblemItem> {
+  items: T[]
+  next_cursor: string | null
+}
+
+export interface ProblemsQuery {
+  repo?: string
+  folder?: string
+  difficulty?: string
+  language?: string
+  tag?: string
+  sort?: 'recent' | 'name'
+  cursor?: string
+  limit?: number
+  fields?: (keyof ProblemItem)[]
+}
+
+// Fetch one page of problems from the DB-backed listing.
+// Pass the previous page's next_cursor to continue.
+export async function fetchProblems<T = ProblemItem>(
+  query: ProblemsQuery = {}
+): Promise<ProblemsPage<T>> {
+  const params = new URLSearchParams()
+  for (const [key, value] of Object.entries(query)) {
+    if (value === undefined || value === null) continue
+    params.set(key, Array.isArray(value) ? value.join(',') : String(value))
+  }
+  const response = await fetch(`${API_BASE}/github/dsa/problems?${params}`)
+  if (!response.ok) throw new Error('Failed to fetch DSA problems')
+  return response.json()
+}
+
+export interface SearchResult {
+  repo: string
+  path: string
+  filename: string
+  folder: string
+  language: string | null
+  difficulty: string
+  rank: number
+  // HTML-escaped source excerpt with matches wrapped in <mark>
+  snippet: string | null
+}
+
+// Search synced solution code and file names
+export async function searchProblems(
+  q: string,
+  limit = 20
+): Promise<{ query: string; results: SearchResult[] }> {
+  const params = new URLSearchParams({ q, limit: String(limit) })
+  const response = await fetch(`${API_BASE}/github/dsa/search?${params}`)
+  if (!response.ok) throw new Error('Failed to search DSA problems')
+  return response.json()
+}
+
+// Fetch aggregated DSA dashboard stats. `revalidate` skips the fresh
+// browser copy (after a live sync event); the server answers 304 if unchanged.
+export async function fetchStats(revalidate = false): Promise<DsaStats> {
+  const response = await fetch(`${API_BASE}/github/dsa/stats`, {
+    cache: revalidate ? 'no-cache' : 'default',
+  })
   console.log("response: ", response)
   if (!response.ok) throw new Error('Failed to fetch DSA stats')
   return response.json()
@@ -75,9 +154,16 @@ export async function fetchTree(): Promise<TreeResponse> {
   return response.json()
 }
 
-// Fetch a single file's content by path
-export async function fetchFileContent(filePath: string): Promise<FileDetail> {
-  const response = await fetch(`${API_BASE}/github/dsa/file/${filePath}`)
+// Stylesheet for server-highlighted `html`
+export const HIGHLIGHT_CSS_URL = `${API_BASE}/github/dsa/highlight.css`
+
+// Fetch a single file's content by path; `html` asks for server highlighting
+export async function fetchFileContent(
+  filePath: string,
+  html = false
+): Promise<FileDetail> {
+  const query = html ? '?format=html' : ''
+  const response = await fetch(`${API_BASE}/github/dsa/file/${filePath}${query}`)
   if (!response.ok) throw new Error('Failed to fetch file content')
   return response.json()
 }
@@ -91,6 +177,51 @@ export async function fetchLatestFile(): Promise<
   return response.json()
 }
 
+export interface DsaSyncProgress {
+  repo: string
+  type: 'full' | 'incremental'
+  stage: 'started' | 'files' | 'commits' | 'failed'
+  problems?: number
+  commits?: number
+}
+
+export interface DsaSyncDelta {
+  repo: string
+  type: 'full' | 'incremental'
+  run_id: number
+  status: string
+  version: number
+  changed: boolean
+  problems_added: number
+  problems_removed: number
+  problems_changed: number
+  commits_processed: number
+  total_problems: number
+  new_problems: string[]
+}
+
+export interface DsaEventHandlers {
+  onHello?: (version: number) => void
+  onProgress?: (progress: DsaSyncProgress) => void
+  onSync?: (delta: DsaSyncDelta) => void
+}
+
+// Subscribe to live sync events (SSE); returns an unsubscribe function.
+// EventSource reconnects on its own and gets a fresh `hello` each time.
+export function subscribeDsaEvents(handlers: DsaEventHandlers): () => void {
+  const source = new EventSource(`${API_BASE}/github/dsa/events`)
+  source.addEventListener('hello', (e) => {
+    handlers.onHello?.(JSON.parse((e as MessageEvent).data).version)
+  })
+  source.addEventListener('progress', (e) => {
+    handlers.onProgress?.(JSON.parse((e as MessageEvent).data))
+  })
+  source.addEventListener('sync', (e) => {
+    handlers.onSync?.(JSON.parse((e as MessageEvent).data))
+  })
+  return () => source.close()
+}
+
 // Check GitHub API health
 export async function checkGitHubHealth() {
   const response = await fetch(`${API_BASE}/github/health`)
@@ -1,47 +1,52 @@
 #!/usr/bin/env python3
 """
-Bulk upload markdown files to the portfolio API.
+Bulk import markdown files (and their images) to the portfolio API.
+
+Packs the directory's *.md files, plus the images/ folder beside them,
+into one zip and sends it to /content/import, which validates and
+stores every post in one request. Needs an admin token: pass --token or
+set PORTFOLIO_TOKEN (from POST /auth/login).
 
 Usage:
-    python bulk_upload.py ./content/blog blog
-    python bulk_upload.py ./content/projects project
+    python bulk_upload.py ./content/blog blog --token <jwt>
+    python bulk_upload.py ./content/projects project --dry-run
     python bulk_upload.py ./content/cases case-study
 """
 
+import argparse
+import io
+import os
 import sys
+import zipfile
 import requests
 from pathlib import Path
 
 API_BASE = "http://localhost:8000/api/v1"
 
 
-def upload_file(filepath: Path, section: str):
-    """Upload a single markdown file."""
-    url = f"{API_BASE}/content/upload"
-    params = {"section": section}
-
-    try:
-        with open(filepath, "rb") as f:
-            files = {"file": (filepath.name, f, "text/markdown")}
-            response = requests.post(url, params=params, files=files)
-
-        if response.status_code == 201:
-            data = response.json()
-            title = data.get("metadata", {}).get("title", filepath.name)
-            print(f"✓ Uploaded: {title}")
-            return True
-        else:
-            error = response.json().get("detail", "Unknown error")
-            print(f"✗ Failed: {filepath.name} - {error}")
-            return False
-
-    except Exception as e:
-        print(f"✗ Error uploading {filepath.name}: {str(e)}")
-        return False
-
-
-def bulk_upload(directory: str, section: str):
-    """Upload all markdown files in a directory."""
+def pack(path: Path) -> bytes:
+    """Zip the markdown files and images/ of a directory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for filepath in sorted(path.glob("*.md")):
+            archive.write(filepath, filepath.name)
+        images = path / "images"
+        if images.is_dir():
+            for filepath in sorted(images.iterdir()):
+                if filepath.is_file():
+                    # Already compressed; deflating again only costs time
+                    archive.write(
+                        filepath,
+                        f"images/{filepath.name}",
+                        zipfile.ZIP_STORED,
+                    )
+    return buffer.getvalue()
+
+
+def bulk_upload(
+    directory: str, section: str, token: str, api_base: str, dry_run: bool
+):
+    """Import all markdown files in a directory in one request."""
     path = Path(directory)
 
     if not path.exists():
@@ -59,33 +64,56 @@ def bulk_upload(directory: str, section: str):
         sys.exit(0)
 
     print(f"Found {len(md_files)} markdown files")
-    print(f"Uploading to section: {section}\n")
-
-    success_count = 0
-    fail_count = 0
+    print(f"Importing to section: {section}\n")
+
+    response = requests.post(
+        f"{api_base}/content/import",
+        params={"section": section, "dry_run": dry_run},
+        files={"archive": ("content.zip", pack(path), "application/zip")},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    if response.status_code != 200:
+        error = response.json().get("detail", "Unknown error")
+        print(f"✗ Import failed: {error}")
+        sys.exit(1)
 
-    for filepath in md_files:
-        if upload_file(filepath, section):
-            success_count += 1
+    report = response.json()
+    for entry in report["files"]:
+        if entry["status"] in ("created", "valid"):
+            print(f"✓ {entry['status'].capitalize()}: {entry['path']}")
         else:
-            fail_count += 1
+            detail = entry["detail"]
+            print(f"✗ {entry['status']}: {entry['path']} - {detail}")
+        if entry["missing_images"]:
+            print(f"    missing images: {', '.join(entry['missing_images'])}")
 
-    print(f"\nResults: {success_count} succeeded, {fail_count} failed")
+    verb = "valid" if dry_run else "imported"
+    print(f"\nResults: {report['created']} {verb}, {report['failed']} failed")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python bulk_upload.py <directory> <section>")
-        print("Example: python bulk_upload.py ./content/blog blog")
-        sys.exit(1)
-
-    directory = sys.argv[1]
-    section = sys.argv[2]
-
-    valid_sections = ["blog", "project", "case-study"]
-    if section not in valid_sections:
-        print(f"Error: Invalid section '{section}'")
-        print(f"Valid sections: {', '.join(valid_sections)}")
+    parser = argparse.ArgumentParser(
+        description="Bulk import markdown files to the portfolio API"
+    )
+    parser.add_argument("directory")
+    parser.add_argument("section", choices=["blog", "project", "case-study"])
+    parser.add_argument(
+        "--token",
+        default=os.getenv("PORTFOLIO_TOKEN"),
+        help="admin JWT (default: $PORTFOLIO_TOKEN)",
+    )
+    parser.add_argument("--api-base", default=API_BASE)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="validate only; nothing is stored",
+    )
+    args = parser.parse_args()
+
+    if not args.token:
+        print("Error: an admin token is required (--token or PORTFOLIO_TOKEN)")
         sys.exit(1)
 
-    bulk_upload(directory, section)
+    bulk_upload(
+        args.directory, args.section, args.token, args.api_base, args.dry_run
+    )